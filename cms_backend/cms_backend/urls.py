@@ -2,6 +2,7 @@ from django.contrib import admin
 from django.conf import settings
 from django.conf.urls.static import static
 from django.urls import path, include
+from content import sitemap
 from rest_framework_simplejwt.views import (
     TokenObtainPairView,
     TokenRefreshView,
@@ -11,6 +12,8 @@ urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/content/', include('content.urls')),  # CMS content API
     path("api/auth/", include("core.urls")),  # 👈 login/logout
+    path("sitemap.xml", sitemap.sitemap, name="sitemap"),
+    path("sitemap-<str:kind>-<int:number>.xml", sitemap.sitemap_part, name="sitemap-part"),
 ]
 
 
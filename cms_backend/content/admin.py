@@ -2,6 +2,8 @@ from django.contrib import admin
 from .models import (
     Page,Section, PageSection,MetaPixelCode
 )
+from core.utils.aggregates import GroupConcat
+from core.utils.pagination import EstimatedCountPaginator
 
 # -------------------------
 # Common Admin Mixins
@@ -27,6 +29,7 @@ class ActiveAdminMixin:
 class PageAdmin(admin.ModelAdmin, ActiveAdminMixin):
     list_display = ("id", "title", "page_type","slug","name","parent_id","is_active", "created_at", "updated_at")
     list_filter = ("is_active", "created_at")
+    list_select_related = ("parent_id",)
     search_fields = ("title", "content", "slug")
     prepopulated_fields = {"slug": ("title",)}
     actions = ["activate_items", "deactivate_items"]
@@ -66,10 +69,16 @@ class SectionAdmin(admin.ModelAdmin):
     search_fields = ("id", "title", "slug")
     # ordering = ("order", "id")
     inlines = [PageSectionInline]
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_queryset(self, request):
+        # ✅ Page names joined in the changelist query itself
+        return super().get_queryset(request).annotate(page_names=GroupConcat("pages__name"))
 
     # Show related pages as a comma-separated list
     def get_pages(self, obj):
-        return ", ".join(obj.pages.values_list("name", flat=True)) or "-"
+        return obj.page_names or "-"
     get_pages.short_description = "Pages"
 
    
@@ -82,14 +91,20 @@ class SectionAdmin(admin.ModelAdmin):
 class PageSectionAdmin(admin.ModelAdmin):
     list_display = ("id", "page", "section", "is_active","order")
     list_filter = ("is_active", "page__slug", "section__section_type")
+    list_select_related = ("page", "section")
     search_fields = ("page__title", "section__title", "section__slug")
     ordering = ("id",)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
 
 
 @admin.register(MetaPixelCode)
 class MetaPixelCodeAdmin(admin.ModelAdmin):
     list_display = ("id",'page', 'add_title_meta')
+    list_select_related = ('page',)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     search_fields = ('page__title', 'add_title_meta', 'google_pixel_code', 'facebook_pixel_code')
     list_filter = ('page',)
     ordering = ('page',)
@@ -0,0 +1,125 @@
+# content/async_views.py
+"""
+Async versions of the public read endpoints.
+
+Served natively by an ASGI server (cms_backend/asgi.py): queries go through
+the async ORM and the cache through its async API, so a slow client holds a
+coroutine instead of a worker thread. Payloads follow the sync DRF views
+(see content/payloads.py); everything comes from published snapshots, never
+from the draft tables.
+Responses are cached as rendered, precompressed bodies (content/responses.py).
+"""
+from django.http import JsonResponse
+from django.views.decorators.http import require_safe
+
+from . import payloads
+from .cache import PAGES, aget_version, versioned_key
+from .models import PublishedPage
+from .publishing import present
+from .responses import acached_variants, json_response, origin, render_success
+
+
+def _not_found(message):
+    return JsonResponse({"success": False, "message": message, "data": []}, status=404)
+
+
+def _key(request, *parts, version):
+    return versioned_key(PAGES, "async", *parts, origin(request), version=version)
+
+
+def _cached(request, render, *parts, version):
+    """acached_variants under _key, keeping the last good variants to serve during rebuilds."""
+    return acached_variants(
+        _key(request, *parts, version=version), render, _key(request, *parts, version="stale")
+    )
+
+
+# ==========================
+# NAVIGATION
+# ==========================
+
+@require_safe
+async def navigation(request):
+    version = await aget_version(PAGES)
+
+    async def render():
+        rows = [row async for row in payloads.published_navigation_rows()]
+        return render_success(payloads.build_navigation(rows), "Navigation fetched")
+
+    return json_response(request, await _cached(request, render, "navigation", version=version))
+
+
+# ==========================
+# PAGE BY SLUG
+# ==========================
+
+@require_safe
+async def page_detail(request, slug):
+    """Published snapshot of the page (see content/publishing.py)."""
+    version = await aget_version(PAGES)
+
+    async def render():
+        payload = await (
+            PublishedPage.objects.filter(slug=slug).values_list("payload", flat=True).afirst()
+        )
+        if payload is None:
+            return None
+        return render_success(present(payload, request.build_absolute_uri), "Page fetched")
+
+    variants = await _cached(request, render, "page", slug, version=version)
+    if not variants:
+        return _not_found(f"Page '{slug}' not found")
+    return json_response(request, variants)
+
+
+# ==========================
+# SECTIONS BY PAGE
+# ==========================
+
+def _page_filter(request):
+    page_id = request.GET.get("page_id")
+    page_slug = request.GET.get("page_slug")
+    if page_id and page_slug:
+        return None, "Provide either 'page_id' or 'page_slug', not both."
+    if not (page_id or page_slug):
+        return None, "Either 'page_id' or 'page_slug' is required."
+    return {"page_id": page_id, "page_slug": page_slug}, None
+
+
+async def _published_rows(filters):
+    found = await payloads.published_sections(**filters).afirst()
+    return payloads.snapshot_mapping_rows(*found) if found else []
+
+
+@require_safe
+async def page_sections(request):
+    filters, error = _page_filter(request)
+    if error:
+        return JsonResponse({"success": False, "message": error, "data": []}, status=400)
+
+    version = await aget_version(PAGES)
+
+    async def render():
+        rows = await _published_rows(filters)
+        data = [payloads.build_section(row, request.build_absolute_uri) for row in rows]
+        return render_success(data, "Section list fetched", count=len(data), next=None, previous=None)
+
+    parts = ("sections", filters["page_id"], filters["page_slug"])
+    return json_response(request, await _cached(request, render, *parts, version=version))
+
+
+@require_safe
+async def section_order(request):
+    filters, error = _page_filter(request)
+    if error:
+        return JsonResponse({"success": False, "message": error, "data": []}, status=400)
+
+    version = await aget_version(PAGES)
+
+    async def render():
+        rows = await _published_rows(filters)
+        data = [payloads.build_section_order(row) for row in rows]
+        return render_success(data, "Section order list fetched", count=len(data))
+
+    parts = ("order", filters["page_id"], filters["page_slug"])
+    return json_response(request, await _cached(request, render, *parts, version=version))
@@ -0,0 +1,135 @@
+# content/blobs.py
+"""
+Out-of-row storage for oversized ``Section.data``.
+
+When a section's data serializes to more than SECTION_DATA_EXTERNAL_THRESHOLD
+bytes, ``Section.save()`` writes it zlib-compressed to SectionBlob and leaves a
+small stub in the row, ``{"$external": <size in bytes>}``. Reading
+``section.data`` swaps the stub for the decompressed blob on first access, so
+the API shape is unchanged while queries that only pass over the row (admin
+lists, prefetches, ``.values()`` without data) stop carrying the payload.
+
+``.values()`` readers get the stub back and resolve it with resolve_rows /
+aresolve_rows; lists of instances can be filled in one query with
+load_external_data.
+
+bulk_create/bulk_update store data inline; the next save() or
+``manage.py compact_section_data`` moves it out.
+
+Settings:
+    SECTION_DATA_EXTERNAL_THRESHOLD   bytes of JSON before data moves out (default 65536, 0 disables)
+    SECTION_DATA_COMPRESSION_LEVEL    zlib level, 1-9 (default 6)
+"""
+import json
+import zlib
+
+from django.conf import settings
+from django.db import models
+from django.db.models.query_utils import DeferredAttribute
+
+EXTERNAL_KEY = "$external"
+
+
+def threshold():
+    return getattr(settings, "SECTION_DATA_EXTERNAL_THRESHOLD", 64 * 1024)
+
+
+def is_stub(value):
+    return isinstance(value, dict) and len(value) == 1 and EXTERNAL_KEY in value
+
+
+def encode(raw):
+    return zlib.compress(raw.encode(), getattr(settings, "SECTION_DATA_COMPRESSION_LEVEL", 6))
+
+
+def decode(payload):
+    return json.loads(zlib.decompress(bytes(payload)))
+
+
+def externalize(data):
+    """(value to store in the row, compressed payload or None when it stays inline)."""
+    limit = threshold()
+    if not limit or is_stub(data):
+        return data, None
+    raw = json.dumps(data, separators=(",", ":"))
+    if len(raw) <= limit:
+        return data, None
+    return {EXTERNAL_KEY: len(raw)}, encode(raw)
+
+
+# ==========================
+# LOADING
+# ==========================
+
+def load_payloads(section_ids):
+    """{section id: data} for the given sections' blobs, in one query."""
+    from .models import SectionBlob
+
+    rows = SectionBlob.objects.filter(section_id__in=section_ids).values_list("section_id", "payload")
+    return {section_id: decode(payload) for section_id, payload in rows}
+
+
+async def aload_payloads(section_ids):
+    from .models import SectionBlob
+
+    rows = SectionBlob.objects.filter(section_id__in=section_ids).values_list("section_id", "payload")
+    return {section_id: decode(payload) async for section_id, payload in rows}
+
+
+def load_external_data(sections):
+    """Fill in externalized data for a list of Section instances with one query."""
+    pending = [s for s in sections if is_stub(s.__dict__.get("data"))]
+    if pending:
+        loaded = load_payloads([s.pk for s in pending])
+        for section in pending:
+            section.__dict__["data"] = loaded.get(section.pk, {})
+    return sections
+
+
+def _fill_rows(rows, id_key, data_key, loaded):
+    for row in rows:
+        if is_stub(row[data_key]):
+            row[data_key] = loaded.get(row[id_key], {})
+    return rows
+
+
+def resolve_rows(rows, id_key="id", data_key="data"):
+    """Replace stubs in ``.values()`` rows with the section data."""
+    ids = [row[id_key] for row in rows if is_stub(row[data_key])]
+    return _fill_rows(rows, id_key, data_key, load_payloads(ids) if ids else {})
+
+
+async def aresolve_rows(rows, id_key="id", data_key="data"):
+    ids = [row[id_key] for row in rows if is_stub(row[data_key])]
+    return _fill_rows(rows, id_key, data_key, await aload_payloads(ids) if ids else {})
+
+
+# ==========================
+# FIELD
+# ==========================
+
+class ExternalDataAttribute(DeferredAttribute):
+    """Loads the blob the first time a stubbed value is read."""
+
+    def __get__(self, instance, cls=None):
+        if instance is None:
+            return self
+        value = super().__get__(instance, cls)
+        if is_stub(value):
+            value = load_payloads([instance.pk]).get(instance.pk, {})
+            instance.__dict__[self.field.attname] = value
+        return value
+
+    def __set__(self, instance, value):
+        # a data descriptor, so reads keep going through __get__ once loaded
+        instance.__dict__[self.field.attname] = value
+
+
+class ExternalizableJSONField(models.JSONField):
+    """JSONField whose large values live in SectionBlob (see module docstring)."""
+
+    descriptor_class = ExternalDataAttribute
+
+    def pre_save(self, model_instance, add):
+        # the value as set (a stub stays a stub), without loading the blob
+        return model_instance.__dict__[self.attname]
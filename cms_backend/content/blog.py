@@ -0,0 +1,29 @@
+# content/blog.py
+"""
+Cache keys for the public blog API.
+
+A post's rendered response is cached under its slug, without a version stamp,
+so saving one post leaves the others cached; content/signals.py deletes the
+entry (under the old slug too after a rename) when a post is saved or deleted.
+Index pages are keyed on the BLOG version stamp, which any post change bumps.
+"""
+from django.core.cache import cache
+
+# BlogPostSummarySerializer fields; the list query defers everything else heavy
+SUMMARY_FIELDS = (
+    "id", "title", "slug", "summary",
+    "meta_title", "meta_description", "meta_keywords",
+    "created_at", "updated_at",
+)
+
+
+def post_key(slug):
+    return f"content:blog:post:{slug}"
+
+
+def stale_post_key(slug):
+    return f"content:blog:post-stale:{slug}"
+
+
+def invalidate_posts(*slugs):
+    cache.delete_many([key for slug in set(filter(None, slugs)) for key in (post_key(slug), stale_post_key(slug))])
@@ -0,0 +1,91 @@
+# content/cache.py
+"""
+Version stamps for cached content.
+
+Cached payloads put the current stamp of their namespace in the key, so
+bumping the stamp (see content/signals.py) invalidates all of them at once
+without having to know every key.
+
+Writes bump with bump_on_commit: a stamp bumped inside the write transaction
+lets a concurrent reader see the new stamp, read the not yet committed (old)
+rows and cache them under it until the timeout.
+
+The stamps, the slug cache invalidation (content/slugcache.py) and the
+single-flight locks (content/singleflight.py) only reach other processes
+through a cache backend they all share. Django's default, LocMemCache, is
+private to each process, so with several gunicorn/uvicorn workers configure
+Redis or Memcached::
+
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": "redis://127.0.0.1:6379/1",
+        }
+    }
+
+``manage.py check --deploy`` warns (content.W001) when the default cache is
+local to the process.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+PAGES = "pages"
+BLOG = "blog"
+SITE = "site"  # auxiliary content (content/site.py)
+
+VERSION_KEY = "content:version:{}"
+
+
+def cache_timeout():
+    return getattr(settings, "CONTENT_CACHE_TIMEOUT", 60 * 5)
+
+
+def _initial_version():
+    # Start from the clock so an evicted stamp never goes back to a value
+    # that older cache entries were stored under.
+    return int(time.time() * 1000)
+
+
+def get_version(namespace=PAGES):
+    key = VERSION_KEY.format(namespace)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, _initial_version(), None)
+        version = cache.get(key)
+    return version
+
+
+async def aget_version(namespace=PAGES):
+    key = VERSION_KEY.format(namespace)
+    version = await cache.aget(key)
+    if version is None:
+        await cache.aadd(key, _initial_version(), None)
+        version = await cache.aget(key)
+    return version
+
+
+def bump_version(namespace=PAGES):
+    key = VERSION_KEY.format(namespace)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        cache.set(key, _initial_version(), None)
+        return cache.get(key)
+
+
+def bump_on_commit(*namespaces):
+    """Bump `namespaces` once the current transaction commits (right away outside one)."""
+    def bump():
+        for namespace in namespaces:
+            bump_version(namespace)
+
+    transaction.on_commit(bump)
+
+
+def versioned_key(namespace, *parts, version=None):
+    if version is None:
+        version = get_version(namespace)
+    return ":".join(["content", namespace, str(version), *map(str, parts)])
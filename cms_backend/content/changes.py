@@ -0,0 +1,104 @@
+# content/changes.py
+"""
+Delta sync feed built on ChangeLog.
+
+``changes_since(cursor)`` returns the latest state of every record changed
+after ``cursor`` (or a tombstone when it was deleted), plus the cursor to send
+next time. Entries carry draft state (inactive pages, unpublished sections),
+so the /changes/ endpoint is for editors only.
+
+Old entries are pruned (``manage.py prune_changelog``, CHANGE_LOG_RETENTION_DAYS).
+A cursor older than the oldest kept entry may have missed tombstones, so it
+gets ``resync: true`` and a fresh cursor instead of changes: the client reloads
+the full state from the regular endpoints, then continues from that cursor.
+Replaying a change it already has is harmless, since every entry carries the
+record's current state.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Max, Min
+from django.utils import timezone
+
+from . import blobs, payloads
+from .models import ChangeLog, MetaPixelCode, Page, PageSection, Section
+
+SECTION_FIELDS = ("id", "slug", "title", "section_type", "data", "created_at", "updated_at")
+PAGE_SECTION_FIELDS = ("id", "page_id", "section_id", "is_active", "order")
+
+# model key → (queryset of current rows, row → payload)
+FEED_MODELS = {
+    "page": (lambda: Page.objects.values(*payloads.PAGE_FIELDS), dict),
+    "section": (lambda: Section.objects.values(*SECTION_FIELDS), dict),
+    "page_section": (lambda: PageSection.objects.values(*PAGE_SECTION_FIELDS), dict),
+    "meta_pixel_code": (lambda: MetaPixelCode.objects.values(*payloads.META_PIXEL_FIELDS), payloads.build_meta_pixel),
+}
+
+
+def settle_seconds():
+    # Auto-increment ids are handed out before commit, so a slow transaction can
+    # commit an id below one a client already saw. Entries younger than this
+    # are held back to leave such transactions time to land.
+    return getattr(settings, "CHANGE_FEED_SETTLE_SECONDS", 2)
+
+
+def retention_days():
+    return getattr(settings, "CHANGE_LOG_RETENTION_DAYS", 30)
+
+
+def _settled(entries):
+    settle = settle_seconds()
+    if settle:
+        entries = entries.filter(changed_at__lte=timezone.now() - timedelta(seconds=settle))
+    return entries
+
+
+def changes_since(cursor=0, limit=500):
+    # ✅ Entries right after the cursor were pruned: the client must resync
+    oldest = ChangeLog.objects.aggregate(oldest=Min("id"))["oldest"]
+    if oldest is not None and cursor < oldest - 1:
+        latest = _settled(ChangeLog.objects.all()).aggregate(latest=Max("id"))["latest"]
+        return {"changes": [], "cursor": latest or oldest - 1, "has_more": False, "resync": True}
+
+    entries = _settled(ChangeLog.objects.filter(id__gt=cursor))
+    entries = list(entries.order_by("id")[: limit + 1])
+
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+    next_cursor = entries[-1].id if entries else cursor
+
+    # ✅ Keep only the last entry per record; the payload is its current state anyway
+    latest = {}
+    for entry in entries:
+        latest.pop((entry.model, entry.object_id), None)
+        latest[(entry.model, entry.object_id)] = entry
+
+    # ✅ One query per model for all upserted records
+    wanted = {}
+    for (model, object_id), entry in latest.items():
+        if entry.action != "deleted" and model in FEED_MODELS:
+            wanted.setdefault(model, set()).add(object_id)
+    rows = {}
+    for model, ids in wanted.items():
+        queryset, build = FEED_MODELS[model]
+        batch = list(queryset().filter(pk__in=ids))
+        if model == "section":
+            blobs.resolve_rows(batch)  # externalized data
+        for row in batch:
+            rows[(model, str(row["id"]))] = build(row)
+
+    changes = []
+    for key, entry in latest.items():
+        data = rows.get(key)
+        if entry.action != "deleted" and data is None:
+            continue  # deleted afterwards; its tombstone follows in a later batch
+        changes.append({
+            "cursor": entry.id,
+            "model": entry.model,
+            "id": entry.object_id,
+            "action": entry.action,
+            "changed_at": entry.changed_at,
+            "data": data,
+        })
+
+    return {"changes": changes, "cursor": next_cursor, "has_more": has_more, "resync": False}
@@ -0,0 +1,41 @@
+# content/checks.py
+"""System checks for the content app."""
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+# Backends whose entries other worker processes can't see
+PROCESS_LOCAL_CACHES = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    backend = settings.CACHES.get("default", {}).get("BACKEND")
+    if backend not in PROCESS_LOCAL_CACHES:
+        return []
+    return [
+        Warning(
+            f"The default cache ({backend}) is local to each process.",
+            hint=(
+                "Cache version stamps, slug cache invalidation and single-flight locks "
+                "need a cache shared by every worker: configure Redis or Memcached "
+                "(see content/cache.py)."
+            ),
+            id="content.W001",
+        )
+    ]
+
+
+@register(Tags.caches, deploy=True)
+def check_public_origins(app_configs, **kwargs):
+    if getattr(settings, "CONTENT_PUBLIC_ORIGINS", None) or "*" not in settings.ALLOWED_HOSTS:
+        return []
+    return [
+        Warning(
+            "Cached public responses are keyed by the request's Host, and ALLOWED_HOSTS accepts any host.",
+            hint="Set CONTENT_PUBLIC_ORIGINS (see content/responses.py) or list the hosts in ALLOWED_HOSTS.",
+            id="content.W002",
+        )
+    ]
@@ -0,0 +1,204 @@
+# content/jsonpatch.py
+"""
+JSON Merge Patch (RFC 7396) and JSON Patch (RFC 6902) for section updates.
+
+Both are applied in place to a document and report the paths they touched, as
+tuples of keys / list indexes (``("data", "items", 2, "heading")``), so callers
+can validate and post-process only what changed instead of the whole blob.
+"""
+import copy
+
+from rest_framework.parsers import JSONParser
+
+MERGE_PATCH = "application/merge-patch+json"
+JSON_PATCH = "application/json-patch+json"
+PATCH_MEDIA_TYPES = (MERGE_PATCH, JSON_PATCH)
+
+
+class PatchError(ValueError):
+    """The patch is malformed or cannot be applied to the document."""
+
+
+class MergePatchParser(JSONParser):
+    media_type = MERGE_PATCH
+
+
+class JSONPatchParser(JSONParser):
+    media_type = JSON_PATCH
+
+
+# ==========================
+# MERGE PATCH (RFC 7396)
+# ==========================
+
+def _without_nulls(value):
+    if isinstance(value, dict):
+        return {key: _without_nulls(item) for key, item in value.items() if item is not None}
+    return value
+
+
+def merge_patch(target, patch, path=(), touched=None):
+    """Merge `patch` into `target`; returns (result, touched paths)."""
+    touched = [] if touched is None else touched
+    if not isinstance(patch, dict) or not isinstance(target, dict):
+        # scalar, list or new object: the whole subtree is replaced
+        touched.append(path)
+        return _without_nulls(patch), touched
+
+    for key, value in patch.items():
+        if value is None:
+            if key in target:
+                del target[key]
+                touched.append(path + (key,))
+        else:
+            target[key], _ = merge_patch(target.get(key), value, path + (key,), touched)
+    return target, touched
+
+
+# ==========================
+# JSON PATCH (RFC 6902)
+# ==========================
+
+def parse_pointer(pointer):
+    """'/items/0/a~1b' → ['items', '0', 'a/b']."""
+    if not isinstance(pointer, str) or (pointer and not pointer.startswith("/")):
+        raise PatchError(f"Invalid JSON pointer {pointer!r}")
+    if not pointer:
+        return []
+    return [token.replace("~1", "/").replace("~0", "~") for token in pointer[1:].split("/")]
+
+
+def _index(container, token, pointer, insert=False):
+    if token == "-" and insert:
+        return len(container)
+    if not token.isdigit() or (token != "0" and token.startswith("0")):
+        raise PatchError(f"Invalid list index in {pointer!r}")
+    index = int(token)
+    if index > len(container) or (index == len(container) and not insert):
+        raise PatchError(f"List index out of range in {pointer!r}")
+    return index
+
+
+def _resolve(document, tokens, pointer):
+    """(container holding the last token, its path with list indexes as ints)."""
+    node, path = document, []
+    for token in tokens[:-1]:
+        if isinstance(node, list):
+            token = _index(node, token, pointer)
+        elif not isinstance(node, dict) or token not in node:
+            raise PatchError(f"Path {pointer!r} does not exist")
+        path.append(token)
+        node = node[token]
+    if not isinstance(node, (dict, list)):
+        raise PatchError(f"Path {pointer!r} does not exist")
+    return node, tuple(path)
+
+
+def _get(document, pointer):
+    tokens = parse_pointer(pointer)
+    if not tokens:
+        return document
+    parent, _ = _resolve(document, tokens, pointer)
+    key = _index(parent, tokens[-1], pointer) if isinstance(parent, list) else tokens[-1]
+    if isinstance(parent, dict) and key not in parent:
+        raise PatchError(f"Path {pointer!r} does not exist")
+    return parent[key]
+
+
+def _shift(touched, list_path, index, delta):
+    """Keep touched list item paths pointing at the same items after an insert/remove."""
+    depth = len(list_path)
+    shifted = []
+    for path in touched:
+        if len(path) > depth and path[:depth] == list_path and path[depth] >= index:
+            if delta < 0 and path[depth] == index:
+                continue  # the item itself was removed
+            path = list_path + (path[depth] + delta,) + path[depth + 1:]
+        shifted.append(path)
+    touched[:] = shifted
+
+
+def _add(document, pointer, value, touched):
+    tokens = parse_pointer(pointer)
+    if not tokens:
+        raise PatchError("Replacing the whole document is not supported")
+    parent, path = _resolve(document, tokens, pointer)
+    if isinstance(parent, list):
+        index = _index(parent, tokens[-1], pointer, insert=True)
+        parent.insert(index, value)
+        _shift(touched, path, index, 1)
+        touched.append(path + (index,))
+    else:
+        parent[tokens[-1]] = value
+        touched.append(path + (tokens[-1],))
+
+
+def _remove(document, pointer, touched):
+    tokens = parse_pointer(pointer)
+    if not tokens:
+        raise PatchError("Removing the whole document is not supported")
+    parent, path = _resolve(document, tokens, pointer)
+    if isinstance(parent, list):
+        index = _index(parent, tokens[-1], pointer)
+        value = parent.pop(index)
+        _shift(touched, path, index, -1)
+        touched.append(path)  # the list itself changed
+    else:
+        if tokens[-1] not in parent:
+            raise PatchError(f"Path {pointer!r} does not exist")
+        value = parent.pop(tokens[-1])
+        touched.append(path + (tokens[-1],))
+    return value
+
+
+def json_patch(document, operations):
+    """Apply RFC 6902 `operations` to `document`; returns (document, touched paths)."""
+    if not isinstance(operations, list):
+        raise PatchError("A JSON Patch must be a list of operations")
+    touched = []
+    for number, operation in enumerate(operations):
+        if not isinstance(operation, dict) or "path" not in operation:
+            raise PatchError(f"Operation {number}: 'op' and 'path' are required")
+        op, pointer = operation.get("op"), operation["path"]
+        if op in ("add", "replace", "test") and "value" not in operation:
+            raise PatchError(f"Operation {number}: 'value' is required for '{op}'")
+        if op in ("move", "copy") and "from" not in operation:
+            raise PatchError(f"Operation {number}: 'from' is required for '{op}'")
+
+        if op == "add":
+            _add(document, pointer, operation["value"], touched)
+        elif op == "remove":
+            _remove(document, pointer, touched)
+        elif op == "replace":
+            _get(document, pointer)  # must exist
+            tokens = parse_pointer(pointer)
+            if not tokens:
+                raise PatchError("Replacing the whole document is not supported")
+            parent, path = _resolve(document, tokens, pointer)
+            key = _index(parent, tokens[-1], pointer) if isinstance(parent, list) else tokens[-1]
+            parent[key] = operation["value"]
+            touched.append(path + (key,))
+        elif op == "move":
+            source = operation["from"]
+            if pointer != source and pointer.startswith(source + "/"):
+                raise PatchError(f"Operation {number}: cannot move a value into itself")
+            _add(document, pointer, _remove(document, source, touched), touched)
+        elif op == "copy":
+            _add(document, pointer, copy.deepcopy(_get(document, operation["from"])), touched)
+        elif op == "test":
+            if _get(document, pointer) != operation["value"]:
+                raise PatchError(f"Operation {number}: test failed at {pointer!r}")
+        else:
+            raise PatchError(f"Operation {number}: unknown op {op!r}")
+    return document, touched
+
+
+def apply_patch(document, patch, media_type):
+    """Apply a merge patch or JSON Patch (by `media_type`) to `document` in place."""
+    if media_type == MERGE_PATCH:
+        if not isinstance(patch, dict):
+            raise PatchError("A merge patch for a section must be an object")
+        return merge_patch(document, patch)
+    if media_type == JSON_PATCH:
+        return json_patch(document, patch)
+    raise PatchError(f"Unsupported patch media type {media_type!r}")
@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from content import blobs
+from content.models import Section, SectionBlob
+
+
+class Command(BaseCommand):
+    help = (
+        "Move Section.data larger than SECTION_DATA_EXTERNAL_THRESHOLD into SectionBlob, "
+        "and move blobs that are now under it back inline (after upgrading, changing "
+        "the threshold or bulk writes)."
+    )
+
+    def handle(self, *args, **options):
+        limit = blobs.threshold()
+        moved_out = moved_in = 0
+        rows = Section.objects.values_list("pk", "data", "updated_at").iterator(chunk_size=200)
+        for pk, data, updated_at in rows:
+            # rows saved meanwhile are left alone; their save() already placed the data
+            unchanged = Section.objects.filter(pk=pk, updated_at=updated_at)
+            if blobs.is_stub(data):
+                if limit and data[blobs.EXTERNAL_KEY] > limit:
+                    continue
+                with transaction.atomic():
+                    inline = blobs.load_payloads([pk]).get(pk, {})
+                    if unchanged.update(data=inline):
+                        SectionBlob.objects.filter(section_id=pk).delete()
+                        moved_in += 1
+                continue
+
+            stored, payload = blobs.externalize(data)
+            if payload is None:
+                continue
+            with transaction.atomic():
+                if unchanged.update(data=stored):
+                    SectionBlob.objects.update_or_create(
+                        section_id=pk, defaults={"payload": payload, "size": stored[blobs.EXTERNAL_KEY]}
+                    )
+                    moved_out += 1
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{moved_out} section(s) moved to SectionBlob, {moved_in} moved back inline."
+        ))
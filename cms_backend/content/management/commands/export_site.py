@@ -0,0 +1,146 @@
+import hashlib
+import json
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from rest_framework.utils.encoders import JSONEncoder
+
+from content import payloads
+from content.models import MetaPixelCode, Page, PublishedPage
+from content.publishing import present
+from core.utils.compression import MAX_BROTLI_QUALITY, MAX_GZIP_LEVEL, compress_variants
+
+MANIFEST = "manifest.json"
+ENCODING_SUFFIXES = {"gzip": ".gz", "br": ".br"}
+
+
+def page_filename(slug):
+    # Home page slug is "/"
+    return "index.json" if slug == "/" else f"{slug}.json"
+
+
+def fingerprint(value):
+    return hashlib.sha1(repr(value).encode()).hexdigest()
+
+
+class Command(BaseCommand):
+    help = (
+        "Export the published site (navigation, published pages, meta pixel "
+        "codes) as static JSON plus .gz/.br variants. Only files whose content "
+        "changed since the last run are rewritten."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "output",
+            nargs="?",
+            default=getattr(settings, "SITE_EXPORT_DIR", os.path.join(settings.BASE_DIR, "export")),
+        )
+        parser.add_argument(
+            "--base-url",
+            default="",
+            help="Prefix for /media/ URLs inside section data (e.g. https://cdn.example.com). "
+                 "Use --full after changing it.",
+        )
+        parser.add_argument("--full", action="store_true", help="Ignore the manifest and rewrite everything.")
+
+    def handle(self, *args, **options):
+        self.output = options["output"]
+        base_url = options["base_url"].rstrip("/")
+        self.build_uri = (lambda path: base_url + path) if base_url else None
+
+        os.makedirs(os.path.join(self.output, "pages"), exist_ok=True)
+        manifest = {} if options["full"] else self.load_manifest()
+        new_manifest = {"pages": {}}
+        written = 0
+
+        # ✅ Cheap fingerprints first: ids, slugs and publish versions, no payloads
+        published = list(
+            PublishedPage.objects.filter(page__is_active=True)
+            .order_by("page_id")
+            .values_list("page_id", "slug", "version")
+        )
+
+        # Navigation (published pages only, so it changes with any publish)
+        new_manifest["navigation"] = fingerprint(published)
+        if new_manifest["navigation"] != manifest.get("navigation"):
+            nav = payloads.build_navigation(list(payloads.published_navigation_rows()))
+            self.write("navigation.json", nav)
+            written += 1
+
+        # Meta pixel codes (the export carries the page slug, so a renamed page changes it too)
+        new_manifest["meta_pixel_codes"] = fingerprint(
+            list(
+                MetaPixelCode.objects.order_by("created_at")
+                .values_list("id", "page_id", "page__slug", "updated_at")
+            )
+        )
+        if new_manifest["meta_pixel_codes"] != manifest.get("meta_pixel_codes"):
+            meta = [payloads.build_meta_pixel(row) for row in payloads.meta_pixel_rows()]
+            self.write("meta-pixel-codes.json", meta)
+            written += 1
+
+        # Pages
+        old_pages = manifest.get("pages", {})
+        for page_id, slug, version in published:
+            entry = {"file": os.path.join("pages", page_filename(slug)), "version": version}
+            new_manifest["pages"][page_id] = entry
+            if old_pages.get(page_id) == entry:
+                continue
+            self.write(entry["file"], self.build_page(page_id))
+            written += 1
+
+        # Drop files of pages that were deleted, deactivated or renamed
+        kept = {entry["file"] for entry in new_manifest["pages"].values()}
+        removed = 0
+        for entry in old_pages.values():
+            if entry["file"] not in kept:
+                self.remove(entry["file"])
+                removed += 1
+
+        self.write_json(MANIFEST, new_manifest)
+        self.stdout.write(self.style.SUCCESS(
+            f"Exported to {self.output}: {written} file(s) written, {removed} removed, "
+            f"{len(published)} page(s) tracked."
+        ))
+
+    def build_page(self, page_id):
+        payload = PublishedPage.objects.values_list("payload", flat=True).get(page_id=page_id)
+        return present(payload, self.build_uri)
+
+    # ==========================
+    # FILES
+    # ==========================
+
+    def load_manifest(self):
+        try:
+            with open(os.path.join(self.output, MANIFEST)) as fh:
+                return json.load(fh)
+        except (OSError, ValueError):
+            return {}
+
+    def write(self, name, data):
+        body = json.dumps(data, cls=JSONEncoder, ensure_ascii=False).encode("utf-8")
+        self.write_bytes(name, body)
+        variants = compress_variants(body, quality=MAX_BROTLI_QUALITY, level=MAX_GZIP_LEVEL)
+        for encoding, compressed in variants.items():
+            self.write_bytes(name + ENCODING_SUFFIXES[encoding], compressed)
+
+    def write_json(self, name, data):
+        self.write_bytes(name, json.dumps(data, indent=2).encode("utf-8"))
+
+    def write_bytes(self, name, body):
+        # Write then rename so a web server never serves a half-written file
+        path = os.path.join(self.output, name)
+        tmp = f"{path}.tmp"
+        with open(tmp, "wb") as fh:
+            fh.write(body)
+        os.replace(tmp, path)
+
+    def remove(self, name):
+        for suffix in ("", *ENCODING_SUFFIXES.values()):
+            try:
+                os.remove(os.path.join(self.output, name + suffix))
+            except FileNotFoundError:
+                pass
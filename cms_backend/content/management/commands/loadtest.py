@@ -0,0 +1,128 @@
+import asyncio
+import statistics
+import time
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+# Sync (DRF) path → async counterpart, for side-by-side comparison
+DEFAULT_PAIRS = [
+    ("/api/content/pages/?type=navigation", "/api/content/async/navigation/"),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Fire concurrent GETs at a running server and report throughput and "
+        "latency, e.g. to compare the sync WSGI views with the async ones:\n"
+        "  manage.py loadtest --base http://127.0.0.1:8000 "
+        "--pair /api/content/pages/home/ /api/content/async/pages/home/\n"
+        "Each pair is run sync first, then async, followed by a comparison line."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--base", default="http://127.0.0.1:8000")
+        parser.add_argument("--path", action="append", dest="paths", help="Path to test on its own (repeatable).")
+        parser.add_argument(
+            "--pair", action="append", dest="pairs", nargs=2, metavar=("SYNC", "ASYNC"),
+            help="Sync path and its async counterpart to compare (repeatable).",
+        )
+        parser.add_argument("--concurrency", type=int, default=100)
+        parser.add_argument("--requests", type=int, default=2000)
+        parser.add_argument("--timeout", type=float, default=30.0)
+
+    def handle(self, *args, **options):
+        base = urlsplit(options["base"])
+        if base.scheme != "http":
+            raise CommandError("Only plain http:// targets are supported.")
+
+        for path in options["paths"] or []:
+            self.report(path, asyncio.run(self.run(base, path, options)))
+
+        pairs = options["pairs"] or ([] if options["paths"] else DEFAULT_PAIRS)
+        for sync_path, async_path in pairs:
+            sync_stats = self.report(sync_path, asyncio.run(self.run(base, sync_path, options)))
+            async_stats = self.report(async_path, asyncio.run(self.run(base, async_path, options)))
+            self.compare(sync_stats, async_stats)
+
+    async def run(self, base, path, options):
+        host, port = base.hostname, base.port or 80
+        total = options["requests"]
+        queue = asyncio.Queue()
+        for _ in range(total):
+            queue.put_nowait(None)
+
+        latencies, errors = [], 0
+
+        async def worker():
+            nonlocal errors
+            while not queue.empty():
+                queue.get_nowait()
+                started = time.perf_counter()
+                try:
+                    status = await asyncio.wait_for(self.fetch(host, port, path), options["timeout"])
+                except (OSError, asyncio.TimeoutError):
+                    status = None
+                latencies.append(time.perf_counter() - started)
+                if status != 200:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(options["concurrency"])))
+        return latencies, errors, time.perf_counter() - started
+
+    async def fetch(self, host, port, path):
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            writer.write(
+                f"GET {path} HTTP/1.1\r\nHost: {host}\r\nConnection: close\r\n\r\n".encode()
+            )
+            await writer.drain()
+            status_line = await reader.readline()
+            await reader.read()  # drain body until the server closes
+            try:
+                return int(status_line.split()[1])
+            except (IndexError, ValueError):
+                return None  # empty or malformed status line counts as a failure
+        finally:
+            writer.close()
+
+    def report(self, path, result):
+        latencies, errors, elapsed = result
+        if not latencies:
+            self.stdout.write(f"{path}\n  no requests completed")
+            return None
+        latencies.sort()
+
+        def p(q):
+            return latencies[min(len(latencies) - 1, int(len(latencies) * q))] * 1000
+
+        self.stdout.write(
+            f"{path}\n"
+            f"  requests: {len(latencies)}  errors: {errors}  "
+            f"throughput: {len(latencies) / elapsed:.1f} req/s\n"
+            f"  latency ms: mean {statistics.mean(latencies) * 1000:.1f}  "
+            f"p50 {p(0.5):.1f}  p95 {p(0.95):.1f}  p99 {p(0.99):.1f}"
+        )
+        return {
+            "throughput": len(latencies) / elapsed,
+            "p50": p(0.5),
+            "p95": p(0.95),
+            "errors": errors,
+        }
+
+    def compare(self, sync_stats, async_stats):
+        if not sync_stats or not async_stats:
+            self.stdout.write("  sync vs async: not comparable, a run completed no requests")
+            return
+
+        def ratio(new, old):
+            return f"{new / old:.2f}x" if old else "n/a"
+
+        self.stdout.write(
+            f"  sync vs async: throughput {sync_stats['throughput']:.1f} → "
+            f"{async_stats['throughput']:.1f} req/s ({ratio(async_stats['throughput'], sync_stats['throughput'])})  "
+            f"p50 {sync_stats['p50']:.1f} → {async_stats['p50']:.1f} ms  "
+            f"p95 {sync_stats['p95']:.1f} → {async_stats['p95']:.1f} ms  "
+            f"errors {sync_stats['errors']} → {async_stats['errors']}"
+        )
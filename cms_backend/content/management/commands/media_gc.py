@@ -0,0 +1,186 @@
+import json
+import os
+import re
+from datetime import datetime, timedelta
+from urllib.parse import unquote
+
+from django.apps import apps
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+from django.db import models
+from django.utils import timezone
+
+from content import blobs
+
+# Rows changed this long before the previous run started are rescanned too
+# (transactions that were still open when it ran)
+CURSOR_OVERLAP = timedelta(minutes=5)
+TIMESTAMP_FIELDS = ("updated_at", "published_at")
+
+
+def media_refs(value, pattern):
+    """Media paths (relative to MEDIA_ROOT) mentioned anywhere inside a JSON value."""
+    if isinstance(value, str):
+        return {unquote(match) for match in pattern.findall(value)}
+    items = value.values() if isinstance(value, dict) else value if isinstance(value, list) else ()
+    refs = set()
+    for item in items:
+        refs |= media_refs(item, pattern)
+    return refs
+
+
+class Command(BaseCommand):
+    help = (
+        "Find media files that no model references any more (file/image fields "
+        "and /media/ URLs inside JSON such as Section.data and published page "
+        "snapshots) and move them to a quarantine directory, or delete them. "
+        "Row references are kept in a state file, so later runs only rescan "
+        "rows changed since the previous run."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="Only list what would be removed.")
+        parser.add_argument("--delete", action="store_true", help="Delete instead of quarantining.")
+        parser.add_argument("--full", action="store_true", help="Ignore the state file and rescan every row.")
+        parser.add_argument(
+            "--min-age", type=float, default=24,
+            help="Hours a file must be old before it can be removed (default 24); "
+                 "protects uploads whose section isn't saved yet.",
+        )
+        parser.add_argument(
+            "--path", action="append", dest="paths",
+            help="Only collect under this media subdirectory (repeatable), e.g. sections",
+        )
+        parser.add_argument(
+            "--state",
+            default=getattr(settings, "MEDIA_GC_STATE", os.path.join(settings.BASE_DIR, ".media_gc_state.json")),
+        )
+        parser.add_argument(
+            "--quarantine",
+            default=getattr(settings, "MEDIA_GC_QUARANTINE", os.path.join(settings.BASE_DIR, "media_quarantine")),
+        )
+
+    def handle(self, *args, **options):
+        if not options["delete"] and not options["dry_run"] and not hasattr(default_storage, "path"):
+            raise CommandError("Quarantine needs a local media storage; use --delete or --dry-run.")
+
+        self.pattern = re.compile(re.escape(settings.MEDIA_URL) + r"""([^\s"'<>?#)]+)""")
+        started = timezone.now()
+        state = {} if options["full"] else self.load_state(options["state"])
+
+        referenced, scanned = set(), 0
+        new_state = {"started": started.isoformat(), "models": {}}
+        for model, file_fields, json_fields in self.sources():
+            label = model._meta.label
+            refs, count = self.scan(model, file_fields, json_fields, state.get("started"), state.get("models", {}).get(label))
+            new_state["models"][label] = refs
+            scanned += count
+            for paths in refs.values():
+                referenced.update(paths)
+
+        cutoff = timezone.now() - timedelta(hours=options["min_age"])
+        unreferenced = [
+            name for name in self.files(options["paths"] or [""])
+            if name not in referenced and default_storage.get_modified_time(name) < cutoff
+        ]
+
+        for name in unreferenced:
+            if options["dry_run"]:
+                self.stdout.write(name)
+            elif options["delete"]:
+                default_storage.delete(name)
+            else:
+                target = os.path.join(options["quarantine"], name)
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                os.replace(default_storage.path(name), target)
+
+        if not options["dry_run"]:
+            self.save_state(options["state"], new_state)
+        action = "would be removed" if options["dry_run"] else ("deleted" if options["delete"] else "quarantined")
+        self.stdout.write(self.style.SUCCESS(
+            f"{scanned} row(s) scanned, {len(referenced)} file(s) referenced, "
+            f"{len(unreferenced)} unreferenced file(s) {action}."
+        ))
+
+    # ==========================
+    # REFERENCES
+    # ==========================
+
+    def sources(self):
+        """(model, file fields, JSON fields) for every model that can point at media."""
+        for model in apps.get_models():
+            fields = model._meta.concrete_fields
+            file_fields = [f.attname for f in fields if isinstance(f, models.FileField)]
+            json_fields = [f.attname for f in fields if isinstance(f, models.JSONField)]
+            json_fields += getattr(model, "COMPRESSED_JSON_FIELDS", ())  # e.g. SectionBlob.payload
+            if file_fields or json_fields:
+                yield model, file_fields, json_fields
+
+    def scan(self, model, file_fields, json_fields, since, previous):
+        """{pk: [paths]} for a model, reusing `previous` for rows unchanged since the last run."""
+        timestamp = next((f for f in TIMESTAMP_FIELDS if self.has_field(model, f)), None)
+        queryset = model._default_manager.all()
+        refs = {}
+        if previous is not None and since and timestamp:
+            # ✅ keep refs of rows that still exist, rescan only the changed ones
+            alive = set(map(str, queryset.values_list("pk", flat=True).iterator()))
+            refs = {pk: paths for pk, paths in previous.items() if pk in alive}
+            changed_after = datetime.fromisoformat(since) - CURSOR_OVERLAP
+            queryset = queryset.filter(**{f"{timestamp}__gte": changed_after})
+
+        count = 0
+        for row in queryset.values_list("pk", *file_fields, *json_fields).iterator(chunk_size=500):
+            count += 1
+            pk, values = str(row[0]), row[1:]
+            paths = {value for value in values[: len(file_fields)] if value}
+            for value in values[len(file_fields):]:
+                if isinstance(value, (bytes, memoryview)):
+                    value = blobs.decode(value)
+                paths |= media_refs(value, self.pattern)
+            if paths:
+                refs[pk] = sorted(paths)
+            else:
+                refs.pop(pk, None)
+        return refs, count
+
+    @staticmethod
+    def has_field(model, name):
+        try:
+            model._meta.get_field(name)
+            return True
+        except FieldDoesNotExist:
+            return False
+
+    # ==========================
+    # FILES / STATE
+    # ==========================
+
+    def files(self, roots):
+        for root in roots:
+            pending = [root.strip("/")]
+            while pending:
+                directory = pending.pop()
+                try:
+                    dirs, files = default_storage.listdir(directory)
+                except FileNotFoundError:
+                    continue
+                for name in dirs:
+                    if not name.startswith("."):
+                        pending.append(f"{directory}/{name}" if directory else name)
+                for name in files:
+                    yield f"{directory}/{name}" if directory else name
+
+    def load_state(self, path):
+        try:
+            with open(path) as fh:
+                return json.load(fh)
+        except (OSError, ValueError):
+            return {}
+
+    def save_state(self, path, state):
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as fh:
+            json.dump(state, fh)
+        os.replace(tmp, path)
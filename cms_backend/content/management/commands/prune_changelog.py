@@ -0,0 +1,48 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Max
+from django.utils import timezone
+
+from content.changes import retention_days
+from content.models import ChangeLog
+
+BATCH_SIZE = 5000
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete change log entries older than CHANGE_LOG_RETENTION_DAYS (default 30), "
+        "optionally only those every consumer has already read. Clients with an older "
+        "cursor are told to resync by the change feed. The newest entry is always kept."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=float, default=None, help="Retention in days (default: setting).")
+        parser.add_argument(
+            "--watermark", type=int, default=None,
+            help="Lowest cursor still held by a consumer; newer entries are kept regardless of age.",
+        )
+
+    def handle(self, *args, **options):
+        days = retention_days() if options["days"] is None else options["days"]
+        if days < 0:
+            raise CommandError("--days must be >= 0")
+
+        latest = ChangeLog.objects.aggregate(latest=Max("id"))["latest"]
+        if latest is None:
+            self.stdout.write("Change log is empty.")
+            return
+
+        # the newest row stays, so the feed can always tell a pruned cursor apart
+        old = ChangeLog.objects.filter(changed_at__lt=timezone.now() - timedelta(days=days), id__lt=latest)
+        if options["watermark"] is not None:
+            old = old.filter(id__lte=options["watermark"])
+
+        deleted = 0
+        while True:
+            ids = list(old.order_by("id").values_list("id", flat=True)[:BATCH_SIZE])
+            if not ids:
+                break
+            deleted += ChangeLog.objects.filter(id__in=ids).delete()[0]
+        self.stdout.write(self.style.SUCCESS(f"{deleted} change log entries deleted."))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from content.publishing import publish_missing
+
+
+class Command(BaseCommand):
+    help = (
+        "Publish every active page that has never been published (run once after "
+        "upgrading to the draft/published split; public reads never publish)."
+    )
+
+    def handle(self, *args, **options):
+        published = publish_missing()
+        self.stdout.write(self.style.SUCCESS(f"{published} page(s) published."))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from content.models import Page
+
+
+class Command(BaseCommand):
+    help = "Recompute Page.path and Page.depth from parent_id (after upgrading or raw SQL edits)."
+
+    def handle(self, *args, **options):
+        fixed = Page.rebuild_paths()
+        self.stdout.write(self.style.SUCCESS(f"{fixed} page path(s) updated."))
@@ -1,18 +1,32 @@
+from django.conf import settings
+from django.core.exceptions import ValidationError
 from django.db import models
 from django.utils.text import slugify
 from django.contrib.auth import get_user_model
 from core.models import BaseModel
+from .blobs import EXTERNAL_KEY, ExternalizableJSONField, externalize, is_stub
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
 import random
 User = get_user_model()
 from django.db import transaction
-from django.db.models import F,Max
+from django.db.models import F,Max,Value
+from django.db.models.functions import Concat, Substr
+
+
+class AtomicSaveMixin:
+    """Run save() and its post_save handlers (e.g. the change log) in one transaction."""
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+
 # -------------------------
 # Page Model
 # -------------------------
 
-class Page(BaseModel):
+class Page(AtomicSaveMixin, BaseModel):
     name = models.CharField(max_length=255, default="name")
     title = models.CharField(max_length=255, unique=True)
     slug = models.SlugField(unique=True, blank=True)
@@ -30,6 +44,14 @@ class Page(BaseModel):
     )
     order = models.PositiveIntegerField(default=0)
 
+    # Materialized path: ids from the root down to this page, e.g. "PAGE0001/PAGE0002/"
+    path = models.CharField(max_length=255, default="", editable=False, db_index=True)
+    depth = models.PositiveSmallIntegerField(default=0, editable=False)
+
+    # Taken off the public site (unpublished, or deactivated while published);
+    # such pages are skipped by publish_existing_pages and only published explicitly
+    unpublished = models.BooleanField(default=False, editable=False)
+
 
     class Meta:
         ordering = ["order", "title"]
@@ -37,6 +59,81 @@ class Page(BaseModel):
     def __str__(self):
         return f"{self.id} - {self.title}"
 
+    @property
+    def ancestor_ids(self):
+        return self.path.split("/")[:-2]
+
+    def is_ancestor_of(self, page):
+        return bool(self.path) and page.path.startswith(self.path) and page.pk != self.pk
+
+    def clean(self):
+        if self.parent_id_id:
+            parent = Page.objects.filter(pk=self.parent_id_id).only("path").first()
+            if parent and (parent.pk == self.pk or self.is_ancestor_of(parent)):
+                raise ValidationError({"parent_id": "A page can't be moved under itself or its descendants."})
+
+    def _update_path(self):
+        """Set path/depth from the parent and move the descendants' paths along."""
+        stored = dict(
+            Page.objects.filter(pk__in=[self.pk, self.parent_id_id]).values_list("id", "path")
+        )
+        if "" in stored.values():
+            # rows saved before paths existed: backfill once, then build on them
+            Page.rebuild_paths()
+            stored = dict(
+                Page.objects.filter(pk__in=[self.pk, self.parent_id_id]).values_list("id", "path")
+            )
+        old_path = stored.get(self.pk, "")
+        parent_path = stored.get(self.parent_id_id, "") if self.parent_id_id else ""
+        if old_path and parent_path.startswith(old_path):
+            raise ValidationError({"parent_id": "A page can't be moved under itself or its descendants."})
+
+        self.path = f"{parent_path}{self.pk}/"
+        self.depth = self.path.count("/") - 1
+        if len(self.path) > self._meta.get_field("path").max_length:
+            raise ValidationError({"parent_id": "Page tree is too deep."})
+
+        if old_path and old_path != self.path:
+            Page.objects.filter(path__startswith=old_path).exclude(pk=self.pk).update(
+                path=Concat(Value(self.path), Substr("path", len(old_path) + 1)),
+                depth=F("depth") + (self.depth - (old_path.count("/") - 1)),
+            )
+
+    @classmethod
+    def rebuild_paths(cls):
+        """
+        Recompute every path/depth from parent_id in one pass (after bulk_create /
+        bulk_update, which skip save()). Returns the number of rows fixed.
+        """
+        rows = list(cls.objects.values_list("id", "parent_id", "path", "depth"))
+        parents = {pk: parent for pk, parent, _, _ in rows}
+        paths = {}
+
+        def resolve(pk):
+            chain = []
+            while pk is not None and pk not in paths and pk not in chain:
+                chain.append(pk)
+                pk = parents.get(pk)
+            prefix = paths.get(pk, "")  # a cycle or dangling parent restarts at the root
+            for node in reversed(chain):
+                prefix = paths[node] = f"{prefix}{node}/"
+
+        changed = []
+        for pk, _, path, depth in rows:
+            if pk not in paths:
+                resolve(pk)
+            if paths[pk] != path or paths[pk].count("/") - 1 != depth:
+                changed.append(cls(id=pk, path=paths[pk], depth=paths[pk].count("/") - 1))
+        cls.objects.bulk_update(changed, ["path", "depth"], batch_size=500)
+        return len(changed)
+
+    @classmethod
+    def backfill_paths(cls):
+        """rebuild_paths() if any row still has no path (rows from before paths existed)."""
+        if cls.objects.filter(path="").exists():
+            return cls.rebuild_paths()
+        return 0
+
 
     def save(self, *args, **kwargs):
         # Special case: Home page slug should always be "/"
@@ -51,8 +148,16 @@ class Page(BaseModel):
                 slug = f"{base_slug}-{count}"
                 count += 1
             self.slug = slug
-    
-        super().save(*args, **kwargs)
+
+        update_fields = kwargs.get("update_fields")
+        with transaction.atomic():
+            if update_fields is None or "parent_id" in update_fields:
+                if not self.id:
+                    self.id = self.allocate_ids(1)[0]
+                self._update_path()
+                if update_fields is not None:
+                    kwargs["update_fields"] = {*update_fields, "path", "depth"}
+            super().save(*args, **kwargs)
 
 
 
@@ -72,6 +177,7 @@ class PageSection(models.Model):
 
     def save(self, *args, **kwargs):
         with transaction.atomic():
+            shifted = 0
             # CREATE
             if not self.pk:
                 if self.order is None:
@@ -82,7 +188,7 @@ class PageSection(models.Model):
                     self.order = max_order + 1
                 else:
                     # shift all >= new order down
-                    PageSection.objects.filter(page=self.page, order__gte=self.order).update(order=F("order") + 1)
+                    shifted += PageSection.objects.filter(page=self.page, order__gte=self.order).update(order=F("order") + 1)
 
             # UPDATE
             else:
@@ -90,13 +196,13 @@ class PageSection(models.Model):
                 if old_order != self.order:
                     # shift other sections
                     if old_order < self.order:
-                        PageSection.objects.filter(
+                        shifted += PageSection.objects.filter(
                             page=self.page,
                             order__gt=old_order,
                             order__lte=self.order
                         ).exclude(pk=self.pk).update(order=F("order") - 1)
                     else:
-                        PageSection.objects.filter(
+                        shifted += PageSection.objects.filter(
                             page=self.page,
                             order__lt=old_order,
                             order__gte=self.order
@@ -108,17 +214,22 @@ class PageSection(models.Model):
             sections = PageSection.objects.filter(page=self.page).order_by("order")
             for idx, ps in enumerate(sections, start=1):
                 if ps.order != idx:
-                    PageSection.objects.filter(pk=ps.pk).update(order=idx)
+                    shifted += PageSection.objects.filter(pk=ps.pk).update(order=idx)
+
+            # other mappings of the page were moved by update(), which sends no signals
+            if shifted:
+                ChangeLog.log_page_mappings(self.page_id, exclude=self.pk)
 
 
-class Section(BaseModel):
+class Section(AtomicSaveMixin, BaseModel):
     pages = models.ManyToManyField(
         Page,
         through="PageSection",   # 👈 custom through model
         related_name="sections",
         blank=True
     )
-    data = models.JSONField(default=dict, help_text="Dynamic data for this section")
+    # ✅ Oversized values live compressed in SectionBlob (see content/blobs.py)
+    data = ExternalizableJSONField(default=dict, help_text="Dynamic data for this section")
 
     section_type = models.CharField(max_length=120, default="sectiontype")
 
@@ -148,11 +259,50 @@ class Section(BaseModel):
                 slug = f"{base_slug}-{count}"
                 count += 1
             self.slug = slug
-        super().save(*args, **kwargs)
 
+        data = self.__dict__.get("data")
+        update_fields = kwargs.get("update_fields")
+        if data is None or is_stub(data) or (update_fields is not None and "data" not in update_fields):
+            super().save(*args, **kwargs)  # data deferred, never loaded, or not being saved
+            return
+
+        # ✅ Large data: the row gets a stub, the blob goes to SectionBlob
+        stored, payload = externalize(data)
+        with transaction.atomic():
+            self.__dict__["data"] = stored
+            try:
+                super().save(*args, **kwargs)
+            finally:
+                self.__dict__["data"] = data
+            if payload is not None:
+                SectionBlob.objects.update_or_create(
+                    section_id=self.pk, defaults={"payload": payload, "size": stored[EXTERNAL_KEY]}
+                )
+            else:
+                SectionBlob.objects.filter(section_id=self.pk).delete()
+
+
+class SectionBlob(models.Model):
+    """Compressed Section.data too large to keep in the section row."""
+    section = models.OneToOneField(
+        Section,
+        primary_key=True,
+        related_name="data_blob",
+        on_delete=models.CASCADE
+    )
+    payload = models.BinaryField()  # zlib-compressed JSON
+    size = models.PositiveIntegerField(help_text="Uncompressed size in bytes")
+    updated_at = models.DateTimeField(auto_now=True)
 
+    # media_gc decodes these to find media references
+    COMPRESSED_JSON_FIELDS = ("payload",)
 
-class MetaPixelCode(BaseModel):
+    def __str__(self):
+        return f"{self.section_id} ({self.size} bytes)"
+
+
+
+class MetaPixelCode(AtomicSaveMixin, BaseModel):
     page = models.ForeignKey(
         Page,
         related_name="meta_pixels",
@@ -163,10 +313,105 @@ class MetaPixelCode(BaseModel):
     facebook_pixel_code = models.TextField(blank=True, null=True)
     other_pixel_code = models.TextField(blank=True, null=True)
     custom_pixel_code = models.TextField(blank=True, null=True)
+    # All of the above joined, in order; rebuilt on every save
+    head_tags = models.TextField(blank=True, default="", editable=False)
+
+    HEAD_TAG_FIELDS = (
+        "add_title_meta",
+        "google_pixel_code",
+        "facebook_pixel_code",
+        "other_pixel_code",
+        "custom_pixel_code",
+    )
 
     def __str__(self):
         return f"MetaPixel for Page: {self.page.title}"
 
+    @classmethod
+    def join_head_tags(cls, values):
+        return "\n".join(value.strip() for value in values if value and value.strip())
+
+    def save(self, *args, **kwargs):
+        self.head_tags = self.join_head_tags(getattr(self, field) for field in self.HEAD_TAG_FIELDS)
+        if kwargs.get("update_fields") is not None:
+            kwargs["update_fields"] = {*kwargs["update_fields"], "head_tags"}
+        super().save(*args, **kwargs)
+
+
+# -------------------------
+# Published Page (public snapshot)
+# -------------------------
+
+class PublishedPage(models.Model):
+    """
+    Frozen render payload of a page, written by the publish step.
+    Public reads only ever touch this table, never the draft tables editors write to.
+    """
+    page = models.OneToOneField(
+        Page,
+        primary_key=True,
+        related_name="published",
+        on_delete=models.CASCADE
+    )
+    slug = models.CharField(max_length=255, unique=True)
+    payload = models.JSONField()
+    version = models.PositiveIntegerField(default=1)
+    published_at = models.DateTimeField(auto_now=True)
+    published_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        related_name="published_pages",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+    )
+
+    def __str__(self):
+        return f"{self.slug} (v{self.version})"
+
+
+# -------------------------
+# Change Log (delta sync feed)
+# -------------------------
+
+class ChangeLog(models.Model):
+    """
+    One row per create/update/delete of a synced model, written in the same
+    transaction as the change. The auto-increment id is the feed cursor.
+    Pruned by ``manage.py prune_changelog``.
+    """
+    ACTION_CHOICES = (
+        ("created", "Created"),
+        ("updated", "Updated"),
+        ("deleted", "Deleted"),
+    )
+    model = models.CharField(max_length=50)
+    object_id = models.CharField(max_length=64)
+    action = models.CharField(max_length=10, choices=ACTION_CHOICES)
+    changed_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["id"]
+        indexes = [
+            models.Index(fields=["model", "object_id"]),
+            models.Index(fields=["changed_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.id} - {self.action} {self.model} {self.object_id}"
+
+    @classmethod
+    def record(cls, model, object_ids, action):
+        cls.objects.bulk_create([
+            cls(model=model, object_id=str(object_id), action=action)
+            for object_id in object_ids
+        ])
+
+    @classmethod
+    def log_page_mappings(cls, page_id, exclude=None):
+        """Record every PageSection of a page as updated (after bulk order shifts)."""
+        ids = PageSection.objects.filter(page_id=page_id).exclude(pk=exclude).values_list("pk", flat=True)
+        cls.record("page_section", list(ids), "updated")
+
 
 # -------------------------
 # Extra Data Models
@@ -189,6 +434,14 @@ class SectionType(BaseModel):
 
     def _str_(self):
         return self.name
+
+    def clean(self):
+        from .schema import compile_schema
+
+        try:
+            compile_schema(self.schema)
+        except (ValueError, KeyError, TypeError) as exc:
+            raise ValidationError({"schema": str(exc)})
     
 class FAQ(BaseModel):
     question = models.CharField(max_length=500, unique=True)
@@ -212,6 +465,11 @@ class BlogPost(BaseModel):
     meta_description = models.TextField(blank=True, null=True)
     meta_keywords = models.CharField(max_length=255, blank=True, null=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["is_active", "created_at", "id"]),  # blog index keyset pagination
+        ]
+
     def save(self, *args, **kwargs):
         if not self.slug:
             base_slug = slugify(self.title)
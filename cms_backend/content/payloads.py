@@ -0,0 +1,188 @@
+# content/payloads.py
+"""
+Plain-dict payloads for the public read paths.
+
+The builders only work on ``.values()`` rows, so the same code serves the sync
+ORM, the async ORM (content/async_views.py) and management commands, and never
+triggers a lazy query while rendering. Public navigation and section lists
+read their rows from PublishedPage snapshots; the draft querysets are for
+editors.
+"""
+from collections import defaultdict
+
+from django.db.models import F
+
+from .models import MetaPixelCode, PublishedPage
+
+PAGE_FIELDS = (
+    "id",
+    "name",
+    "title",
+    "slug",
+    "content",
+    "is_active",
+    "order",
+    "parent_id",
+    "page_type",
+    "created_at",
+    "updated_at",
+    "created_by",
+    "updated_by",
+)
+
+
+META_PIXEL_FIELDS = (
+    "id",
+    "page_id",
+    "page__slug",
+    "add_title_meta",
+    "google_pixel_code",
+    "facebook_pixel_code",
+    "other_pixel_code",
+    "custom_pixel_code",
+    "created_at",
+    "updated_at",
+)
+
+
+# ==========================
+# QUERYSETS
+# ==========================
+
+def meta_pixel_rows():
+    return MetaPixelCode.objects.order_by("created_at").values(*META_PIXEL_FIELDS)
+
+
+def head_rows(page_slug):
+    return (
+        MetaPixelCode.objects.filter(page__slug=page_slug)
+        .order_by("created_at")
+        .values("head_tags", *MetaPixelCode.HEAD_TAG_FIELDS)
+    )
+
+
+# ==========================
+# PUBLISHED SNAPSHOTS
+# ==========================
+
+def published_navigation_rows():
+    """id/title/slug/order/created_at/parent_id of the published pages, from their snapshots."""
+    return PublishedPage.objects.order_by("payload__order", "payload__created_at").values(
+        "slug",
+        id=F("page_id"),
+        title=F("payload__title"),
+        order=F("payload__order"),
+        created_at=F("payload__created_at"),
+        parent_id=F("payload__parent_id"),
+    )
+
+
+def published_sections(page_id=None, page_slug=None):
+    """(page id, slug, snapshot sections) of one published page, by id or slug."""
+    qs = PublishedPage.objects.filter(page_id=page_id) if page_id else PublishedPage.objects.filter(slug=page_slug)
+    return qs.values_list("page_id", "slug", "payload__sections")
+
+
+def snapshot_mapping_rows(page_id, page_slug, sections):
+    """A snapshot's sections as PageSection-style rows for build_section(_order), in display order."""
+    rows = [
+        {
+            "order": mapping["order"],
+            "is_active": mapping["is_active"],
+            "page_id": page_id,
+            "page__slug": page_slug,
+            "section_id": mapping["section"]["id"],
+            "section__slug": mapping["section"]["slug"],
+            "section__title": mapping["section"]["title"],
+            "section__section_type": mapping["section"]["section_type"],
+            "section__data": mapping["section"]["data"],
+        }
+        for mapping in sections or []
+    ]
+    return sorted(rows, key=lambda row: (row["order"] is None, row["order"] or 0))
+
+
+# ==========================
+# BUILDERS
+# ==========================
+
+def absolutize_media(data, build_uri):
+    """Same rewrite as SectionSerializer.to_representation: /media/... → absolute URL."""
+    if build_uri is None:
+        return data
+    if isinstance(data, list):
+        for item in data:
+            absolutize_media(item, build_uri)
+    elif isinstance(data, dict):
+        for key, value in data.items():
+            if isinstance(value, str) and value.startswith("/media/"):
+                data[key] = build_uri(value)
+            else:
+                absolutize_media(value, build_uri)
+    return data
+
+
+def build_navigation(rows):
+    """Nest active pages into the NavigationSerializer shape."""
+    children = defaultdict(list)
+    for row in rows:
+        children[row["parent_id"]].append(row)
+
+    def node(row):
+        return {
+            "id": row["id"],
+            "title": row["title"],
+            "slug": row["slug"],
+            "children": [node(child) for child in children[row["id"]]],
+            "order": row["order"],
+            "created_at": row["created_at"],
+        }
+
+    return [node(row) for row in children[None]]
+
+
+def build_section_order(row):
+    """SectionOrderSerializer shape."""
+    return {
+        "id": row["section_id"],
+        "slug": row["section__slug"],
+        "title": row["section__title"],
+        "section_type": row["section__section_type"],
+        "page_id": row["page_id"],
+        "page_slug": row["page__slug"],
+        "is_active": row["is_active"],
+        "order": row["order"],
+    }
+
+
+def build_section(row, build_uri=None):
+    """SectionSerializer shape when filtered by a single page."""
+    return {
+        "id": row["section_id"],
+        "slug": row["section__slug"],
+        "title": row["section__title"],
+        "section_type": row["section__section_type"],
+        "data": absolutize_media(row["section__data"], build_uri),
+        "page_id": row["page_id"],
+        "page_slug": row["page__slug"],
+        "is_active": row["is_active"],
+        "order": row["order"],
+    }
+
+
+def build_head(page_slug, rows):
+    """Combined <head> snippet of a page's meta pixel codes."""
+    parts = [
+        # rows saved before head_tags existed are joined on the fly
+        row["head_tags"] or MetaPixelCode.join_head_tags(row[f] for f in MetaPixelCode.HEAD_TAG_FIELDS)
+        for row in rows
+    ]
+    return {"page_slug": page_slug, "head": MetaPixelCode.join_head_tags(parts)}
+
+
+def build_meta_pixel(row):
+    """MetaPixelCodeSerializer shape."""
+    return {
+        "page_slug" if field == "page__slug" else field: row[field]
+        for field in META_PIXEL_FIELDS
+    }
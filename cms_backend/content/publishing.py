@@ -0,0 +1,139 @@
+# content/publishing.py
+"""
+Draft/published split for pages.
+
+Editors work on Page/PageSection/Section (the draft). ``publish_page`` renders
+the page once with PageSerializer and freezes the result in PublishedPage;
+public reads serve that snapshot and never join the draft tables, and never
+write: only ``POST /pages/{id}/publish/`` publishes.
+
+Pages from before publishing existed are published once with
+``manage.py publish_existing_pages``. A page taken down (``unpublish_page`` or
+deactivation) is flagged ``Page.unpublished`` so that command leaves it alone.
+"""
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from django.http import QueryDict
+
+from . import payloads
+from .cache import cache_timeout, get_version
+from .models import Page, PublishedPage
+from .slugcache import MISSING, SLUGS, slug_cache
+
+
+class _SnapshotRequest:
+    """
+    Stand-in request for rendering a snapshot: no filters, and media URLs kept
+    relative so each public response can make them absolute for its own host.
+    """
+    query_params = QueryDict()
+
+    def build_absolute_uri(self, location=None):
+        return location
+
+
+def render_page(page):
+    from .serializers import PageSerializer
+
+    return PageSerializer(page, context={"request": _SnapshotRequest()}).data
+
+
+def publish_page(page, user=None):
+    """Freeze the current draft of `page` as its public version."""
+    payload = render_page(page)
+    with transaction.atomic():
+        # the slug may have moved to another page since that page was published
+        PublishedPage.objects.filter(slug=page.slug).exclude(page=page).delete()
+        published, created = PublishedPage.objects.select_for_update().get_or_create(
+            page=page,
+            defaults={"slug": page.slug, "payload": payload, "published_by": user},
+        )
+        if not created:
+            published.slug = page.slug
+            published.payload = payload
+            published.published_by = user
+            published.version = F("version") + 1
+            published.save()
+            published.refresh_from_db(fields=["version"])
+        Page.objects.filter(pk=page.pk, unpublished=True).update(unpublished=False)
+        page.unpublished = False
+    return published
+
+
+def unpublish_page(page):
+    with transaction.atomic():
+        Page.objects.filter(pk=page.pk).update(unpublished=True)
+        page.unpublished = True
+        PublishedPage.objects.filter(page=page).delete()
+
+
+def unpublish_pages(page_ids):
+    """
+    Take down the published ones among `page_ids` (deactivated pages, bulk
+    writes that skip signals). Returns the ids that had a snapshot.
+    """
+    with transaction.atomic():
+        live = list(PublishedPage.objects.filter(page_id__in=page_ids).values_list("page_id", flat=True))
+        if live:
+            Page.objects.filter(pk__in=live).update(unpublished=True)
+            PublishedPage.objects.filter(page_id__in=live).delete()
+    return live
+
+
+def never_published():
+    """Active pages without a snapshot that were never taken down on purpose."""
+    return Page.objects.filter(is_active=True, unpublished=False, published__isnull=True)
+
+
+def resolve_slug(slug):
+    """(page id, published version) for a public slug, or None if it isn't published."""
+    stamp = get_version(SLUGS)
+    hit = slug_cache.get(slug, stamp)
+    if hit is not MISSING:
+        return hit
+
+    resolved = PublishedPage.objects.filter(slug=slug).values_list("page_id", "version").first()
+    slug_cache.set(slug, stamp, resolved)
+    return resolved
+
+
+def payload_key(page_id, version):
+    # a snapshot never changes under the same version, so no stamp is needed
+    return f"content:published:{page_id}:{version}"
+
+
+def get_published_payload(slug):
+    """Public payload for `slug`, or None."""
+    resolved = resolve_slug(slug)
+    if resolved is None:
+        return None
+    key = payload_key(*resolved)
+    payload = cache.get(key)
+    if payload is None:
+        payload = PublishedPage.objects.filter(
+            page_id=resolved[0], version=resolved[1]
+        ).values_list("payload", flat=True).first()
+        if payload is None:  # republished or removed since the slug was resolved
+            slug_cache.discard(slug)
+            return PublishedPage.objects.filter(slug=slug).values_list("payload", flat=True).first()
+        cache.set(key, payload, cache_timeout())
+    return payload
+
+
+def present(payload, build_uri):
+    """Make the snapshot's /media/ URLs absolute (e.g. with request.build_absolute_uri)."""
+    for mapping in payload.get("sections", []):
+        payloads.absolutize_media(mapping["section"]["data"], build_uri)
+    for child in payload.get("children", []):
+        present(child, build_uri)
+    return payload
+
+
+def publish_missing(user=None):
+    """Publish active pages that were never published (once, after upgrading). Returns the count."""
+    published = 0
+    for page in never_published():
+        publish_page(page, user=user)
+        published += 1
+    return published
@@ -0,0 +1,187 @@
+# content/purge.py
+"""
+Debounced downstream cache purges.
+
+Content changes queue the slugs of the pages they affect; a background thread
+collects them for ``CONTENT_PURGE_WINDOW`` seconds and hands the whole batch to
+the purge target in one call, so a burst of edits becomes a single purge.
+
+Settings:
+    CONTENT_PURGE_URL      webhook that receives {"pages": [...], "navigation": bool}
+    CONTENT_PURGE_HEADERS  extra request headers (e.g. an auth token)
+    CONTENT_PURGE_TARGET   dotted path to a custom callable(pages, navigation)
+    CONTENT_PURGE_WINDOW   seconds to coalesce changes (default 2)
+    CONTENT_PURGE_MAX_WAIT upper bound while changes keep coming (default 10)
+
+Without a URL or target, purging is disabled.
+"""
+import atexit
+import json
+import logging
+import threading
+import time
+from urllib import request as urllib_request
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+
+# ==========================
+# TARGETS
+# ==========================
+
+class WebhookPurgeTarget:
+    """POST the batch as JSON to a URL (CDN purge endpoint, frontend revalidate hook...)."""
+
+    def __init__(self, url, headers=None, timeout=5):
+        self.url = url
+        self.headers = {"Content-Type": "application/json", **(headers or {})}
+        self.timeout = timeout
+
+    def __call__(self, pages, navigation=False):
+        body = json.dumps({"pages": pages, "navigation": navigation}).encode("utf-8")
+        req = urllib_request.Request(self.url, data=body, headers=self.headers, method="POST")
+        with urllib_request.urlopen(req, timeout=self.timeout) as response:
+            return response.status
+
+
+def get_target():
+    path = getattr(settings, "CONTENT_PURGE_TARGET", None)
+    if path:
+        return import_string(path)
+    url = getattr(settings, "CONTENT_PURGE_URL", None)
+    if url:
+        return WebhookPurgeTarget(url, getattr(settings, "CONTENT_PURGE_HEADERS", None))
+    return None
+
+
+# ==========================
+# DISPATCHER
+# ==========================
+
+class PurgeDispatcher:
+    def __init__(self, target=None, window=None, max_wait=None):
+        self.target = target
+        self.window = window if window is not None else getattr(settings, "CONTENT_PURGE_WINDOW", 2)
+        self.max_wait = max_wait if max_wait is not None else getattr(settings, "CONTENT_PURGE_MAX_WAIT", 10)
+        self._pages = set()
+        self._navigation = False
+        self._first = self._last = None
+        self._cond = threading.Condition()
+        self._thread = None
+
+    def queue(self, pages=(), navigation=False):
+        pages = {slug for slug in pages if slug}
+        if not pages and not navigation:
+            return
+        with self._cond:
+            now = time.monotonic()
+            if self._first is None:
+                self._first = now
+            self._last = now
+            self._pages |= pages
+            self._navigation = self._navigation or navigation
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="content-purge", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def _take(self):
+        pages, navigation = sorted(self._pages), self._navigation
+        self._pages, self._navigation = set(), False
+        self._first = self._last = None
+        return pages, navigation
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._first is None:
+                    if not self._cond.wait(timeout=60):
+                        self._thread = None  # idle: let the thread end
+                        return
+                # Wait for a quiet window, but never longer than max_wait overall
+                while True:
+                    now = time.monotonic()
+                    due = min(self._last + self.window, self._first + self.max_wait)
+                    if now >= due:
+                        break
+                    self._cond.wait(timeout=due - now)
+                pages, navigation = self._take()
+            self._send(pages, navigation)
+
+    def flush(self):
+        """Send whatever is pending right now (used at shutdown)."""
+        with self._cond:
+            if self._first is None:
+                return
+            pages, navigation = self._take()
+        self._send(pages, navigation)
+
+    def _send(self, pages, navigation):
+        try:
+            self.target(pages, navigation=navigation)
+        except Exception:
+            logger.exception("Content purge failed for %s page(s)", len(pages))
+
+
+_dispatcher = None
+_lock = threading.Lock()
+
+
+def get_dispatcher():
+    global _dispatcher
+    if _dispatcher is None:
+        with _lock:
+            if _dispatcher is None:
+                target = get_target()
+                _dispatcher = PurgeDispatcher(target) if target else False
+                if _dispatcher:
+                    atexit.register(_dispatcher.flush)
+    return _dispatcher or None
+
+
+def queue_purge(pages=(), navigation=False):
+    """Queue purges once the current transaction commits (rolled back edits purge nothing)."""
+    dispatcher = get_dispatcher()
+    if dispatcher is None:
+        return
+    pages = list(pages)
+    transaction.on_commit(lambda: dispatcher.queue(pages, navigation))
+
+
+# ==========================
+# AFFECTED PAGES
+# ==========================
+
+def affected_pages(instance):
+    """(page slugs, navigation changed?) for a changed content object."""
+    from .models import MetaPixelCode, Page, PageSection, Section
+
+    if isinstance(instance, Page):
+        slugs = [instance.slug, getattr(instance, "_previous_slug", None)]
+        if instance.parent_id_id:  # parent payload lists its children
+            slugs += Page.objects.filter(pk=instance.parent_id_id).values_list("slug", flat=True)
+        return slugs, True
+    if isinstance(instance, Section):
+        return list(Page.objects.filter(pagesection__section_id=instance.pk).values_list("slug", flat=True)), False
+    if isinstance(instance, (PageSection, MetaPixelCode)):
+        return list(Page.objects.filter(pk=instance.page_id).values_list("slug", flat=True)), False
+    return [], False
+
+
+def purge_instance(instance):
+    if get_dispatcher() is None:
+        return
+    pages, navigation = affected_pages(instance)
+    queue_purge(pages, navigation)
+
+
+def purge_pages(*page_ids, navigation=False):
+    from .models import Page
+
+    if get_dispatcher() is None:
+        return
+    queue_purge(Page.objects.filter(pk__in=page_ids).values_list("slug", flat=True), navigation)
@@ -0,0 +1,65 @@
+# content/responses.py
+"""
+Cached public responses stored as final bytes plus their gzip/br variants
+(see core/utils/compression.py), so a cache hit does no rendering and no
+compression. Keys include the request origin because media URLs are made
+absolute for the requesting host.
+
+The origin comes from the Host header, so with ``ALLOWED_HOSTS = ["*"]`` a
+client could mint a new set of cache entries per made-up host. List the
+origins the site is served from and other hosts get a 400 instead of a cache
+entry (``manage.py check --deploy`` warns, content.W002, when neither this
+nor ALLOWED_HOSTS limits them).
+
+Settings:
+    CONTENT_PUBLIC_ORIGINS  e.g. ["https://example.com", "https://www.example.com"]
+
+Misses are rebuilt single-flight (content/singleflight.py): one request
+renders, concurrent ones wait for it or get the last good variants stored
+under ``stale_key``.
+"""
+import json
+
+from django.conf import settings
+from django.core.exceptions import DisallowedHost
+from rest_framework.utils.encoders import JSONEncoder
+
+from core.utils.compression import encoded_variants, variant_response
+
+from .cache import cache_timeout
+from .singleflight import aget_or_build, get_or_build
+
+JSON = "application/json"
+
+
+def origin(request):
+    """The request's origin, checked against CONTENT_PUBLIC_ORIGINS when set (400 otherwise)."""
+    value = request.build_absolute_uri("/").rstrip("/")
+    allowed = getattr(settings, "CONTENT_PUBLIC_ORIGINS", None)
+    if allowed and value not in allowed:
+        raise DisallowedHost(f"Origin {value!r} is not in CONTENT_PUBLIC_ORIGINS.")
+    return value
+
+
+def render_success(data, message, **extra):
+    """Body of success_response(), rendered once."""
+    body = {"success": True, "message": message, **extra, "data": data or []}
+    return json.dumps(body, cls=JSONEncoder).encode("utf-8")
+
+
+def cached_variants(key, render, stale_key=None):
+    return get_or_build(key, lambda: encoded_variants(render()), cache_timeout(), stale_key)
+
+
+async def acached_variants(key, render, stale_key=None):
+    """Async counterpart; `render` is a coroutine function returning bytes, or None for "not found"."""
+
+    async def build():
+        body = await render()
+        return encoded_variants(body) if body is not None else {}
+
+    return await aget_or_build(key, build, cache_timeout(), stale_key)
+
+
+def json_response(request, variants, status=200):
+    return variant_response(request, variants, JSON, status=status)
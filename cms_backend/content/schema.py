@@ -0,0 +1,274 @@
+# content/schema.py
+"""
+Validation of ``Section.data`` against ``SectionType.schema``.
+
+A schema is compiled once into a tree of small check functions and cached per
+process by section type name. Saving or deleting a SectionType drops the local
+entry and bumps a shared version stamp, so other processes recompile on their
+next lookup.
+
+Two schema styles are understood:
+
+* the short form from the SectionType help text, one entry per field::
+
+      {"title": "string", "image": "url", "subtitle": "string?",
+       "items": [{"heading": "string", "icon": "image"}], "meta": {"order": "integer"}}
+
+  Fields are required unless their type ends with "?". Types: string/text,
+  url/image, number, integer, boolean, list/array, object/dict, any.
+
+* a JSON Schema subset: type, properties, required, items, enum,
+  additionalProperties (false only). A schema is read as JSON Schema only when
+  it has a "$schema" key or is ``{"type": "object", "properties": {...}}``, so
+  short-form fields named "type" or "properties" keep working.
+"""
+import logging
+import threading
+
+from .cache import bump_on_commit, get_version
+
+SCHEMA = "schema"
+
+_validators = {}  # section type name (lowercase) → (version, validator or None)
+_lock = threading.Lock()
+logger = logging.getLogger(__name__)
+
+
+# ==========================
+# COMPILER
+# ==========================
+
+def _is_url(value):
+    return isinstance(value, str) and (
+        value.startswith(("http://", "https://", "/", "data:image"))
+    )
+
+
+SCALARS = {
+    "string": lambda v: isinstance(v, str),
+    "text": lambda v: isinstance(v, str),
+    "url": _is_url,
+    "image": _is_url,  # base64 uploads become URLs on save
+    "number": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    "integer": lambda v: isinstance(v, int) and not isinstance(v, bool),
+    "boolean": lambda v: isinstance(v, bool),
+    "list": lambda v: isinstance(v, list),
+    "array": lambda v: isinstance(v, list),
+    "object": lambda v: isinstance(v, dict),
+    "dict": lambda v: isinstance(v, dict),
+    "null": lambda v: v is None,
+    "any": lambda v: True,
+}
+
+
+def _scalar(type_name):
+    check = SCALARS.get(type_name)
+    if check is None:
+        raise ValueError(f"Unknown schema type '{type_name}'")
+
+    def validate(value, path, errors):
+        if not check(value):
+            errors.append(f"{path or 'data'}: expected {type_name}")
+
+    return validate
+
+
+def _object(fields, required, closed=False):
+    def validate(value, path, errors):
+        if not isinstance(value, dict):
+            errors.append(f"{path or 'data'}: expected object")
+            return
+        for key in required:
+            if key not in value:
+                errors.append(f"{path + '.' if path else ''}{key}: this field is required")
+        for key, item in value.items():
+            child = fields.get(key)
+            if child is not None:
+                child(item, f"{path}.{key}" if path else key, errors)
+            elif closed:
+                errors.append(f"{path + '.' if path else ''}{key}: unexpected field")
+
+    validate.fields, validate.required, validate.closed = fields, required, closed
+    return validate
+
+
+def _array(item_validator):
+    def validate(value, path, errors):
+        if not isinstance(value, list):
+            errors.append(f"{path or 'data'}: expected list")
+            return
+        if item_validator is not None:
+            for idx, item in enumerate(value):
+                item_validator(item, f"{path}[{idx}]", errors)
+
+    validate.items = item_validator
+    return validate
+
+
+def _enum(options, inner):
+    def validate(value, path, errors):
+        if value not in options:
+            errors.append(f"{path or 'data'}: must be one of {options}")
+        elif inner is not None:
+            inner(value, path, errors)
+
+    return validate
+
+
+def _compile_json_schema(schema):
+    types = schema.get("type")
+    validator = None
+    if "properties" in schema or types == "object":
+        fields = {key: _compile_json_schema(sub) for key, sub in schema.get("properties", {}).items()}
+        validator = _object(
+            fields, schema.get("required", []), closed=schema.get("additionalProperties") is False
+        )
+    elif types == "array":
+        validator = _array(_compile_json_schema(schema["items"]) if "items" in schema else None)
+    elif isinstance(types, list):
+        checks = [SCALARS[t] for t in types]
+
+        def validator(value, path, errors):
+            if not any(check(value) for check in checks):
+                errors.append(f"{path or 'data'}: expected {' or '.join(types)}")
+    elif types:
+        validator = _scalar(types)
+
+    if "enum" in schema:
+        return _enum(schema["enum"], validator)
+    return validator or _any
+
+
+def _any(value, path, errors):
+    pass
+
+
+def _compile_short(schema):
+    if isinstance(schema, dict):
+        fields, required = {}, []
+        for key, sub in schema.items():
+            if isinstance(sub, str) and sub.endswith("?"):
+                sub = sub[:-1]
+            else:
+                required.append(key)
+            fields[key] = _compile_short(sub)
+        return _object(fields, required)
+    if isinstance(schema, list):
+        return _array(_compile_short(schema[0]) if schema else None)
+    if isinstance(schema, str):
+        return _scalar(schema.lower())
+    raise ValueError(f"Unsupported schema entry {schema!r}")
+
+
+def is_json_schema(schema):
+    return isinstance(schema, dict) and (
+        "$schema" in schema
+        or (schema.get("type") == "object" and isinstance(schema.get("properties"), dict))
+    )
+
+
+def compile_schema(schema):
+    """Compile a SectionType.schema into validator(value, path, errors), or None if empty."""
+    if not schema:
+        return None
+    if is_json_schema(schema):
+        return _compile_json_schema(schema)
+    return _compile_short(schema)
+
+
+# ==========================
+# CACHE
+# ==========================
+
+def get_validator(section_type):
+    from .models import SectionType
+
+    if not section_type:
+        return None
+    name = section_type.lower()
+    version = get_version(SCHEMA)
+    cached = _validators.get(name)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    with _lock:
+        schema = SectionType.objects.filter(name__iexact=name).values_list("schema", flat=True).first()
+        try:
+            validator = compile_schema(schema)
+        except (ValueError, KeyError, TypeError):
+            # SectionType.clean rejects these; rows written around it are skipped
+            logger.exception("Invalid schema for section type %r", section_type)
+            validator = None
+        _validators[name] = (version, validator)
+    return validator
+
+
+def invalidate(section_type=None):
+    """Forget compiled schemas here and tell other processes to do the same."""
+    if section_type:
+        _validators.pop(section_type.lower(), None)
+    else:
+        _validators.clear()
+    bump_on_commit(SCHEMA)
+
+
+def validate_section_data(section_type, data):
+    """List of error messages for `data` (empty when valid or the type has no schema)."""
+    validator = get_validator(section_type)
+    if validator is None:
+        return []
+    errors = []
+    validator(data, "", errors)
+    return errors
+
+
+def _label(path, key):
+    if isinstance(key, int):
+        return f"{path}[{key}]"
+    return f"{path}.{key}" if path else key
+
+
+def _check_path(validator, value, keys, errors):
+    """Validate the subtree at `keys`, plus required/unexpected keys of its parent."""
+    path = ""
+    for position, key in enumerate(keys):
+        fields = getattr(validator, "fields", None)
+        if fields is not None and isinstance(value, dict):
+            if position == len(keys) - 1:
+                if key not in value:
+                    if key in validator.required:
+                        errors.append(f"{_label(path, key)}: this field is required")
+                    return
+                if key not in fields and validator.closed:
+                    errors.append(f"{_label(path, key)}: unexpected field")
+                    return
+            child = fields.get(key)
+        elif hasattr(validator, "items") and isinstance(value, list) and isinstance(key, int):
+            child = validator.items
+        else:
+            # shape differs from the schema here (or it stops describing it)
+            validator(value, path, errors)
+            return
+        if child is None or key not in (value if isinstance(value, dict) else range(len(value))):
+            return
+        validator, value, path = child, value[key], _label(path, key)
+    validator(value, path, errors)
+
+
+def validate_section_paths(section_type, data, paths):
+    """
+    Like validate_section_data, but only checks the subtrees at `paths` (tuples
+    of keys and list indexes, as reported by content.jsonpatch).
+    """
+    validator = get_validator(section_type)
+    if validator is None:
+        return []
+    errors = []
+    checked = set()
+    for keys in sorted(set(paths), key=len):
+        # a changed subtree covers everything below it
+        if any(keys[:size] in checked for size in range(len(keys))):
+            continue
+        checked.add(keys)
+        _check_path(validator, data, keys, errors)
+    return errors
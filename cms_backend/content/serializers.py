@@ -2,13 +2,23 @@ from rest_framework import serializers
 from django.contrib.auth import get_user_model
 from django.contrib.contenttypes.models import ContentType
 from .models import (
-    Page, MetaPixelCode,PageSection,Section,
+    Page, MetaPixelCode,PageSection,Section,ChangeLog,
+    FAQ, Banner, ContactInfo, Feature, HowItWorks, Impression, Slide, SliderBanner, BlogPost,
 )
 User = get_user_model()
-from django.db.models import F,Max
+from django.db.models import F,Max,Q
 from django.db import transaction
+from django.utils import timezone
+from django.utils.text import slugify
+from .blog import SUMMARY_FIELDS
+from .publishing import unpublish_pages
+from .purge import purge_pages
+from .schema import validate_section_data, validate_section_paths
+from .signals import record_bulk_change
+from .tree import find_cycle
 
 import base64
+import copy
 from django.core.files.storage import default_storage
 from drf_extra_fields.fields import Base64ImageField
 import re
@@ -19,6 +29,7 @@ class SectionSerializer(serializers.ModelSerializer):
     page_slug = serializers.SerializerMethodField()
     is_active = serializers.SerializerMethodField()
     order = serializers.SerializerMethodField()  # per-page order
+    usage_count = serializers.SerializerMethodField()  # pages using the section (list annotation)
 
     class Meta:
         model = Section
@@ -34,6 +45,7 @@ class SectionSerializer(serializers.ModelSerializer):
             "page_slug",  # only if filtering by single page
             "is_active",  # only if filtering by single page
             "order",      # per-page order
+            "usage_count",
         ]
 
     def get_pages(self, obj):
@@ -49,17 +61,17 @@ class SectionSerializer(serializers.ModelSerializer):
             return None  
 
         # ✅ Otherwise return all related pages with is_active
-        pages = obj.pages.all()
-        data = []
-        for page in pages:
-            mapping = PageSection.objects.filter(page=page, section=obj).first()
-            data.append({
-                "id": page.id,
-                "slug": page.slug,
-                "is_active": mapping.is_active if mapping else None,
-                "order": mapping.order if mapping else None
-            })
-        return data
+        # (from the mappings, which SectionViewSet prefetches with their page)
+        mappings = sorted(obj.pagesection_set.all(), key=lambda m: (m.page.order, m.page.title))
+        return [
+            {
+                "id": mapping.page.id,
+                "slug": mapping.page.slug,
+                "is_active": mapping.is_active,
+                "order": mapping.order,
+            }
+            for mapping in mappings
+        ]
 
     def get_page_id(self, obj):
         request = self.context.get("request")
@@ -98,6 +110,9 @@ class SectionSerializer(serializers.ModelSerializer):
     
         mapping = qs.first()
         return mapping.page.slug if mapping else None
+    def get_usage_count(self, obj):
+        return getattr(obj, "usage_count", None)
+
     def get_is_active(self, obj):
         request = self.context.get("request")
         if not request:
@@ -137,7 +152,54 @@ class SectionSerializer(serializers.ModelSerializer):
         mapping = qs.first()
         return mapping.order if mapping else None
 
-    def validate_data(self, value):
+    def validate(self, attrs):
+        """
+        Check 'data' against its SectionType schema, then store Base64 images.
+        With a patch (context["data_paths"]) only the changed subtrees are visited.
+        """
+        attrs = super().validate(attrs)
+        section_type = attrs.get("section_type") or getattr(self.instance, "section_type", None)
+        data = attrs.get("data")
+        paths = self.context.get("data_paths")
+        if data is None and "section_type" in attrs and self.instance is not None:
+            data = self.instance.data  # type changed: existing data must fit the new schema
+        if data is not None:
+            if paths is None or "section_type" in attrs:
+                errors = validate_section_data(section_type, data)
+            else:
+                errors = validate_section_paths(section_type, data, paths)
+            if errors:
+                raise serializers.ValidationError({"data": errors})
+        if "data" in attrs:
+            if paths is None:
+                self.store_images(attrs["data"])
+            else:
+                self.store_images_at(attrs["data"], paths)
+        return attrs
+
+    @staticmethod
+    def store_image(key, file_data):
+        """Save one Base64 image string and return its media URL (None if it isn't one)."""
+        match = re.match(r"^data:(image/[\w\+\-\.]+);base64,", file_data)
+        if not match:
+            return None
+
+        mime_type = match.group(1)
+
+        if mime_type == "image/svg+xml":
+            # Handle SVG manually (store as raw XML)
+            format, imgstr = file_data.split(";base64,", 1)
+            ext = "svg"
+            file = ContentFile(base64.b64decode(imgstr), name=f"{key}.{ext}")
+            file_path = default_storage.save(f"sections/{file.name}", file)
+        else:
+            # Handle raster images (JPG, PNG, GIF, HEIC, etc.)
+            base64_field = Base64ImageField()
+            file_obj = base64_field.to_internal_value(file_data)
+            file_path = default_storage.save(f"sections/{file_obj.name}", file_obj)
+        return default_storage.url(file_path)
+
+    def store_images(self, value):
         """Handle Base64 images in 'data' dict, including handling dynamic image keys and nested structures."""
     
         def handle_images(data):
@@ -147,32 +209,36 @@ class SectionSerializer(serializers.ModelSerializer):
             elif isinstance(data, dict):
                 for key, file_data in data.items():
                     if isinstance(file_data, str) and file_data.startswith("data:image"):
-                        # Detect MIME type
-                        match = re.match(r"^data:(image/[\w\+\-\.]+);base64,", file_data)
-                        if not match:
-                            continue
-    
-                        mime_type = match.group(1)
-    
-                        if mime_type == "image/svg+xml":
-                            # Handle SVG manually (store as raw XML)
-                            format, imgstr = file_data.split(";base64,", 1)
-                            ext = "svg"
-                            file = ContentFile(base64.b64decode(imgstr), name=f"{key}.{ext}")
-                            file_path = default_storage.save(f"sections/{file.name}", file)
-                            data[key] = default_storage.url(file_path)
-                        else:
-                            # Handle raster images (JPG, PNG, GIF, HEIC, etc.)
-                            base64_field = Base64ImageField()
-                            file_obj = base64_field.to_internal_value(file_data)
-                            file_path = default_storage.save(f"sections/{file_obj.name}", file_obj)
-                            data[key] = default_storage.url(file_path)
+                        url = self.store_image(key, file_data)
+                        if url:
+                            data[key] = url
                     else:
                         handle_images(file_data)
     
         handle_images(value)
         return value
 
+    def store_images_at(self, value, paths):
+        """store_images limited to the subtrees at `paths` (keys / list indexes)."""
+        for keys in paths:
+            parent, node = None, value
+            for key in keys:
+                try:
+                    parent, node = node, node[key]
+                except (KeyError, IndexError, TypeError):
+                    break
+            else:
+                if not keys:
+                    self.store_images(value)
+                elif isinstance(node, str) and node.startswith("data:image"):
+                    if isinstance(parent, dict):
+                        url = self.store_image(keys[-1], node)
+                        if url:
+                            parent[keys[-1]] = url
+                else:
+                    self.store_images(node)
+        return value
+
     def to_representation(self, instance):
         """Serialize data, fixing media URLs in 'data' and cleaning fields based on request filters."""
         rep = super().to_representation(instance)
@@ -212,6 +278,8 @@ class SectionSerializer(serializers.ModelSerializer):
         # Conditionally remove 'is_active' if its value is None
         if rep.get("is_active") is None:
             rep.pop("is_active")
+        if not hasattr(instance, "usage_count"):
+            rep.pop("usage_count", None)
     
         return rep
 
@@ -268,6 +336,70 @@ class PageSectionSerializer(serializers.ModelSerializer):
         return instance
 
 
+def _ordered_refs(refs):
+    """Incoming section refs in their final order; explicit `order` wins ties against list position."""
+    ordered = sorted(
+        enumerate(refs),
+        key=lambda item: (
+            item[0] + 1 if item[1].get("order") is None else item[1]["order"],
+            item[1].get("order") is None,
+            item[0],
+        ),
+    )
+    return [ref for _, ref in ordered]
+
+
+def sync_page_sections(refs_by_page):
+    """
+    Make the PageSection rows of each page match `refs_by_page`
+    ({page_id: [{"section" or "section_id", "is_active", "order"?}, ...]}).
+
+    Existing mappings are diffed against the list: only missing ones are
+    inserted, dropped ones deleted, and changed order/is_active written back
+    with a single bulk_update. Orders end up sequential (1..n).
+    """
+    existing = {}
+    for mapping in PageSection.objects.filter(page_id__in=refs_by_page).only(
+        "id", "page_id", "section_id", "is_active", "order"
+    ):
+        existing[(mapping.page_id, mapping.section_id)] = mapping
+
+    to_create, to_update, keep = [], [], set()
+    for page_id, refs in refs_by_page.items():
+        for order, ref in enumerate(_ordered_refs(refs), start=1):
+            section_id = ref["section"].pk if "section" in ref else ref["section_id"]
+            is_active = ref.get("is_active", True)
+            key = (page_id, section_id)
+            keep.add(key)
+            mapping = existing.get(key)
+            if mapping is None:
+                to_create.append(PageSection(page_id=page_id, section_id=section_id, is_active=is_active, order=order))
+            elif mapping.order != order or mapping.is_active != is_active:
+                mapping.order, mapping.is_active = order, is_active
+                to_update.append(mapping)
+
+    to_delete = [mapping.pk for key, mapping in existing.items() if key not in keep]
+    with transaction.atomic():
+        if to_delete:
+            PageSection.objects.filter(pk__in=to_delete).delete()
+        if to_update:
+            PageSection.objects.bulk_update(to_update, ["order", "is_active"])
+        if to_create:
+            PageSection.objects.bulk_create(to_create)
+
+        record_bulk_change(PageSection, [mapping.pk for mapping in to_update], "updated")
+        if to_create:
+            # bulk_create doesn't return ids on MySQL
+            created = Q()
+            for mapping in to_create:
+                created |= Q(page_id=mapping.page_id, section_id=mapping.section_id)
+            record_bulk_change(PageSection, PageSection.objects.filter(created).values_list("pk", flat=True), "created")
+        if to_update or to_create:
+            purge_pages(*refs_by_page)
+
+    return {"created": len(to_create), "updated": len(to_update), "deleted": len(to_delete)}
+
+
 class PageSerializer(serializers.ModelSerializer):
     created_by = serializers.PrimaryKeyRelatedField(read_only=True)
     updated_by = serializers.PrimaryKeyRelatedField(read_only=True)
@@ -315,32 +447,529 @@ class PageSerializer(serializers.ModelSerializer):
         ]
 
     def get_children(self, obj):
-        children = obj.children.all().order_by("created_at")
+        children = obj.children.all().order_by("order", "created_at")
         return PageSerializer(children, many=True, context=self.context).data
 
+    def validate_parent_id(self, parent):
+        # ✅ Paths make the cycle check a prefix test instead of a walk up the tree
+        if parent and self.instance and (parent.pk == self.instance.pk or self.instance.is_ancestor_of(parent)):
+            raise serializers.ValidationError("A page can't be moved under itself or its descendants.")
+        return parent
+
     def create(self, validated_data):
         sections_data = validated_data.pop("pagesection_set", [])
-        page = super().create(validated_data)
-        for sec in sections_data:
-            PageSection.objects.create(
-                page=page,
-                section=sec["section"],
-                is_active=sec.get("is_active", True),
-            )
+        with transaction.atomic():
+            page = super().create(validated_data)
+            if sections_data:
+                sync_page_sections({page.id: sections_data})
         return page
 
     def update(self, instance, validated_data):
         sections_data = validated_data.pop("pagesection_set", None)
-        page = super().update(instance, validated_data)
-        if sections_data is not None:
-            PageSection.objects.filter(page=page).delete()
-            for sec in sections_data:
-                PageSection.objects.create(
+        with transaction.atomic():
+            page = super().update(instance, validated_data)
+            if sections_data is not None:
+                sync_page_sections({page.id: sections_data})
+        return page
+
+# ==========================
+# BULK PAGE OPERATIONS
+# ==========================
+
+class BulkSectionRefSerializer(serializers.Serializer):
+    section_id = serializers.CharField()
+    is_active = serializers.BooleanField(default=True)
+    order = serializers.IntegerField(required=False, min_value=1)
+
+
+class BulkPageDataSerializer(PageSerializer):
+    """
+    PageSerializer for one bulk item. Title uniqueness, parent and section
+    lookups are done once for the whole batch by PageBulkSerializer.
+    """
+    parent_id = serializers.CharField(required=False, allow_null=True)
+    sections = BulkSectionRefSerializer(many=True, required=False)
+
+    class Meta(PageSerializer.Meta):
+        extra_kwargs = {"title": {"validators": []}}
+
+
+class PageOperationSerializer(serializers.Serializer):
+    op = serializers.ChoiceField(choices=["create", "update", "delete"])
+    id = serializers.CharField(required=False)
+    ref = serializers.CharField(required=False)          # name a created page...
+    parent_ref = serializers.CharField(required=False)   # ...and use it as a parent
+    data = serializers.DictField(required=False, default=dict)
+
+    def validate(self, attrs):
+        op = attrs["op"]
+        if op == "create" and attrs.get("id"):
+            raise serializers.ValidationError("'id' is allocated by the server on create.")
+        if op != "create" and not attrs.get("id"):
+            raise serializers.ValidationError(f"'id' is required for {op}.")
+        if op != "create" and attrs.get("ref"):
+            raise serializers.ValidationError("'ref' can only name a created page.")
+
+        if op != "delete":
+            item = BulkPageDataSerializer(data=attrs["data"], partial=op == "update")
+            item.is_valid(raise_exception=True)
+            attrs["values"] = dict(item.validated_data)
+        return attrs
+
+
+class PageBulkSerializer(serializers.Serializer):
+    """
+    Validate a list of page create/update/delete operations together and apply
+    them in one transaction with bulk_create/bulk_update.
+    """
+    operations = PageOperationSerializer(many=True, allow_empty=False)
+
+    def validate(self, attrs):
+        ops = attrs["operations"]
+        errors = {}
+
+        def fail(index, message):
+            errors.setdefault(f"operations[{index}]", []).append(message)
+
+        # ✅ refs of created pages
+        refs = {}
+        for i, op in enumerate(ops):
+            ref = op.get("ref")
+            if ref:
+                if ref in refs:
+                    fail(i, f"Duplicate ref '{ref}'.")
+                refs[ref] = i
+        for i, op in enumerate(ops):
+            if op.get("parent_ref") and op["parent_ref"] not in refs:
+                fail(i, f"Unknown parent_ref '{op['parent_ref']}'.")
+            if op.get("parent_ref") and "parent_id" in op.get("values", {}):
+                fail(i, "Use either 'parent_ref' or 'parent_id', not both.")
+
+        # ✅ existing pages (one query)
+        ids = [op["id"] for op in ops if op["op"] != "create"]
+        if len(ids) != len(set(ids)):
+            raise serializers.ValidationError("A page can only appear in one operation.")
+        pages = Page.objects.in_bulk(ids)
+        deleted = {op["id"] for op in ops if op["op"] == "delete"}
+        for i, op in enumerate(ops):
+            if op["op"] != "create" and op["id"] not in pages:
+                fail(i, f"Page '{op['id']}' not found.")
+
+        # ✅ titles: unique inside the batch and against the table (one query)
+        titles = {}
+        for i, op in enumerate(ops):
+            title = op.get("values", {}).get("title")
+            if title is None:
+                continue
+            if title in titles:
+                fail(i, f"Title '{title}' is used twice in this batch.")
+            titles[title] = op.get("id")
+        renamed = {op["id"] for op in ops if op["op"] == "update" and "title" in op["values"]}
+        for title, owner in Page.objects.filter(title__in=titles).values_list("title", "id"):
+            if owner != titles[title] and owner not in deleted and owner not in renamed:
+                fail(next(i for i, op in enumerate(ops) if op.get("values", {}).get("title") == title),
+                     f"Page with title '{title}' already exists.")
+
+        # ✅ parents and sections exist (one query each)
+        parent_ids = {op["values"]["parent_id"] for op in ops if op.get("values", {}).get("parent_id")}
+        known_parents = set(Page.objects.filter(id__in=parent_ids).values_list("id", flat=True))
+        section_ids = {ref["section_id"] for op in ops for ref in op.get("values", {}).get("sections", [])}
+        known_sections = set(Section.objects.filter(id__in=section_ids).values_list("id", flat=True))
+        for i, op in enumerate(ops):
+            values = op.get("values", {})
+            parent = values.get("parent_id")
+            if parent and (parent not in known_parents or parent in deleted):
+                fail(i, f"Parent page '{parent}' not found.")
+            refs_here = [ref["section_id"] for ref in values.get("sections", [])]
+            if len(refs_here) != len(set(refs_here)):
+                fail(i, "A section can only be listed once per page.")
+            for section_id in set(refs_here) - known_sections:
+                fail(i, f"Section '{section_id}' not found.")
+
+        if errors:
+            raise serializers.ValidationError(errors)
+
+        # ✅ resulting tree: no cycles, no orphans of deleted pages (in memory)
+        parents = dict(Page.objects.values_list("id", "parent_id"))
+        for op in ops:
+            key = op.get("id") or f"ref:{op.get('ref') or id(op)}"
+            if op["op"] == "delete":
+                parents.pop(key, None)
+                continue
+            if op.get("parent_ref"):
+                parents[key] = f"ref:{op['parent_ref']}"
+            elif "parent_id" in op["values"]:
+                parents[key] = op["values"]["parent_id"]
+            elif op["op"] == "create":
+                parents[key] = None
+        cycle = find_cycle(parents)
+        if cycle:
+            raise serializers.ValidationError(f"Operations would create a parent cycle: {cycle}.")
+        orphans = sorted(page for page, parent in parents.items() if parent in deleted)
+        if orphans:
+            raise serializers.ValidationError(
+                f"Unable to delete pages that still have child pages: {orphans}."
+            )
+
+        attrs["pages"] = pages
+        return attrs
+
+    def create(self, validated_data):
+        ops = validated_data["operations"]
+        pages = validated_data["pages"]
+        user = validated_data.get("user")
+        now = timezone.now()
+
+        creates = [op for op in ops if op["op"] == "create"]
+        updates = [op for op in ops if op["op"] == "update"]
+        deletes = [op["id"] for op in ops if op["op"] == "delete"]
+
+        with transaction.atomic():
+            # CREATE ─ ids and slugs allocated for the whole batch up front
+            new_ids = Page.allocate_ids(len(creates))
+            bases = [slugify(op["values"].get("title") or op["values"].get("name", "")) for op in creates]
+            slugs = iter(Page.allocate_slugs([base for op, base in zip(creates, bases) if not _is_home(op)]))
+
+            ref_ids = {op["ref"]: pk for op, pk in zip(creates, new_ids) if op.get("ref")}
+            new_pages, new_sections = [], {}
+            for op, pk in zip(creates, new_ids):
+                values = dict(op["values"])
+                new_sections[pk] = values.pop("sections", [])
+                parent = ref_ids[op["parent_ref"]] if op.get("parent_ref") else values.pop("parent_id", None)
+                values.pop("parent_id", None)
+                new_pages.append(Page(
+                    id=pk,
+                    slug="/" if _is_home(op) else next(slugs),
+                    parent_id_id=parent,
+                    created_by=user,
+                    updated_by=user,
+                    **values,
+                ))
+            Page.objects.bulk_create(_parents_first(new_pages))
+
+            # UPDATE
+            changed_fields = {"updated_at", "updated_by"}
+            updated_pages, replaced_sections = [], {}
+            for op in updates:
+                page = pages[op["id"]]
+                values = dict(op["values"])
+                if "sections" in values:
+                    replaced_sections[page.id] = values.pop("sections")
+                if op.get("parent_ref"):
+                    values["parent_id"] = ref_ids[op["parent_ref"]]
+                if "parent_id" in values:
+                    page.parent_id_id = values.pop("parent_id")
+                    changed_fields.add("parent_id")
+                for field, value in values.items():
+                    setattr(page, field, value)
+                    changed_fields.add(field)
+                if _is_home(op):
+                    page.slug = "/"
+                    changed_fields.add("slug")
+                page.updated_at = now
+                page.updated_by = user
+                updated_pages.append(page)
+            if updated_pages:
+                Page.objects.bulk_update(updated_pages, sorted(changed_fields))
+                # bulk_update sends no post_save, so take deactivated pages down here
+                unpublish_pages([page.id for page in updated_pages if not page.is_active])
+            if new_pages or "parent_id" in changed_fields:
+                Page.rebuild_paths()  # bulk writes skip Page.save
+
+            # SECTIONS ─ created pages get theirs, updated pages are diffed
+            refs_by_page = {pk: refs for pk, refs in new_sections.items() if refs}
+            refs_by_page.update(replaced_sections)
+            if refs_by_page:
+                sync_page_sections(refs_by_page)
+
+            # DELETE (children were checked in validate)
+            touched = [pages[pk].id for pk in deletes]
+            purge_pages(*new_ids, *[page.id for page in updated_pages], *touched, navigation=True)
+            Page.objects.filter(id__in=deletes).delete()
+
+            record_bulk_change(Page, new_ids, "created")
+            record_bulk_change(Page, [page.id for page in updated_pages], "updated")
+
+        return {
+            "created": [
+                {"ref": op.get("ref"), "id": page.id, "slug": page.slug}
+                for op, page in zip(creates, new_pages)
+            ],
+            "updated": [page.id for page in updated_pages],
+            "deleted": deletes,
+        }
+
+
+def _is_home(op):
+    # Page.save: a page titled "home" always gets the "/" slug
+    return (op["values"].get("title") or "").lower() == "home"
+
+
+def _parents_first(pages):
+    """Order new pages so a parent created in the same batch is inserted before its children."""
+    by_id = {page.id: page for page in pages}
+    ordered, seen = [], set()
+
+    def visit(page):
+        if page.id in seen:
+            return
+        seen.add(page.id)
+        if page.parent_id_id in by_id:
+            visit(by_id[page.parent_id_id])
+        ordered.append(page)
+
+    for page in pages:
+        visit(page)
+    return ordered
+
+
+# ==========================
+# BULK SECTION ASSIGNMENT
+# ==========================
+
+class AssignmentSerializer(serializers.Serializer):
+    page_id = serializers.CharField()
+    section_id = serializers.CharField()
+    order = serializers.IntegerField(required=False, min_value=1)  # 1-based position; default last
+    is_active = serializers.BooleanField(default=True)
+
+
+class UnassignmentSerializer(serializers.Serializer):
+    page_id = serializers.CharField()
+    section_id = serializers.CharField()
+
+
+class SectionAssignmentBulkSerializer(serializers.Serializer):
+    """
+    Assign/unassign many (page, section) pairs at once. Pairs are grouped by
+    page and every page's new mapping list is written by sync_page_sections,
+    so the whole batch costs one delete, one bulk_update and one bulk_create.
+    """
+    assign = AssignmentSerializer(many=True, required=False, default=list)
+    unassign = UnassignmentSerializer(many=True, required=False, default=list)
+
+    def validate(self, attrs):
+        pairs = [(item["page_id"], item["section_id"]) for item in attrs["assign"] + attrs["unassign"]]
+        if not pairs:
+            raise serializers.ValidationError("Nothing to assign or unassign.")
+        if len(pairs) != len(set(pairs)):
+            raise serializers.ValidationError("A (page_id, section_id) pair can only appear once.")
+
+        page_ids = {page_id for page_id, _ in pairs}
+        section_ids = {section_id for _, section_id in pairs}
+        missing_pages = page_ids - set(Page.objects.filter(id__in=page_ids).values_list("id", flat=True))
+        missing_sections = section_ids - set(Section.objects.filter(id__in=section_ids).values_list("id", flat=True))
+        errors = []
+        if missing_pages:
+            errors.append(f"Pages not found: {sorted(missing_pages)}.")
+        if missing_sections:
+            errors.append(f"Sections not found: {sorted(missing_sections)}.")
+        if errors:
+            raise serializers.ValidationError(errors)
+        return attrs
+
+    def save(self):
+        assign, unassign = self.validated_data["assign"], self.validated_data["unassign"]
+        page_ids = {item["page_id"] for item in assign + unassign}
+
+        # ✅ current mappings of every touched page, one query
+        current = {page_id: [] for page_id in page_ids}
+        for mapping in PageSection.objects.filter(page_id__in=page_ids).order_by("order", "id").only(
+            "page_id", "section_id", "is_active", "order"
+        ):
+            current[mapping.page_id].append({"section_id": mapping.section_id, "is_active": mapping.is_active})
+
+        skipped = []
+        for item in unassign:
+            refs = current[item["page_id"]]
+            kept = [ref for ref in refs if ref["section_id"] != item["section_id"]]
+            if len(kept) == len(refs):
+                skipped.append({**item, "reason": "not assigned"})
+            current[item["page_id"]] = kept
+
+        # explicit positions first (lowest first, so later inserts don't shift earlier ones), then appends
+        for item in sorted(assign, key=lambda item: (item.get("order") is None, item.get("order") or 0)):
+            refs = current[item["page_id"]]
+            existing = next((ref for ref in refs if ref["section_id"] == item["section_id"]), None)
+            if existing is not None:
+                if item.get("order") is None:
+                    skipped.append({**item, "reason": "already assigned"})
+                    continue
+                refs.remove(existing)  # move to the requested position
+            ref = {"section_id": item["section_id"], "is_active": item["is_active"]}
+            if item.get("order") is None:
+                refs.append(ref)
+            else:
+                refs.insert(min(item["order"], len(refs) + 1) - 1, ref)
+
+        result = sync_page_sections(current)
+        return {**result, "skipped": skipped}
+
+
+# ==========================
+# PAGE CLONE
+# ==========================
+
+class PageCloneSerializer(serializers.Serializer):
+    """
+    Copy a page with its section mappings and meta pixel codes.
+    mode "shallow" maps the same Section rows; "deep" copies them too (new ids
+    and slugs, same data, so media files are shared).
+    """
+    title = serializers.CharField(max_length=255)
+    mode = serializers.ChoiceField(choices=["shallow", "deep"], default="shallow")
+    parent_id = serializers.CharField(required=False, allow_null=True)
+    is_active = serializers.BooleanField(default=False)  # clones start as drafts
+
+    def validate_title(self, title):
+        if Page.objects.filter(title=title).exists():
+            raise serializers.ValidationError(f"Page with title '{title}' already exists.")
+        return title
+
+    def validate_parent_id(self, parent_id):
+        if parent_id and not Page.objects.filter(id=parent_id).exists():
+            raise serializers.ValidationError(f"Parent page '{parent_id}' not found.")
+        return parent_id
+
+    def save(self, source, user=None):
+        values = self.validated_data
+        parent_id = values["parent_id"] if "parent_id" in values else source.parent_id_id
+        mappings = list(
+            PageSection.objects.filter(page=source).order_by("order").select_related("section")
+        )
+        pixels = list(MetaPixelCode.objects.filter(page=source).order_by("created_at"))
+
+        with transaction.atomic():
+            # Page: a single row, so save() keeps slug, path and signals as usual
+            page = Page(
+                name=source.name,
+                title=values["title"],
+                content=source.content,
+                is_active=values["is_active"],
+                page_type=copy.deepcopy(source.page_type),
+                parent_id_id=parent_id,
+                order=source.order,
+                created_by=user,
+                updated_by=user,
+            )
+            page.save()
+
+            # Sections (deep) ─ ids and slugs allocated for the whole batch
+            section_ids = {mapping.section_id: mapping.section_id for mapping in mappings}
+            new_sections = []
+            if values["mode"] == "deep" and mappings:
+                originals = [mapping.section for mapping in mappings]
+                ids = Section.allocate_ids(len(originals))
+                slugs = Section.allocate_slugs([section.slug or slugify(section.title) for section in originals])
+                for section, pk, slug in zip(originals, ids, slugs):
+                    new_sections.append(Section(
+                        id=pk,
+                        slug=slug,
+                        title=section.title,
+                        section_type=section.section_type,
+                        data=copy.deepcopy(section.data),
+                        created_by=user,
+                        updated_by=user,
+                    ))
+                    section_ids[section.id] = pk
+                Section.objects.bulk_create(new_sections)
+
+            PageSection.objects.bulk_create([
+                PageSection(
                     page=page,
-                    section=sec["section"],
-                    is_active=sec.get("is_active", True),
+                    section_id=section_ids[mapping.section_id],
+                    is_active=mapping.is_active,
+                    order=mapping.order,
                 )
-        return page
+                for mapping in mappings
+            ])
+
+            new_pixels = []
+            for pixel, pk in zip(pixels, MetaPixelCode.allocate_ids(len(pixels))):
+                fields = {field: getattr(pixel, field) for field in MetaPixelCode.HEAD_TAG_FIELDS}
+                new_pixels.append(MetaPixelCode(
+                    id=pk,
+                    page=page,
+                    head_tags=pixel.head_tags,
+                    created_by=user,
+                    updated_by=user,
+                    **fields,
+                ))
+            MetaPixelCode.objects.bulk_create(new_pixels)
+
+            # bulk_create sends no signals
+            record_bulk_change(Section, [section.id for section in new_sections], "created")
+            record_bulk_change(
+                PageSection, PageSection.objects.filter(page=page).values_list("pk", flat=True), "created"
+            )
+            record_bulk_change(MetaPixelCode, [pixel.id for pixel in new_pixels], "created")
+            purge_pages(page.id, navigation=True)
+
+        return {
+            "id": page.id,
+            "slug": page.slug,
+            "mode": values["mode"],
+            "sections": len(mappings),
+            "copied_sections": [section.id for section in new_sections],
+            "meta_pixel_codes": len(new_pixels),
+        }
+
+
+# ==========================
+# TREE RESTRUCTURE
+# ==========================
+
+class TreeNodeSerializer(serializers.Serializer):
+    id = serializers.CharField()
+    parent_id = serializers.CharField(allow_null=True)
+    order = serializers.IntegerField(min_value=0)
+
+
+class PageTreeSerializer(serializers.Serializer):
+    """
+    New (parent_id, order) for any number of pages, checked as a whole tree in
+    memory and written with a single bulk_update.
+    """
+    nodes = TreeNodeSerializer(many=True, allow_empty=False)
+
+    def validate_nodes(self, nodes):
+        ids = [node["id"] for node in nodes]
+        if len(ids) != len(set(ids)):
+            raise serializers.ValidationError("A page can only appear once.")
+
+        # ✅ one query for the current shape of the whole tree
+        parents = dict(Page.objects.values_list("id", "parent_id"))
+        missing = sorted(
+            {pk for pk in ids if pk not in parents}
+            | {node["parent_id"] for node in nodes if node["parent_id"] and node["parent_id"] not in parents}
+        )
+        if missing:
+            raise serializers.ValidationError(f"Pages not found: {missing}.")
+
+        self.previous_parents = {pk: parents[pk] for pk in ids}
+        parents.update({node["id"]: node["parent_id"] for node in nodes})
+        cycle = find_cycle(parents)
+        if cycle:
+            raise serializers.ValidationError(f"New tree would contain a parent cycle: {cycle}.")
+        return nodes
+
+    def save(self, user=None):
+        nodes = self.validated_data["nodes"]
+        now = timezone.now()
+        pages = [
+            Page(id=node["id"], parent_id_id=node["parent_id"], order=node["order"], updated_at=now, updated_by=user)
+            for node in nodes
+        ]
+        ids = [page.id for page in pages]
+        with transaction.atomic():
+            Page.objects.bulk_update(pages, ["parent_id", "order", "updated_at", "updated_by"], batch_size=500)
+            Page.rebuild_paths()
+            record_bulk_change(Page, ids, "updated")
+            # old and new parents list these pages among their children
+            touched = {*ids, *self.previous_parents.values(), *(node["parent_id"] for node in nodes)}
+            purge_pages(*(pk for pk in touched if pk), navigation=True)
+        return {"updated": ids}
+
 
 # ==========================
 # NAVIGATION SERIALIZER
@@ -355,7 +984,7 @@ class NavigationSerializer(serializers.ModelSerializer):
 
     def get_children(self, obj):
         # Only include active children ordered by `order`
-        children = obj.children.filter(is_active=True).order_by("created_at")
+        children = obj.children.filter(is_active=True).order_by("order", "created_at")
         return NavigationSerializer(children, many=True).data
     
 
@@ -414,6 +1043,7 @@ class SectionListSerializer(serializers.Serializer):
                     for idx, ps in enumerate(sections_on_page, start=1):
                         if ps.order != idx:
                             PageSection.objects.filter(pk=ps.pk).update(order=idx)
+                    ChangeLog.log_page_mappings(page.id)
 
             created_sections.append(section)
             mappings.append(mapping)
@@ -560,10 +1190,10 @@ class MetaPixelCodeSerializer(serializers.ModelSerializer):
         ]
 
     def get_page_id(self, obj):
-        return obj.page.id if obj.page else None
+        return obj.page_id
 
     def get_page_slug(self, obj):
-        return obj.page.slug if obj.page else None
+        return obj.page.slug if obj.page_id else None
 
     def validate(self, attrs):
         page_id = self.initial_data.get("page_id")
@@ -615,3 +1245,81 @@ class PageMiniSerializer(serializers.ModelSerializer):
         mapping = PageSection.objects.filter(page=page, section=section).first()
         return mapping.is_active if mapping else None
 
+
+
+# ==========================
+# SITE CONTENT (read-only)
+# ==========================
+
+class FAQSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = FAQ
+        fields = ["id", "question", "answer", "order", "is_active", "updated_at"]
+
+
+class FeatureSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Feature
+        fields = ["id", "title", "description", "icon", "order", "is_active", "updated_at"]
+
+
+class ContactInfoSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ContactInfo
+        fields = ["id", "contact_type", "label", "value", "icon", "order", "is_active", "updated_at"]
+
+
+class BannerSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Banner
+        fields = [
+            "id", "title", "slug", "heading", "subheading", "description",
+            "image", "url", "is_active", "extra_fields", "updated_at",
+        ]
+
+
+class HowItWorksSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = HowItWorks
+        fields = [
+            "id", "title", "subtitle", "description", "steps",
+            "background_image", "is_active", "extra_fields", "updated_at",
+        ]
+
+
+class ImpressionSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Impression
+        fields = ["id", "type", "title", "description", "image", "is_active", "updated_at"]
+
+
+class SlideSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Slide
+        fields = ["id", "heading", "description", "image"]
+
+
+class SliderBannerSerializer(serializers.ModelSerializer):
+    slides = SlideSerializer(many=True, read_only=True)  # prefetched by the caller
+
+    class Meta:
+        model = SliderBanner
+        fields = ["id", "title", "slug", "is_active", "slides", "updated_at"]
+
+
+# ==========================
+# BLOG (read-only)
+# ==========================
+
+class BlogPostSummarySerializer(serializers.ModelSerializer):
+    """Index entry: no content, so the list query can defer it."""
+
+    class Meta:
+        model = BlogPost
+        fields = list(SUMMARY_FIELDS)
+
+
+class BlogPostSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = BlogPost
+        fields = list(SUMMARY_FIELDS) + ["content"]
@@ -0,0 +1,175 @@
+# content/signals.py
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .cache import BLOG, PAGES, SITE, bump_on_commit
+from . import schema
+from .blog import invalidate_posts
+from .models import (
+    BlogPost, ChangeLog, MetaPixelCode, Page, PageSection, PublishedPage, Section, SectionType,
+    FAQ, Banner, ContactInfo, Feature, HowItWorks, Impression, Slide, SliderBanner,
+)
+from .publishing import unpublish_pages
+from .purge import get_dispatcher, purge_instance, purge_pages, queue_purge
+from .slugcache import SLUGS
+
+
+# ==========================
+# CACHE INVALIDATION
+# ==========================
+
+@receiver(post_save, sender=Page)
+@receiver(post_delete, sender=Page)
+@receiver(post_save, sender=Section)
+@receiver(post_delete, sender=Section)
+@receiver(post_save, sender=PageSection)
+@receiver(post_delete, sender=PageSection)
+@receiver(post_save, sender=MetaPixelCode)
+@receiver(post_delete, sender=MetaPixelCode)
+def invalidate_page_content(sender, **kwargs):
+    bump_on_commit(PAGES)
+
+
+@receiver(post_save, sender=Page)
+@receiver(post_delete, sender=Page)
+def invalidate_slugs(sender, **kwargs):
+    bump_on_commit(SLUGS)
+
+
+@receiver(m2m_changed, sender=Section.pages.through)
+def invalidate_page_mappings(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        bump_on_commit(PAGES)
+
+
+# ==========================
+# CHANGE LOG
+# ==========================
+
+CHANGE_LOGGED = {
+    Page: "page",
+    Section: "section",
+    PageSection: "page_section",
+    MetaPixelCode: "meta_pixel_code",
+}
+
+
+def log_save(sender, instance, created, raw=False, **kwargs):
+    if raw:  # loaddata
+        return
+    ChangeLog.record(CHANGE_LOGGED[sender], [instance.pk], "created" if created else "updated")
+
+
+def log_delete(sender, instance, **kwargs):
+    ChangeLog.record(CHANGE_LOGGED[sender], [instance.pk], "deleted")
+
+
+def record_bulk_change(model, ids, action):
+    """Change log + cache invalidation for bulk_create/bulk_update, which send no signals."""
+    ids = list(ids)
+    if ids:
+        ChangeLog.record(CHANGE_LOGGED[model], ids, action)
+        bump_on_commit(*((PAGES, SLUGS) if model is Page else (PAGES,)))
+
+
+for model in CHANGE_LOGGED:
+    post_save.connect(log_save, sender=model, dispatch_uid=f"changelog_save_{model.__name__}")
+    post_delete.connect(log_delete, sender=model, dispatch_uid=f"changelog_delete_{model.__name__}")
+
+
+# ==========================
+# DOWNSTREAM PURGES
+# ==========================
+
+@receiver(pre_save, sender=Page)
+def remember_previous_slug(sender, instance, **kwargs):
+    # A renamed page must also be purged under its old slug
+    if instance.pk and get_dispatcher() is not None:
+        instance._previous_slug = Page.objects.filter(pk=instance.pk).values_list("slug", flat=True).first()
+
+
+def purge_on_change(sender, instance, raw=False, **kwargs):
+    if not raw:
+        purge_instance(instance)
+
+
+for model in CHANGE_LOGGED:
+    post_save.connect(purge_on_change, sender=model, dispatch_uid=f"purge_save_{model.__name__}")
+    post_delete.connect(purge_on_change, sender=model, dispatch_uid=f"purge_delete_{model.__name__}")
+
+
+@receiver(m2m_changed, sender=Section.pages.through)
+def purge_page_mappings(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if isinstance(instance, Page):
+        purge_pages(instance.pk)
+    elif pk_set:
+        purge_pages(*pk_set)
+
+
+# ==========================
+# PUBLISHED SNAPSHOTS
+# ==========================
+
+@receiver(post_save, sender=Page)
+def unpublish_inactive_page(sender, instance, raw=False, **kwargs):
+    # Deactivating a page takes it off the public site right away
+    if not raw and not instance.is_active and unpublish_pages([instance.pk]):
+        instance.unpublished = True  # reactivating it doesn't put it back on its own
+
+
+@receiver(post_save, sender=PublishedPage)
+@receiver(post_delete, sender=PublishedPage)
+def invalidate_published(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    bump_on_commit(PAGES, SLUGS)
+    queue_purge([instance.slug])
+
+
+# ==========================
+# SECTION TYPE SCHEMAS
+# ==========================
+
+@receiver(post_save, sender=SectionType)
+@receiver(post_delete, sender=SectionType)
+def invalidate_section_schema(sender, instance, **kwargs):
+    # The version bump also covers a renamed type's old name in every process
+    schema.invalidate(instance.name)
+
+
+# ==========================
+# BLOG
+# ==========================
+
+@receiver(pre_save, sender=BlogPost)
+def remember_previous_blog_slug(sender, instance, **kwargs):
+    if instance.pk:
+        instance._previous_slug = BlogPost.objects.filter(pk=instance.pk).values_list("slug", flat=True).first()
+
+
+@receiver(post_save, sender=BlogPost)
+@receiver(post_delete, sender=BlogPost)
+def invalidate_blog(sender, instance, **kwargs):
+    bump_on_commit(BLOG)
+    slugs = (instance.slug, getattr(instance, "_previous_slug", None))
+    transaction.on_commit(lambda: invalidate_posts(*slugs))
+
+
+# ==========================
+# SITE CONTENT
+# ==========================
+
+# everything served by content/site.py
+SITE_MODELS = (FAQ, Banner, ContactInfo, Feature, HowItWorks, Impression, SliderBanner, Slide)
+
+
+def invalidate_site(sender, **kwargs):
+    bump_on_commit(SITE)
+
+
+for model in SITE_MODELS:
+    post_save.connect(invalidate_site, sender=model, dispatch_uid=f"site_save_{model.__name__}")
+    post_delete.connect(invalidate_site, sender=model, dispatch_uid=f"site_delete_{model.__name__}")
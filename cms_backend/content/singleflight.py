@@ -0,0 +1,193 @@
+# content/singleflight.py
+"""
+Single-flight rebuilds of cache entries.
+
+On a miss only one caller runs ``build``:
+
+* threads of the same process wait for the leader's result in memory;
+* other processes see the leader's lock in the cache backend (``cache.add``)
+  and serve the previous value stored under ``stale_key`` right away, or,
+  when there is none yet, poll the cache until the leader has stored its
+  result (and build themselves if it takes too long).
+
+Every successful build is also written to ``stale_key`` (a key without the
+version stamp), so after an invalidation readers keep getting the last good
+value while one request renders the new one.
+
+The cross-process lock lives in the cache, so it only spans workers that
+share a cache backend (Redis, Memcached; see content/cache.py). With the
+default per-process LocMemCache each worker rebuilds on its own.
+
+Settings:
+    SINGLE_FLIGHT_LOCK_TIMEOUT   seconds a rebuild may hold the cache lock (default 30)
+    SINGLE_FLIGHT_WAIT           seconds a waiter waits before building itself (default 5)
+    SINGLE_FLIGHT_STALE_TIMEOUT  seconds the last good value is kept (default 1 day)
+"""
+import asyncio
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+
+POLL_INTERVAL = 0.05
+
+_flights = {}  # key → _Flight of the thread rebuilding it in this process
+_flights_lock = threading.Lock()
+
+
+def lock_timeout():
+    return getattr(settings, "SINGLE_FLIGHT_LOCK_TIMEOUT", 30)
+
+
+def wait_timeout():
+    return getattr(settings, "SINGLE_FLIGHT_WAIT", 5)
+
+
+def stale_timeout():
+    return getattr(settings, "SINGLE_FLIGHT_STALE_TIMEOUT", 60 * 60 * 24)
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+
+
+def _store(key, value, timeout, stale_key):
+    cache.set(key, value, timeout)
+    if stale_key:
+        cache.set(stale_key, value, stale_timeout())
+
+
+async def _astore(key, value, timeout, stale_key):
+    await cache.aset(key, value, timeout)
+    if stale_key:
+        await cache.aset(stale_key, value, stale_timeout())
+
+
+# ==========================
+# SYNC
+# ==========================
+
+def get_or_build(key, build, timeout, stale_key=None):
+    """cache.get(key), or the result of one `build()` shared by every concurrent miss."""
+    value = cache.get(key)
+    if value is not None:
+        return value
+
+    with _flights_lock:
+        flight = _flights.get(key)
+        leader = flight is None
+        if leader:
+            flight = _flights[key] = _Flight()
+
+    if not leader:
+        stale = cache.get(stale_key) if stale_key else None
+        if stale is not None:
+            return stale
+        flight.done.wait(wait_timeout())
+        if flight.value is not None:
+            return flight.value
+        return _build_across_processes(key, build, timeout, stale_key)
+
+    try:
+        flight.value = _build_across_processes(key, build, timeout, stale_key)
+        return flight.value
+    finally:
+        flight.done.set()
+        with _flights_lock:
+            _flights.pop(key, None)
+
+
+def _build_across_processes(key, build, timeout, stale_key):
+    lock_key, token = f"{key}:lock", uuid.uuid4().hex
+    if not cache.add(lock_key, token, lock_timeout()):
+        # ✅ another process is rebuilding: last good value, or wait for its result
+        stale = cache.get(stale_key) if stale_key else None
+        if stale is not None:
+            return stale
+        deadline = time.monotonic() + wait_timeout()
+        while time.monotonic() < deadline:
+            time.sleep(POLL_INTERVAL)
+            value = cache.get(key)
+            if value is not None:
+                return value
+            if cache.get(lock_key) is None:
+                break  # the leader failed; build it here
+        value = build()
+        _store(key, value, timeout, stale_key)
+        return value
+
+    try:
+        value = build()
+        _store(key, value, timeout, stale_key)
+        return value
+    finally:
+        if cache.get(lock_key) == token:
+            cache.delete(lock_key)
+
+
+# ==========================
+# ASYNC
+# ==========================
+
+_aflights = {}  # (event loop, key) → asyncio.Future of the task rebuilding it
+
+
+async def aget_or_build(key, build, timeout, stale_key=None):
+    """Async get_or_build; `build` is a coroutine function."""
+    value = await cache.aget(key)
+    if value is not None:
+        return value
+
+    flight_key = (id(asyncio.get_running_loop()), key)
+    flight = _aflights.get(flight_key)
+    if flight is not None:
+        stale = await cache.aget(stale_key) if stale_key else None
+        if stale is not None:
+            return stale
+        try:
+            return await asyncio.wait_for(asyncio.shield(flight), wait_timeout())
+        except Exception:
+            return await _abuild_across_processes(key, build, timeout, stale_key)
+
+    flight = _aflights[flight_key] = asyncio.get_running_loop().create_future()
+    try:
+        value = await _abuild_across_processes(key, build, timeout, stale_key)
+        flight.set_result(value)
+        return value
+    except BaseException as exc:
+        flight.set_exception(exc)
+        flight.exception()  # retrieved, so an error nobody waits for isn't logged
+        raise
+    finally:
+        _aflights.pop(flight_key, None)
+
+
+async def _abuild_across_processes(key, build, timeout, stale_key):
+    lock_key, token = f"{key}:lock", uuid.uuid4().hex
+    if not await cache.aadd(lock_key, token, lock_timeout()):
+        stale = await cache.aget(stale_key) if stale_key else None
+        if stale is not None:
+            return stale
+        deadline = time.monotonic() + wait_timeout()
+        while time.monotonic() < deadline:
+            await asyncio.sleep(POLL_INTERVAL)
+            value = await cache.aget(key)
+            if value is not None:
+                return value
+            if await cache.aget(lock_key) is None:
+                break
+        value = await build()
+        await _astore(key, value, timeout, stale_key)
+        return value
+
+    try:
+        value = await build()
+        await _astore(key, value, timeout, stale_key)
+        return value
+    finally:
+        if await cache.aget(lock_key) == token:
+            await cache.adelete(lock_key)
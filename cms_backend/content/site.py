@@ -0,0 +1,46 @@
+# content/site.py
+"""
+Site-wide auxiliary content: banners, sliders, features, how-it-works blocks,
+impressions, FAQs and contact info.
+
+SITE_CONTENT maps each kind to its active queryset and serializer; the read
+endpoints and the /site-bundle/ payload share it. Saving or deleting any of
+these models bumps the SITE version (content/signals.py), which drops every
+cached list and bundle at once.
+"""
+from django.db.models import Prefetch
+
+from .models import FAQ, Banner, ContactInfo, Feature, HowItWorks, Impression, Slide, SliderBanner
+from .serializers import (
+    BannerSerializer, ContactInfoSerializer, FAQSerializer, FeatureSerializer,
+    HowItWorksSerializer, ImpressionSerializer, SliderBannerSerializer,
+)
+
+
+def _sliders():
+    # ✅ all slides of all sliders in one extra query
+    return SliderBanner.objects.filter(is_active=True).order_by("created_at").prefetch_related(
+        Prefetch("slides", queryset=Slide.objects.order_by("created_at"))
+    )
+
+
+# bundle key → (active queryset, serializer)
+SITE_CONTENT = {
+    "banners": (lambda: Banner.objects.filter(is_active=True).order_by("created_at"), BannerSerializer),
+    "sliders": (_sliders, SliderBannerSerializer),
+    "features": (lambda: Feature.objects.filter(is_active=True).order_by("order", "created_at"), FeatureSerializer),
+    "how_it_works": (lambda: HowItWorks.objects.filter(is_active=True).order_by("created_at"), HowItWorksSerializer),
+    "impressions": (lambda: Impression.objects.filter(is_active=True).order_by("type", "created_at"), ImpressionSerializer),
+    "faqs": (lambda: FAQ.objects.filter(is_active=True).order_by("order", "created_at"), FAQSerializer),
+    "contact_info": (lambda: ContactInfo.objects.filter(is_active=True).order_by("contact_type", "order"), ContactInfoSerializer),
+}
+
+
+def build_items(kind, request):
+    queryset, serializer = SITE_CONTENT[kind]
+    return serializer(queryset(), many=True, context={"request": request}).data
+
+
+def build_bundle(request):
+    """Every active item of every kind, keyed like SITE_CONTENT (one query per kind, plus slides)."""
+    return {kind: build_items(kind, request) for kind in SITE_CONTENT}
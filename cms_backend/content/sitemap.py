@@ -0,0 +1,200 @@
+# content/sitemap.py
+"""
+sitemap.xml for published pages and active blog posts.
+
+Rows are streamed with ``.iterator()`` and written out as they are read. Past
+``SITEMAP_MAX_URLS`` URLs (50,000, the protocol limit) /sitemap.xml becomes a
+sitemap index pointing at /sitemap-pages-<n>.xml and /sitemap-blog-<n>.xml.
+Bodies up to ``SITEMAP_CACHE_MAX_BYTES`` are cached, with their gzip/br
+variants, under the pages and blog version stamps, so page and post writes
+invalidate them; larger files are streamed on every request. Page URLs are
+built from the stored ``Page.path``.
+
+Settings:
+    SITEMAP_BASE_URL         public site origin (default: the request's, see content/responses.origin)
+    SITEMAP_BLOG_PREFIX      path of blog posts (default "/blog/")
+    SITEMAP_MAX_URLS         URLs per sitemap file (default 50000)
+    SITEMAP_CACHE_MAX_BYTES  largest body that is cached (default 1 MiB)
+"""
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import Http404, StreamingHttpResponse
+from django.views.decorators.http import require_safe
+
+from core.utils.compression import encoded_variants, variant_response
+
+from .cache import BLOG, PAGES, cache_timeout, get_version, versioned_key
+from .models import BlogPost, Page, PublishedPage
+from .responses import origin
+
+XML_HEADER = '<?xml version="1.0" encoding="UTF-8"?>\n'
+URLSET_OPEN = '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+URLSET_CLOSE = "</urlset>\n"
+CONTENT_TYPE = "application/xml; charset=utf-8"
+
+
+def max_urls():
+    return getattr(settings, "SITEMAP_MAX_URLS", 50000)
+
+
+def base_url(request):
+    return getattr(settings, "SITEMAP_BASE_URL", None) or origin(request)
+
+
+# ==========================
+# URL SOURCES
+# ==========================
+
+def _window(rows, start, stop):
+    return rows[start:stop] if stop is not None else rows
+
+
+CHUNK = 2000
+
+
+def _chunks(rows):
+    chunk = []
+    for row in rows.iterator(chunk_size=CHUNK):
+        chunk.append(row)
+        if len(chunk) == CHUNK:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def page_paths(start=0, stop=None):
+    """(path, published_at) of published pages, nested under their parents' published slugs."""
+    Page.backfill_paths()
+
+    # ✅ Ancestors come from the stored Page.path; their slugs are looked up
+    # per chunk, so memory stays bounded by the chunk, not the page count
+    slugs = {}
+    rows = (
+        Page.objects.filter(is_active=True, published__isnull=False)
+        .order_by("id")
+        .values_list("id", "published__slug", "path", "published__published_at")
+    )
+    for chunk in _chunks(_window(rows, start, stop)):
+        ancestors = {pk for _, _, path, _ in chunk for pk in path.split("/")[:-2]}
+        if len(slugs) > 10 * CHUNK:
+            slugs.clear()
+        missing = ancestors - slugs.keys()
+        if missing:
+            slugs.update(PublishedPage.objects.filter(page_id__in=missing).values_list("page_id", "slug"))
+        for pk, slug, path, updated_at in chunk:
+            parts = [slugs.get(ancestor, "") for ancestor in path.split("/")[:-2]] + [slug]
+            parts = [part.strip("/") for part in parts if part and part != "/"]  # Home is the root
+            yield "/" + "/".join(parts) + ("/" if parts else ""), updated_at
+
+
+def blog_paths(start=0, stop=None):
+    prefix = getattr(settings, "SITEMAP_BLOG_PREFIX", "/blog/")
+    rows = BlogPost.objects.filter(is_active=True).order_by("id").values_list("slug", "updated_at")
+    for slug, updated_at in _window(rows, start, stop).iterator(chunk_size=CHUNK):
+        yield f"{prefix}{slug}/", updated_at
+
+
+SOURCES = {
+    "pages": (page_paths, lambda: Page.objects.filter(is_active=True, published__isnull=False).count()),
+    "blog": (blog_paths, lambda: BlogPost.objects.filter(is_active=True).count()),
+}
+
+
+# ==========================
+# XML
+# ==========================
+
+def _url(base, path, updated_at):
+    return (
+        f"<url><loc>{escape(base + path)}</loc>"
+        f"<lastmod>{updated_at.date().isoformat()}</lastmod></url>\n"
+    )
+
+
+def urlset(base, entries):
+    yield XML_HEADER + URLSET_OPEN
+    for path, updated_at in entries:
+        yield _url(base, path, updated_at)
+    yield URLSET_CLOSE
+
+
+def sitemap_index(base, parts):
+    yield XML_HEADER + '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+    for kind, number in parts:
+        yield f"<sitemap><loc>{escape(base)}/sitemap-{kind}-{number}.xml</loc></sitemap>\n"
+    yield "</sitemapindex>\n"
+
+
+# ==========================
+# VIEWS
+# ==========================
+
+def _cache_key(*parts):
+    return versioned_key(PAGES, "sitemap", f"blog{get_version(BLOG)}", *parts)
+
+
+def cache_max_bytes():
+    return getattr(settings, "SITEMAP_CACHE_MAX_BYTES", 1024 * 1024)
+
+
+def _respond(request, key, build):
+    """
+    Serve the cached body (precompressed variants included), or stream the
+    chunks of build(). Bodies up to SITEMAP_CACHE_MAX_BYTES are cached,
+    compressed once, when complete; larger ones are only streamed, so a full
+    50,000-URL file is never held in memory.
+    """
+    variants = cache.get(key)
+    if variants is not None:
+        return variant_response(request, variants, CONTENT_TYPE)
+
+    def stream():
+        written, size, limit = [], 0, cache_max_bytes()
+        for chunk in build():
+            chunk = chunk.encode("utf-8")
+            if written is not None:
+                size += len(chunk)
+                if size <= limit:
+                    written.append(chunk)
+                else:
+                    written = None  # too big to cache; stop holding it
+            yield chunk
+        if written is not None:
+            cache.set(key, encoded_variants(b"".join(written)), cache_timeout())
+
+    return StreamingHttpResponse(stream(), content_type=CONTENT_TYPE)
+
+
+@require_safe
+def sitemap(request):
+    base = base_url(request)
+
+    def build():
+        counts = {kind: count() for kind, (_, count) in SOURCES.items()}
+        limit = max_urls()
+        if sum(counts.values()) <= limit:
+            return urlset(base, (entry for paths, _ in SOURCES.values() for entry in paths()))
+        parts = [
+            (kind, number)
+            for kind, total in counts.items()
+            for number in range(1, (total + limit - 1) // limit + 1)
+        ]
+        return sitemap_index(base, parts)
+
+    return _respond(request, _cache_key(base, "root"), build)
+
+
+@require_safe
+def sitemap_part(request, kind, number):
+    if kind not in SOURCES or number < 1:
+        raise Http404("Unknown sitemap")
+    paths, count = SOURCES[kind]
+    limit = max_urls()
+    start = (number - 1) * limit
+    if start >= count():
+        raise Http404("Unknown sitemap")
+    base = base_url(request)
+    return _respond(request, _cache_key(base, kind, number), lambda: urlset(base, paths(start, start + limit)))
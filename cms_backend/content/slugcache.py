@@ -0,0 +1,65 @@
+# content/slugcache.py
+"""
+Per-process LRU map of public slug → (page id, published version).
+
+Entries carry the shared ``slugs`` version stamp they were read under; a Page
+or PublishedPage write bumps the stamp once it commits (content/signals.py),
+which turns every process's entries stale at once, as long as the stamp
+lives in a cache all processes share (see content/cache.py). Unknown slugs are remembered as misses for a
+short TTL so scanners probing random URLs don't reach the database.
+
+Settings:
+    SLUG_CACHE_SIZE          entries per process (default 2048)
+    SLUG_CACHE_NEGATIVE_TTL  seconds a miss is remembered (default 30)
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+SLUGS = "slugs"
+
+MISSING = object()  # not in the cache (as opposed to a cached "no such page")
+
+
+class SlugCache:
+    def __init__(self, size=None, negative_ttl=None):
+        self.size = size or getattr(settings, "SLUG_CACHE_SIZE", 2048)
+        self.negative_ttl = (
+            negative_ttl if negative_ttl is not None else getattr(settings, "SLUG_CACHE_NEGATIVE_TTL", 30)
+        )
+        self._entries = OrderedDict()  # slug → (stamp, value, expires_at or None)
+        self._lock = threading.Lock()
+
+    def get(self, slug, stamp):
+        """(page_id, version), None for a remembered miss, or MISSING."""
+        with self._lock:
+            entry = self._entries.get(slug)
+            if entry is None:
+                return MISSING
+            entry_stamp, value, expires_at = entry
+            if entry_stamp != stamp or (expires_at is not None and expires_at < time.monotonic()):
+                del self._entries[slug]
+                return MISSING
+            self._entries.move_to_end(slug)
+            return value
+
+    def set(self, slug, stamp, value):
+        expires_at = time.monotonic() + self.negative_ttl if value is None else None
+        with self._lock:
+            self._entries[slug] = (stamp, value, expires_at)
+            self._entries.move_to_end(slug)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def discard(self, slug):
+        with self._lock:
+            self._entries.pop(slug, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+slug_cache = SlugCache()
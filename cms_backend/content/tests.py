@@ -1,3 +1,749 @@
-from django.test import TestCase
+import asyncio
+import json
+import queue
+import threading
+import time
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, HTTPServer, ThreadingHTTPServer
+from io import StringIO
 
-# Create your tests here.
+from django.core.management import call_command
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from content import purge, singleflight, sitemap
+from content.cache import PAGES, get_version
+from content.changes import changes_since
+from content.checks import check_shared_cache
+from content.jsonpatch import json_patch
+from content.models import BlogPost, ChangeLog, FAQ, MetaPixelCode, Page, PageSection, PublishedPage, Section, SectionType
+from content.publishing import publish_page, unpublish_page
+from content.schema import compile_schema
+from content.slugcache import SLUGS
+from content.views import SectionViewSet
+from core.models import User
+
+
+# ==========================
+# CHANGE FEED
+# ==========================
+
+@override_settings(CHANGE_FEED_SETTLE_SECONDS=0)
+class ChangeLogPruneTests(TestCase):
+    def setUp(self):
+        self.pages = [Page.objects.create(title=f"Page {i}", name=f"page-{i}") for i in range(3)]
+        ChangeLog.objects.update(changed_at=timezone.now() - timedelta(days=40))
+        self.fresh = Page.objects.create(title="Fresh", name="fresh")
+
+    def test_prune_keeps_recent_and_newest_entries(self):
+        call_command("prune_changelog", "--days", "30", stdout=StringIO())
+        remaining = set(ChangeLog.objects.values_list("object_id", flat=True))
+        self.assertEqual(remaining, {self.fresh.id})
+
+    def test_watermark_keeps_unread_entries(self):
+        watermark = ChangeLog.objects.order_by("id").values_list("id", flat=True)[1]
+        call_command("prune_changelog", "--days", "30", "--watermark", str(watermark), stdout=StringIO())
+        self.assertEqual(ChangeLog.objects.filter(id__lte=watermark).count(), 0)
+        self.assertEqual(ChangeLog.objects.filter(object_id=self.pages[2].id).count(), 1)
+
+    def test_pruned_cursor_asks_for_resync(self):
+        call_command("prune_changelog", "--days", "30", stdout=StringIO())
+        feed = changes_since(0)
+        self.assertTrue(feed["resync"])
+        self.assertEqual(feed["changes"], [])
+
+        # continuing from the fresh cursor works normally
+        FAQ.objects.create(question="q", answer="a")
+        Page.objects.filter(pk=self.fresh.pk).first().save()
+        feed = changes_since(feed["cursor"])
+        self.assertFalse(feed["resync"])
+        self.assertEqual([c["id"] for c in feed["changes"]], [self.fresh.id])
+
+
+class ChangeFeedAccessTests(TestCase):
+    def test_feed_is_for_editors_only(self):
+        Page.objects.create(title="Hidden", name="hidden", is_active=False)
+        self.assertIn(APIClient().get("/api/content/changes/").status_code, (401, 403))
+
+        editor = APIClient()
+        editor.force_authenticate(User.objects.create_user("editor", password="x", role="seo"))
+        response = editor.get("/api/content/changes/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["data"]["changes"]), 1)
+
+
+# ==========================
+# CACHE VERSION STAMPS
+# ==========================
+
+class VersionBumpTests(TestCase):
+    def test_stamps_move_only_after_commit(self):
+        pages, slugs = get_version(PAGES), get_version(SLUGS)
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            Page.objects.create(title="Pending", name="pending")
+        # still inside the write transaction: readers keep the old stamps
+        self.assertEqual((get_version(PAGES), get_version(SLUGS)), (pages, slugs))
+
+        for callback in callbacks:
+            callback()
+        self.assertGreater(get_version(PAGES), pages)
+        self.assertGreater(get_version(SLUGS), slugs)
+
+
+class SharedCacheCheckTests(SimpleTestCase):
+    @override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+    def test_process_local_cache_is_flagged(self):
+        self.assertEqual([w.id for w in check_shared_cache(None)], ["content.W001"])
+
+    @override_settings(CACHES={"default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache", "LOCATION": "redis://127.0.0.1:6379/1",
+    }})
+    def test_shared_cache_passes(self):
+        self.assertEqual(check_shared_cache(None), [])
+
+
+# ==========================
+# DOWNSTREAM PURGES
+# ==========================
+
+class _PurgeHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        self.server.received.put(json.loads(body))
+        self.send_response(204)
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+class PurgeWebhookTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = HTTPServer(("127.0.0.1", 0), _PurgeHandler)
+        cls.server.received = queue.Queue()
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        self.page = Page.objects.create(title="Pricing", name="pricing")
+        self.section = Section.objects.create(title="Plans")
+        self.other = Page.objects.create(title="Plans", name="plans")
+        PageSection.objects.create(page=self.page, section=self.section)
+
+        url = f"http://127.0.0.1:{self.server.server_port}/purge"
+        settings = override_settings(CONTENT_PURGE_URL=url, CONTENT_PURGE_WINDOW=0)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        # the dispatcher is built once from settings; rebuild it against the stub
+        purge._dispatcher = None
+        self.addCleanup(setattr, purge, "_dispatcher", None)
+        while not self.server.received.empty():
+            self.server.received.get_nowait()
+
+    def received(self):
+        return self.server.received.get(timeout=5)
+
+    def test_nothing_is_sent_before_commit(self):
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            self.page.save()
+        self.assertTrue(callbacks)
+        self.assertTrue(self.server.received.empty())
+
+    def test_page_save_purges_its_slug_and_navigation(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.page.title = "Pricing plans"
+            self.page.save()
+        self.assertEqual(self.received(), {"pages": ["pricing"], "navigation": True})
+
+    def test_renamed_page_purges_old_and_new_slug(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.page.slug = "prices"
+            self.page.save()
+        self.assertEqual(self.received(), {"pages": ["prices", "pricing"], "navigation": True})
+
+    def test_section_save_purges_pages_using_it(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.section.title = "Plans and prices"
+            self.section.save()
+        self.assertEqual(self.received(), {"pages": ["pricing"], "navigation": False})
+
+    def test_page_section_save_purges_its_page(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            PageSection.objects.create(page=self.other, section=self.section)
+        self.assertEqual(self.received(), {"pages": ["plans"], "navigation": False})
+
+
+# ==========================
+# LOAD TEST COMMAND
+# ==========================
+
+class _LoadTestHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path == "/broken/":
+            self.wfile.write(b"\r\n")  # no status code at all
+            return
+        self.send_response(200)
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+class LoadTestCommandTests(SimpleTestCase):
+    def setUp(self):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _LoadTestHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        self.base = f"http://127.0.0.1:{server.server_port}"
+
+    def test_malformed_status_counts_as_error_and_pair_is_compared(self):
+        out = StringIO()
+        call_command(
+            "loadtest", base=self.base, pairs=[["/broken/", "/ok/"]],
+            requests=4, concurrency=2, stdout=out,
+        )
+        output = out.getvalue()
+        self.assertIn("requests: 4  errors: 4", output)
+        self.assertIn("requests: 4  errors: 0", output)
+        self.assertIn("sync vs async: throughput", output)
+        self.assertIn("errors 4 → 0", output)
+
+
+# ==========================
+# PUBLISHING
+# ==========================
+
+class PublishingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.editor = User.objects.create_user("editor", password="x", role="superadmin")
+        self.page = Page.objects.create(title="Careers", name="careers")
+
+    def get(self):
+        return self.client.get(f"/api/content/pages/{self.page.slug}/")
+
+    def publish(self):
+        client = APIClient()
+        client.force_authenticate(self.editor)
+        return client.post(f"/api/content/pages/{self.page.id}/publish/")
+
+    def test_new_page_stays_a_draft_on_public_reads(self):
+        self.assertEqual(self.get().status_code, 404)
+        self.assertEqual(self.get().status_code, 404)
+        self.assertFalse(PublishedPage.objects.filter(page=self.page).exists())
+
+    def test_publish_action_puts_the_page_online(self):
+        self.assertEqual(self.publish().status_code, 200)
+        self.assertEqual(self.get().status_code, 200)
+
+    def test_public_read_does_not_write(self):
+        publish_page(self.page)
+        self.get()
+        with self.assertNumQueries(0):
+            self.get()  # slug and response both cached
+
+    def test_backfill_command_skips_unpublished_pages(self):
+        other = Page.objects.create(title="Legacy", name="legacy")
+        unpublish_page(self.page)
+        out = StringIO()
+        call_command("publish_existing_pages", stdout=out)
+        self.assertIn("1 page(s) published", out.getvalue())
+        self.assertTrue(PublishedPage.objects.filter(page=other).exists())
+        self.assertEqual(self.get().status_code, 404)
+
+    def test_publishing_again_clears_the_flag(self):
+        unpublish_page(self.page)
+        publish_page(self.page)
+        self.page.refresh_from_db()
+        self.assertFalse(self.page.unpublished)
+        self.assertEqual(self.get().status_code, 200)
+
+    def test_deactivated_page_goes_offline(self):
+        publish_page(self.page)
+        self.page.is_active = False
+        self.page.save()
+        self.assertEqual(self.get().status_code, 404)
+
+
+class BulkDeactivationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.editor = APIClient()
+        self.editor.force_authenticate(User.objects.create_user("editor", password="x", role="superadmin"))
+        self.pages = [Page.objects.create(title=f"Offer {i}", name=f"offer-{i}") for i in range(2)]
+        for page in self.pages:
+            publish_page(page)
+
+    def test_bulk_deactivation_takes_pages_offline(self):
+        self.assertEqual(self.client.get(f"/api/content/pages/{self.pages[0].slug}/").status_code, 200)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.editor.post("/api/content/pages/bulk/", {"operations": [
+                {"op": "update", "id": self.pages[0].id, "data": {"is_active": False}},
+                {"op": "update", "id": self.pages[1].id, "data": {"content": "edited"}},
+            ]}, format="json")
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(self.client.get(f"/api/content/pages/{self.pages[0].slug}/").status_code, 404)
+        self.assertEqual(
+            list(PublishedPage.objects.values_list("page_id", flat=True)), [self.pages[1].id]
+        )
+        self.assertEqual(
+            list(Page.objects.filter(unpublished=True).values_list("id", flat=True)), [self.pages[0].id]
+        )
+
+
+class PublicReadsTests(TestCase):
+    """Public list endpoints read published snapshots, never the draft tables."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.editor = APIClient()
+        self.editor.force_authenticate(User.objects.create_user("editor", password="x", role="superadmin"))
+        self.page = Page.objects.create(title="Services", name="services")
+        self.section = Section.objects.create(title="Intro", section_type="text", data={"text": "published"})
+        PageSection.objects.create(page=self.page, section=self.section)
+        publish_page(self.page)
+
+        # draft edits after publishing
+        self.section.data = {"text": "draft"}
+        self.section.save()
+        Page.objects.create(title="Draft only", name="draft-only")
+
+    def texts(self, response):
+        self.assertEqual(response.status_code, 200)
+        return [item["data"]["text"] for item in response.json()["data"]]
+
+    def test_navigation_lists_published_pages_only(self):
+        for url in ("/api/content/pages/?type=navigation", "/api/content/async/navigation/"):
+            slugs = [node["slug"] for node in self.client.get(url).json()["data"]]
+            self.assertEqual(slugs, ["services"], url)
+
+    def test_sections_come_from_the_snapshot(self):
+        for url in ("/api/content/sections/", "/api/content/async/sections/"):
+            self.assertEqual(self.texts(self.client.get(url, {"page_slug": "services"})), ["published"], url)
+        self.assertEqual(self.texts(self.editor.get("/api/content/sections/", {"page_slug": "services"})), ["draft"])
+
+    def test_unpublished_page_has_no_public_sections(self):
+        unpublish_page(self.page)
+        self.assertEqual(self.texts(self.client.get("/api/content/sections/", {"page_slug": "services"})), [])
+
+    def test_section_order_comes_from_the_snapshot(self):
+        PageSection.objects.create(page=self.page, section=Section.objects.create(title="Later"))
+        for url in ("/api/content/section/order/", "/api/content/async/section/order/"):
+            data = self.client.get(url, {"page_slug": "services"}).json()["data"]
+            self.assertEqual([row["title"] for row in data], ["Intro"], url)
+
+    def test_draft_listings_need_an_editor(self):
+        self.assertEqual(self.client.get("/api/content/sections/").status_code, 400)
+        self.assertIn(self.client.get("/api/content/pages/").status_code, (401, 403))
+        self.assertIn(self.client.get(f"/api/content/sections/{self.section.id}/").status_code, (401, 403))
+        self.assertEqual(self.editor.get("/api/content/pages/").status_code, 200)
+        self.assertEqual(self.editor.get(f"/api/content/sections/{self.section.id}/").status_code, 200)
+
+
+@override_settings(CONTENT_PUBLIC_ORIGINS=["http://testserver"], ALLOWED_HOSTS=["*"])
+class PublicOriginTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        publish_page(Page.objects.create(title="Contact", name="contact"))
+
+    def test_listed_origin_is_served(self):
+        self.assertEqual(self.client.get("/api/content/pages/contact/").status_code, 200)
+
+    def test_unlisted_host_gets_no_cache_entry(self):
+        response = self.client.get("/api/content/pages/contact/", HTTP_HOST="evil.example")
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get("/api/content/async/pages/contact/", HTTP_HOST="evil.example")
+        self.assertEqual(response.status_code, 400)
+
+
+# ==========================
+# SECTION SCHEMAS
+# ==========================
+
+def _errors(schema, data):
+    errors = []
+    compile_schema(schema)(data, "", errors)
+    return errors
+
+
+class CompileSchemaTests(TestCase):
+    def test_short_form_field_named_type(self):
+        schema = {"type": "string", "title": "string", "properties": "object?"}
+        self.assertEqual(_errors(schema, {"type": "card", "title": "Hi"}), [])
+        self.assertEqual(_errors(schema, {"title": "Hi"}), ["type: this field is required"])
+        self.assertEqual(_errors(schema, {"type": 3, "title": "Hi"}), ["type: expected string"])
+
+    def test_json_schema_object(self):
+        schema = {"type": "object", "properties": {"title": {"type": "string"}}, "required": ["title"]}
+        self.assertEqual(_errors(schema, {"title": "Hi"}), [])
+        self.assertEqual(_errors(schema, {}), ["title: this field is required"])
+
+    def test_json_schema_marked_with_dollar_schema(self):
+        schema = {"$schema": "https://json-schema.org/draft/2020-12/schema", "type": "array", "items": {"type": "integer"}}
+        self.assertEqual(_errors(schema, [1, 2]), [])
+        self.assertEqual(_errors(schema, [1, "x"]), ["[1]: expected integer"])
+
+
+# ==========================
+# META PIXEL HEAD TAGS
+# ==========================
+
+class MetaPixelHeadTagsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        page = Page.objects.create(title="Landing", name="landing")
+        MetaPixelCode.objects.create(page=page, google_pixel_code="<script>g()</script>")
+
+    def test_get_returns_joined_tags(self):
+        response = self.client.get("/api/content/meta-pixel-code/head/", {"page_slug": "landing"})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("<script>g()</script>", response.json()["data"]["head"])
+
+    def test_http_head_is_not_shadowed_by_the_action(self):
+        self.assertEqual(
+            self.client.head("/api/content/meta-pixel-code/head/", {"page_slug": "landing"}).status_code, 200
+        )
+        # HEAD on the list still answers like the list's GET
+        self.assertEqual(
+            self.client.head("/api/content/meta-pixel-code/").status_code,
+            self.client.get("/api/content/meta-pixel-code/").status_code,
+        )
+
+
+# ==========================
+# SITEMAP
+# ==========================
+
+class SitemapTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.company = Page.objects.create(title="Company", name="company")
+        self.team = Page.objects.create(title="Team", name="team", parent_id=self.company)
+        Page.objects.create(title="Berlin", name="berlin", parent_id=self.team)
+        for page in Page.objects.all():
+            publish_page(page)
+        Page.objects.create(title="Draft", name="draft")
+
+    def paths(self):
+        return sorted(path for path, _ in sitemap.page_paths())
+
+    def test_paths_nest_under_parent_slugs(self):
+        self.assertEqual(self.paths(), ["/company/", "/company/team/", "/company/team/berlin/"])
+
+    def test_paths_missing_from_older_rows_are_backfilled(self):
+        Page.objects.update(path="", depth=0)
+        self.assertEqual(self.paths(), ["/company/", "/company/team/", "/company/team/berlin/"])
+
+    def test_small_bodies_are_cached(self):
+        response = self.client.get("/sitemap.xml")
+        body = b"".join(response.streaming_content)
+        self.assertIn(b"/company/team/berlin/", body)
+        cached = self.client.get("/sitemap.xml")
+        self.assertFalse(cached.streaming)
+
+    @override_settings(SITEMAP_CACHE_MAX_BYTES=100)
+    def test_large_bodies_are_only_streamed(self):
+        b"".join(self.client.get("/sitemap.xml").streaming_content)
+        self.assertTrue(self.client.get("/sitemap.xml").streaming)
+
+
+# ==========================
+# PAGE TREE
+# ==========================
+
+class PageTreeTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.company = Page.objects.create(title="Company", name="company")
+        self.team = Page.objects.create(title="Team", name="team", parent_id=self.company)
+
+    def breadcrumbs(self, value):
+        response = self.client.get(f"/api/content/pages/{value}/breadcrumbs/")
+        self.assertEqual(response.status_code, 200)
+        return [node["slug"] for node in response.json()["data"]]
+
+    def test_rows_without_paths_are_backfilled(self):
+        Page.objects.update(path="", depth=0)
+        self.assertEqual(self.breadcrumbs("team"), ["company", "team"])
+        subtree = self.client.get("/api/content/pages/company/subtree/").json()["data"]
+        self.assertEqual([child["slug"] for child in subtree["children"]], ["team"])
+
+    def test_child_saved_under_parent_without_path(self):
+        Page.objects.update(path="", depth=0)
+        berlin = Page.objects.create(title="Berlin", name="berlin", parent_id=self.team)
+        self.assertEqual(berlin.path, f"{self.company.id}/{self.team.id}/{berlin.id}/")
+        self.assertEqual(self.breadcrumbs("berlin"), ["company", "team", "berlin"])
+
+    def test_slug_match_wins_over_id_match(self):
+        other = Page.objects.create(title="Other", name="other", slug=self.company.id)
+        self.assertEqual(self.breadcrumbs(self.company.id), [other.slug])
+        self.assertEqual(self.breadcrumbs(self.team.id), ["company", "team"])
+
+
+class PageTreeReshapeTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user("editor", password="x", role="superadmin"))
+        self.company = Page.objects.create(title="Company", name="company", order=1)
+        self.blog = Page.objects.create(title="Blog", name="blog", order=2)
+        self.team = Page.objects.create(title="Team", name="team", parent_id=self.company, order=1)
+
+    def reshape(self, *nodes):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post("/api/content/pages/tree/", {"nodes": list(nodes)}, format="json")
+
+    def test_reorder_and_move_in_one_batch(self):
+        response = self.reshape(
+            {"id": self.company.id, "parent_id": None, "order": 2},
+            {"id": self.blog.id, "parent_id": None, "order": 1},
+            {"id": self.team.id, "parent_id": self.blog.id, "order": 1},
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        roots = Page.objects.filter(parent_id=None).order_by("order")
+        self.assertEqual([page.id for page in roots], [self.blog.id, self.company.id])
+        self.team.refresh_from_db()
+        self.assertEqual(self.team.parent_id_id, self.blog.id)
+        self.assertEqual(self.team.path, f"{self.blog.id}/{self.team.id}/")
+
+    def test_moving_a_page_under_its_own_descendant_is_rejected(self):
+        response = self.reshape({"id": self.company.id, "parent_id": self.team.id, "order": 1})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("cycle", json.dumps(response.json()["errors"]))
+        self.company.refresh_from_db()
+        self.assertIsNone(self.company.parent_id_id)
+
+    def test_page_listed_twice_is_rejected(self):
+        response = self.reshape(
+            {"id": self.blog.id, "parent_id": None, "order": 1},
+            {"id": self.blog.id, "parent_id": self.company.id, "order": 1},
+        )
+        self.assertEqual(response.status_code, 400)
+
+
+# ==========================
+# BULK SECTION ASSIGNMENT
+# ==========================
+
+class SectionAssignmentBulkTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user("editor", password="x", role="superadmin"))
+        self.page = Page.objects.create(title="Pricing", name="pricing")
+        self.sections = [Section.objects.create(title=title) for title in ("Hero", "Plans", "FAQ", "Contact")]
+        for order, section in enumerate(self.sections[:3], start=1):
+            PageSection.objects.create(page=self.page, section=section, order=order)
+
+    def bulk(self, **body):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post("/api/content/sections/bulk-assign/", body, format="json")
+
+    def mapped(self):
+        rows = PageSection.objects.filter(page=self.page).order_by("order")
+        return [(row.section_id, row.order) for row in rows]
+
+    def test_insert_at_position_shifts_the_rest(self):
+        hero, plans, faq, contact = self.sections
+        response = self.bulk(assign=[{"page_id": self.page.id, "section_id": contact.id, "order": 1}])
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(self.mapped(), [(contact.id, 1), (hero.id, 2), (plans.id, 3), (faq.id, 4)])
+
+    def test_assigned_section_with_order_is_moved(self):
+        hero, plans, faq, _ = self.sections
+        response = self.bulk(assign=[{"page_id": self.page.id, "section_id": faq.id, "order": 1}])
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(self.mapped(), [(faq.id, 1), (hero.id, 2), (plans.id, 3)])
+
+    def test_unassign_closes_the_gap(self):
+        hero, plans, faq, _ = self.sections
+        response = self.bulk(unassign=[{"page_id": self.page.id, "section_id": hero.id}])
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(self.mapped(), [(plans.id, 1), (faq.id, 2)])
+
+    def test_duplicate_assignment_is_skipped(self):
+        hero = self.sections[0]
+        before = self.mapped()
+        response = self.bulk(assign=[{"page_id": self.page.id, "section_id": hero.id}])
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.json()["data"]["skipped"][0]["reason"], "already assigned")
+        self.assertEqual(self.mapped(), before)
+
+    def test_same_pair_twice_in_a_batch_is_rejected(self):
+        contact = self.sections[3]
+        pair = {"page_id": self.page.id, "section_id": contact.id}
+        response = self.bulk(assign=[pair, pair])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(len(self.mapped()), 3)
+
+
+# ==========================
+# BLOG INDEX
+# ==========================
+
+class BlogPaginationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        for number in range(5):
+            BlogPost.objects.create(title=f"Post {number}", summary="s", content="c", is_active=True)
+        # posts written in the same instant still page by (created_at, id)
+        BlogPost.objects.update(created_at=timezone.now())
+
+    def walk(self, url):
+        body = self.client.get(url).json()
+        return [post["slug"] for post in body["data"]], body["next"], body["previous"]
+
+    def test_ties_on_created_at_are_neither_skipped_nor_repeated(self):
+        seen, url = [], "/api/content/blog/?page_size=2"
+        while url:
+            slugs, url, _ = self.walk(url)
+            seen.extend(slugs)
+        expected = list(BlogPost.objects.order_by("-id").values_list("slug", flat=True))
+        self.assertEqual(seen, expected)
+
+    def test_previous_link_returns_the_page_before(self):
+        first, next_url, previous = self.walk("/api/content/blog/?page_size=2")
+        self.assertIsNone(previous)
+        _, _, previous = self.walk(next_url)
+        self.assertEqual(self.walk(previous)[0], first)
+
+    def test_malformed_cursor_is_not_found(self):
+        response = self.client.get("/api/content/blog/?cursor=cD15ZXN0ZXJkYXl8UE9TVDAwMDE=")
+        self.assertEqual(response.status_code, 404)
+
+
+# ==========================
+# SINGLE-FLIGHT REBUILDS
+# ==========================
+
+class SingleFlightTests(SimpleTestCase):
+    key, stale_key = "test:singleflight:v2", "test:singleflight:stale"
+
+    def setUp(self):
+        cache.clear()
+        self.calls = 0
+        self.calls_lock = threading.Lock()
+
+    def build(self):
+        with self.calls_lock:
+            self.calls += 1
+        time.sleep(0.2)  # long enough for every other thread to miss too
+        return "fresh"
+
+    def test_concurrent_misses_build_once(self):
+        barrier, results = threading.Barrier(8), []
+
+        def read():
+            barrier.wait()
+            results.append(singleflight.get_or_build(self.key, self.build, 60))
+
+        threads = [threading.Thread(target=read) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(results, ["fresh"] * 8)
+        self.assertEqual(cache.get(self.key), "fresh")
+
+    def test_stale_value_is_served_while_another_process_rebuilds(self):
+        cache.set(self.stale_key, "previous")
+        cache.add(f"{self.key}:lock", "other-process")
+        value = singleflight.get_or_build(self.key, self.build, 60, stale_key=self.stale_key)
+        self.assertEqual(value, "previous")
+        self.assertEqual(self.calls, 0)
+
+    def test_build_refreshes_the_stale_value(self):
+        cache.set(self.stale_key, "previous")
+        self.assertEqual(singleflight.get_or_build(self.key, self.build, 60, stale_key=self.stale_key), "fresh")
+        self.assertEqual(cache.get(self.stale_key), "fresh")
+
+    def test_concurrent_async_misses_share_one_build(self):
+        async def build():
+            self.calls += 1
+            await asyncio.sleep(0.1)
+            return "fresh"
+
+        async def read_all():
+            return await asyncio.gather(*(singleflight.aget_or_build(self.key, build, 60) for _ in range(8)))
+
+        self.assertEqual(asyncio.run(read_all()), ["fresh"] * 8)
+        self.assertEqual(self.calls, 1)
+
+
+# ==========================
+# SECTION PATCHES
+# ==========================
+
+class SectionPatchTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user("editor", password="x", role="superadmin"))
+        SectionType.objects.create(name="cards", schema={"title": "string", "items": [{"heading": "string"}]})
+        self.section = Section.objects.create(title="Cards", section_type="cards", data={
+            "title": "Cards", "items": [{"heading": "a"}, {"heading": "b"}, {"heading": "c"}],
+        })
+
+    def patch(self, operations):
+        return self.client.patch(
+            f"/api/content/sections/{self.section.id}/",
+            json.dumps(operations),
+            content_type="application/json-patch+json",
+        )
+
+    def stored(self):
+        return Section.objects.get(pk=self.section.pk).data
+
+    def test_removing_a_list_item_touches_the_list(self):
+        document = {"items": [1, 2, 3]}
+        _, touched = json_patch(document, [{"op": "remove", "path": "/items/1"}])
+        self.assertEqual(document, {"items": [1, 3]})
+        self.assertEqual(touched, [("items",)])
+
+    def test_remove_only_patch_is_saved(self):
+        response = self.patch([{"op": "remove", "path": "/data/items/0"}])
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual([item["heading"] for item in self.stored()["items"]], ["b", "c"])
+
+    def test_move_within_a_list(self):
+        response = self.patch([{"op": "move", "from": "/data/items/0", "path": "/data/items/2"}])
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual([item["heading"] for item in self.stored()["items"]], ["b", "c", "a"])
+
+    def test_removal_is_validated(self):
+        response = self.patch([{"op": "remove", "path": "/data/title"}])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.stored()["title"], "Cards")
+
+    def test_failing_test_op_changes_nothing(self):
+        response = self.patch([
+            {"op": "remove", "path": "/data/items/0"},
+            {"op": "test", "path": "/data/title", "value": "Other"},
+        ])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(len(self.stored()["items"]), 3)
+
+    def test_patch_leaves_the_instance_alone_until_saved(self):
+        view = SectionViewSet()
+        view.request = type("Request", (), {
+            "data": [{"op": "remove", "path": "/data/items/0"}],
+            "content_type": "application/json-patch+json",
+        })()
+        payload = view.apply_patch_body(self.section)
+        self.assertEqual(len(payload["data"]["items"]), 2)
+        self.assertEqual(len(self.section.data["items"]), 3)
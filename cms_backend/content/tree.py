@@ -0,0 +1,22 @@
+# content/tree.py
+"""In-memory helpers for the Page tree (parent_id adjacency)."""
+
+
+def find_cycle(parents):
+    """
+    Return the ids of a cycle in ``{page_id: parent_id}``, or None.
+    Every node is walked at most once, so checking a whole tree is O(n).
+    """
+    state = {}  # page_id → "visiting" | "done"
+    for start in parents:
+        path = []
+        node = start
+        while node is not None and state.get(node) is None:
+            state[node] = "visiting"
+            path.append(node)
+            node = parents.get(node)
+        if node is not None and state.get(node) == "visiting":
+            return path[path.index(node):]
+        for visited in path:
+            state[visited] = "done"
+    return None
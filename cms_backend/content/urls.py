@@ -2,8 +2,12 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from .views import (
-    PageViewSet, SectionViewSet,SectionOrderListAPIView,MetaPixelCodeViewSet
+    PageViewSet, SectionViewSet,SectionOrderListAPIView,MetaPixelCodeViewSet,
+    ChangeFeedAPIView, SiteBundleAPIView,
+    BannerViewSet, ContactInfoViewSet, FAQViewSet, FeatureViewSet, HowItWorksViewSet,
+    ImpressionViewSet, SliderBannerViewSet, BlogPostViewSet,
 )
+from . import async_views
 
 # ==========================
 # Router Registration
@@ -14,8 +18,26 @@ router.register(r'pages', PageViewSet, basename='page')
 router.register(r'sections',SectionViewSet, basename='section')
 router.register(r"meta-pixel-code", MetaPixelCodeViewSet, basename="meta-pixel-code")
 
+# Site-wide auxiliary content (read-only)
+router.register(r"banners", BannerViewSet, basename="banner")
+router.register(r"sliders", SliderBannerViewSet, basename="slider")
+router.register(r"features", FeatureViewSet, basename="feature")
+router.register(r"how-it-works", HowItWorksViewSet, basename="how-it-works")
+router.register(r"impressions", ImpressionViewSet, basename="impression")
+router.register(r"faqs", FAQViewSet, basename="faq")
+router.register(r"contact-info", ContactInfoViewSet, basename="contact-info")
+router.register(r"blog", BlogPostViewSet, basename="blog")
+
 urlpatterns = [
     path('', include(router.urls)),
     path('section/order/', SectionOrderListAPIView.as_view(), name='section-order-list'),
+    path('changes/', ChangeFeedAPIView.as_view(), name='change-feed'),
+    path('site-bundle/', SiteBundleAPIView.as_view(), name='site-bundle'),
+
+    # Async (ASGI) public reads
+    path('async/navigation/', async_views.navigation, name='async-navigation'),
+    path('async/pages/<str:slug>/', async_views.page_detail, name='async-page-detail'),
+    path('async/sections/', async_views.page_sections, name='async-page-sections'),
+    path('async/section/order/', async_views.section_order, name='async-section-order'),
     
 ]
@@ -1,20 +1,32 @@
+import copy
+
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework.exceptions import NotFound
 from django.shortcuts import get_object_or_404
+from django.db import transaction
 from django.db.models import Q
 from django.contrib.contenttypes.models import ContentType
 from django.db.models import F,Max
 from .models import (
-    Page, Section,PageSection,MetaPixelCode
+    Page, Section,PageSection,MetaPixelCode,ChangeLog
 )
 from .serializers import (
-    PageSerializer, NavigationSerializer,SectionSerializer,MetaPixelCodeSerializer
+    PageSerializer, SectionSerializer,MetaPixelCodeSerializer,
+    PageBulkSerializer, PageCloneSerializer, PageTreeSerializer, SectionAssignmentBulkSerializer,
 )
+from django.core.cache import cache
+from . import payloads
+from .blobs import load_external_data
+from .cache import PAGES, cache_timeout, versioned_key
+from .jsonpatch import JSONPatchParser, MergePatchParser, PATCH_MEDIA_TYPES, PatchError, apply_patch
+from .purge import purge_instance, purge_pages
+from .publishing import get_published_payload, present, publish_page, resolve_slug, unpublish_page
+from .responses import cached_variants, json_response, origin, render_success
 from core.utils.response_helpers import success_response, error_response
-from core.permissions import IsSuperAdmin, IsSEOFullOnMetaPixel,IsSEOReadOnlyOnPage
+from core.permissions import IsEditor, IsSuperAdmin, IsSEOFullOnMetaPixel,IsSEOReadOnlyOnPage, is_editor
 from rest_framework.permissions import AllowAny, IsAuthenticated,SAFE_METHODS
 # ==========================
 # BASEVIEWSET VIEWSET
@@ -31,11 +43,13 @@ class BaseViewSet(viewsets.ModelViewSet):
             created_by=self.request.user,
             updated_by=self.request.user,
         )
+        purge_instance(serializer.instance)
 
     def perform_update(self, serializer):
         serializer.save(
             updated_by=self.request.user,
         )
+        purge_instance(serializer.instance)
 
     # CREATE (POST)
     def create(self, request, *args, **kwargs):
@@ -158,7 +172,7 @@ class PageViewSet(BaseViewSet):
             return queryset.filter(is_active=True).order_by("created_at")
     
         if self.action == "list":
-            return queryset.filter(parent_id__isnull=True).order_by("created_at")
+            return queryset.filter(parent_id__isnull=True).order_by("order", "created_at")
     
         return queryset.order_by("created_at")
 
@@ -179,14 +193,112 @@ class PageViewSet(BaseViewSet):
         filter_kwargs = {lookup_field: self.kwargs[lookup_url_kwarg]}
         return get_object_or_404(queryset, **filter_kwargs)
 
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Public page GET → the published snapshot only.
+        Editors can preview the live draft with ?draft=true.
+        """
+        if request.query_params.get("draft") in ("1", "true") and is_editor(request.user):
+            return super().retrieve(request, *args, **kwargs)
+
+        slug = self.kwargs[self.lookup_url_kwarg]
+        resolved = resolve_slug(slug)
+        if resolved is None:
+            raise NotFound("No Page matches the given query.")
+
+        def render():
+            payload = get_published_payload(slug)
+            if payload is None:
+                raise NotFound("No Page matches the given query.")
+            return render_success(present(payload, request.build_absolute_uri), "Page fetched")
+
+        # ✅ Rendered and compressed once per published version and host;
+        # while a new version renders, other readers get the previous one
+        key = f"content:response:page:{resolved[0]}:{resolved[1]}:{origin(request)}"
+        stale_key = f"content:response:page:{resolved[0]}:stale:{origin(request)}"
+        return json_response(request, cached_variants(key, render, stale_key))
+
+    @action(detail=True, methods=["post"], url_path="publish")
+    def publish(self, request, *args, **kwargs):
+        page = self.get_object()
+        if not page.is_active:
+            return error_response(message="Inactive pages can't be published.")
+        published = publish_page(page, user=request.user)
+        return success_response(
+            data={"slug": published.slug, "version": published.version, "published_at": published.published_at},
+            message=f"Page {page.id} published",
+        )
+
+    @action(detail=True, methods=["post"], url_path="unpublish")
+    def unpublish(self, request, *args, **kwargs):
+        page = self.get_object()
+        unpublish_page(page)
+        return success_response(message=f"Page {page.id} unpublished")
+
+    # ==========================
+    # TREE (materialized path)
+    # ==========================
+
+    TREE_FIELDS = ("id", "name", "title", "slug", "order", "depth", "path", "is_active")
+
+    def get_permissions(self):
+        if self.action in ("breadcrumbs", "subtree"):
+            return [AllowAny()]
+        if self.action == "list" and self.request.query_params.get("type") != "navigation":
+            return [IsEditor()]  # every page with its draft; the public gets navigation
+        return super().get_permissions()
+
+    def _tree_page(self):
+        """Active page by slug or id (tree endpoints accept either; a slug match wins)."""
+        value = self.kwargs[self.lookup_url_kwarg]
+        rows = Page.objects.filter(Q(slug=value) | Q(id=value), is_active=True).values(*self.TREE_FIELDS)
+        matches = list(rows[:2])
+        page = next((row for row in matches if row["slug"] == value), matches[0] if matches else None)
+        if page is None:
+            raise NotFound("No Page matches the given query.")
+        if not page["path"]:
+            Page.backfill_paths()  # rows saved before paths existed
+            page = rows.get(id=page["id"])
+        return page
+
+    @staticmethod
+    def _tree_node(row):
+        return {field: row[field] for field in ("id", "name", "title", "slug", "order", "depth")}
+
+    @action(detail=True, methods=["get"], url_path="breadcrumbs")
+    def breadcrumbs(self, request, *args, **kwargs):
+        """GET /pages/{slug or id}/breadcrumbs/ → root ... page, from one primary-key lookup."""
+        page = self._tree_page()
+        ids = page["path"].split("/")[:-1]
+        rows = {row["id"]: row for row in Page.objects.filter(id__in=ids).values(*self.TREE_FIELDS)}
+        if any(not rows.get(pk, {}).get("is_active") for pk in ids):
+            raise NotFound("No Page matches the given query.")  # hidden under an inactive ancestor
+        return success_response(
+            data=[self._tree_node(rows[pk]) for pk in ids],
+            message="Breadcrumbs fetched",
+        )
+
+    @action(detail=True, methods=["get"], url_path="subtree")
+    def subtree(self, request, *args, **kwargs):
+        """GET /pages/{slug or id}/subtree/ → the page and all active descendants, nested."""
+        page = self._tree_page()
+        rows = Page.objects.filter(path__startswith=page["path"]).order_by("depth", "order", "title")
+
+        nodes, hidden = {}, set()
+        for row in rows.values(*self.TREE_FIELDS, "parent_id"):
+            if not row["is_active"] or row["parent_id"] in hidden:
+                hidden.add(row["id"])  # depth order: parents are seen before children
+                continue
+            node = nodes[row["id"]] = {**self._tree_node(row), "children": []}
+            if row["id"] != page["id"] and row["parent_id"] in nodes:
+                nodes[row["parent_id"]]["children"].append(node)
+        return success_response(data=nodes[page["id"]], message="Subtree fetched")
+
     def list(self, request, *args, **kwargs):
         if request.query_params.get("type") == "navigation":
-            # ✅ Navigation → root-level active only
-            root_pages = Page.objects.filter(
-                parent_id__isnull=True, is_active=True
-            ).order_by("created_at")
-            serializer = NavigationSerializer(root_pages, many=True)
-            return success_response(data=serializer.data, message="Navigation fetched")
+            # ✅ Navigation → published pages only, from their snapshots
+            rows = list(payloads.published_navigation_rows())
+            return success_response(data=payloads.build_navigation(rows), message="Navigation fetched")
 
         # ✅ Default list → all root pages (active + inactive) with children
         queryset = self.get_queryset()
@@ -194,6 +306,52 @@ class PageViewSet(BaseViewSet):
         return success_response(data=serializer.data, message="Pages fetched")
     
 
+    @action(detail=False, methods=["post"], url_path="bulk")
+    def bulk(self, request):
+        """
+        Create/update/delete many pages in one transaction.
+        Body: {"operations": [
+            {"op": "create", "ref": "new-parent", "data": {...}},
+            {"op": "create", "parent_ref": "new-parent", "data": {...}},
+            {"op": "update", "id": "PAGE1234", "data": {...}},
+            {"op": "delete", "id": "PAGE5678"},
+        ]}
+        """
+        serializer = PageBulkSerializer(data=request.data)
+        if not serializer.is_valid():
+            return error_response(message="Validation failed", data=serializer.errors)
+        result = serializer.save(user=request.user)
+        return success_response(
+            data=result,
+            message="Bulk page operations applied",
+            http_status=status.HTTP_200_OK,
+        )
+
+    @action(detail=True, methods=["post"], url_path="clone")
+    def clone(self, request, *args, **kwargs):
+        """
+        Copy a page, its section mappings and meta pixel codes.
+        Body: {"title": "...", "mode": "shallow" | "deep", "parent_id"?: ..., "is_active"?: false}
+        """
+        source = self.get_object()
+        serializer = PageCloneSerializer(data=request.data)
+        if not serializer.is_valid():
+            return error_response(message="Validation failed", data=serializer.errors)
+        result = serializer.save(source, user=request.user)
+        return success_response(data=result, message=f"Page {source.id} cloned", http_status=status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=["post"], url_path="tree")
+    def tree(self, request):
+        """
+        Re-shape the page tree in one transaction.
+        Body: {"nodes": [{"id": "PAGE1234", "parent_id": null, "order": 1}, ...]}
+        """
+        serializer = PageTreeSerializer(data=request.data)
+        if not serializer.is_valid():
+            return error_response(message="Validation failed", data=serializer.errors)
+        result = serializer.save(user=request.user)
+        return success_response(data=result, message="Page tree updated", http_status=status.HTTP_200_OK)
+
     def destroy(self, request, *args, **kwargs):
         instance = self.get_object()
 
@@ -241,11 +399,28 @@ class SectionPagination(PageNumberPagination):
             "data": data,
         })
 
-from django.db.models import Prefetch
+from django.db.models import Count, OuterRef, Prefetch, Subquery
+from django.db.models.functions import Coalesce
+
+
+def usage_count_subquery():
+    """Number of PageSection rows per section, as an annotation."""
+    counts = (
+        PageSection.objects.filter(section=OuterRef("pk"))
+        .order_by()
+        .values("section")
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    return Coalesce(Subquery(counts), 0)
+
+
 class SectionViewSet(BaseViewSet):
     serializer_class = SectionSerializer
     lookup_field = "id"
-    parser_classes = [parsers.JSONParser]
+    # ✅ PATCH also takes RFC 7396 merge patches and RFC 6902 JSON Patches
+    parser_classes = [parsers.JSONParser, MergePatchParser, JSONPatchParser]
+    PATCHABLE_FIELDS = ("title", "slug", "section_type", "data")
     # pagination_class = SectionPagination
 
     # ✅ Only select required fields and prefetch pages
@@ -254,7 +429,9 @@ class SectionViewSet(BaseViewSet):
     ).prefetch_related(
         Prefetch(
             "pagesection_set",
-            queryset=PageSection.objects.select_related("page").only("page_id", "is_active", "order")
+            queryset=PageSection.objects.select_related("page").only(
+                "page_id", "section_id", "is_active", "order", "page__slug", "page__title", "page__order"
+            )
         )
     )
 
@@ -264,6 +441,51 @@ class SectionViewSet(BaseViewSet):
             return SectionListSerializer
         return SectionSerializer
 
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["data_paths"] = getattr(self, "data_paths", None)
+        return context
+
+    def patch_media_type(self):
+        media_type = (self.request.content_type or "").split(";")[0].strip().lower()
+        return media_type if media_type in PATCH_MEDIA_TYPES else None
+
+    def apply_patch_body(self, section, extra=None):
+        """
+        Apply the merge patch / JSON Patch body to a copy of the section's fields.
+        Returns the payload for the serializer and sets self.data_paths to what
+        changed inside `data`, so only those subtrees are validated. The section
+        itself is left alone; a patch that fails or doesn't validate changes nothing.
+        """
+        document = {field: copy.deepcopy(getattr(section, field)) for field in self.PATCHABLE_FIELDS}
+        document.update(extra or {})
+        _, touched = apply_patch(document, self.request.data, self.patch_media_type())
+        changed = {keys[0] for keys in touched}
+        self.data_paths = [keys[1:] for keys in touched if keys[0] == "data"]
+        return {field: document[field] for field in changed if field in document}
+
+    def partial_update(self, request, *args, **kwargs):
+        if not self.patch_media_type():
+            return super().partial_update(request, *args, **kwargs)
+
+        instance = self.get_object()
+        try:
+            payload = self.apply_patch_body(instance)
+        except PatchError as exc:
+            return error_response(message=str(exc), http_status=status.HTTP_400_BAD_REQUEST)
+        serializer = self.get_serializer(instance, data=payload, partial=True)
+        if serializer.is_valid():
+            self.perform_update(serializer)
+            return success_response(
+                data=serializer.data,
+                message=f"{self.basename.title()} updated successfully",
+            )
+        return error_response(
+            message="Validation failed",
+            data=serializer.errors,
+            http_status=status.HTTP_400_BAD_REQUEST,
+        )
+
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
@@ -285,21 +507,58 @@ class SectionViewSet(BaseViewSet):
         ]
     }, status=status.HTTP_201_CREATED)
 
+    def get_permissions(self):
+        if self.action == "retrieve":
+            return [IsEditor()]  # a section on its own is draft content
+        return super().get_permissions()
+
+    def published_list(self, request):
+        """Sections of one published page, from its snapshot (public callers)."""
+        page_id = request.query_params.get("page_id")
+        page_slug = request.query_params.get("page_slug")
+        if page_id and page_slug:
+            raise ValidationError("Provide either 'page_id' or 'page_slug', not both.")
+        if not (page_id or page_slug):
+            return error_response(message="Either 'page_id' or 'page_slug' is required.")
+
+        found = payloads.published_sections(page_id, page_slug).first()
+        rows = payloads.snapshot_mapping_rows(*found) if found else []
+        filters = {
+            "section_id": request.query_params.get("section_id"),
+            "section__slug": request.query_params.get("section_slug"),
+            "section__section_type": request.query_params.get("section_type"),
+        }
+        rows = [row for row in rows if all(row[key] == value for key, value in filters.items() if value)]
+        data = [payloads.build_section(row, request.build_absolute_uri) for row in rows]
+        return Response({
+            "success": True,
+            "message": "Section list fetched",
+            "count": len(data),
+            "next": None,
+            "previous": None,
+            "data": data,
+        })
+
     def list(self, request, *args, **kwargs):
+        if not is_editor(request.user):
+            return self.published_list(request)
+
         queryset = self.filter_queryset(self.get_queryset())
 
         # ✅ If pagination is requested
         page = self.paginate_queryset(queryset)
         if page is not None:
+            load_external_data(page)
             serializer = self.get_serializer(page, many=True, context={"request": request})
             return self.get_paginated_response(serializer.data)
 
-        # ✅ Return all sections without pagination
-        serializer = self.get_serializer(queryset, many=True, context={"request": request})
+        # ✅ Return all sections without pagination (externalized data in one query)
+        sections = load_external_data(list(queryset))
+        serializer = self.get_serializer(sections, many=True, context={"request": request})
         return Response({
             "success": True,
             "message": "Section list fetched",
-            "count": queryset.count(),
+            "count": len(sections),
             "next": None,
             "previous": None,
             "data": serializer.data
@@ -337,9 +596,45 @@ class SectionViewSet(BaseViewSet):
         # Filter by section_type
         if section_type:
             queryset = queryset.filter(section_type=section_type)
-    
+
+        # ✅ Usage count from one correlated subquery, sortable for the shared-section picker
+        if self.action == "list":
+            queryset = queryset.annotate(usage_count=usage_count_subquery())
+            ordering = self.request.query_params.get("ordering")
+            if ordering in ("usage_count", "-usage_count"):
+                queryset = queryset.order_by(ordering, "title")
+
         return queryset
 
+    @action(detail=True, methods=["get"], url_path="usage")
+    def usage(self, request, id=None):
+        """GET /sections/{id}/usage/ → every page the section is mapped to."""
+        if not Section.objects.filter(id=id).exists():
+            raise NotFound(f"Section with id '{id}' not found")
+        pages = list(
+            PageSection.objects.filter(section_id=id)
+            .order_by("page__order", "page__title")
+            .values("page_id", "page__slug", "page__title", "page__is_active", "is_active", "order")
+        )
+        return success_response(
+            data={
+                "section_id": id,
+                "usage_count": len(pages),
+                "pages": [
+                    {
+                        "id": row["page_id"],
+                        "slug": row["page__slug"],
+                        "title": row["page__title"],
+                        "page_is_active": row["page__is_active"],
+                        "is_active": row["is_active"],
+                        "order": row["order"],
+                    }
+                    for row in pages
+                ],
+            },
+            message="Section usage fetched",
+        )
+
     def patch(self, request, *args, **kwargs):
         section_id = request.query_params.get("section_id")
         page_id = request.query_params.get("page_id")
@@ -359,7 +654,16 @@ class SectionViewSet(BaseViewSet):
                 status=status.HTTP_404_NOT_FOUND
             )
     
-        section_data = request.data.copy()
+        if self.patch_media_type():
+            try:
+                section_data = self.apply_patch_body(section, extra={"is_active": None, "order": None})
+            except PatchError as exc:
+                return Response(
+                    {"success": False, "message": str(exc)},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+        else:
+            section_data = request.data.copy()
         is_active = section_data.pop("is_active", None)
         order = section_data.pop("order", None)
     
@@ -379,6 +683,7 @@ class SectionViewSet(BaseViewSet):
                 updated = True
             if updated:
                 page_section.save()
+            purge_pages(page_id)
         except PageSection.DoesNotExist:
             return Response(
                 {"success": False, "message": f"Section {section_id} not assigned to Page {page_id}"},
@@ -421,6 +726,7 @@ class SectionViewSet(BaseViewSet):
         # ❌ Don't delete the whole section
         # ✅ Just remove the relation to that page
         section.pages.remove(page)
+        purge_pages(page.id)
     
         return Response(
             {"detail": f"Section {section_id} unassigned from page {page_id}"},
@@ -439,6 +745,7 @@ class SectionViewSet(BaseViewSet):
                 status=status.HTTP_404_NOT_FOUND,
             )
 
+        purge_instance(section)  # before the mappings are gone
         section.delete()
         return Response(
             {"success": True, "message": f"Section {section_id} deleted permanently"},
@@ -498,6 +805,7 @@ class SectionViewSet(BaseViewSet):
             order=next_order,
             is_active=True
         )
+        purge_pages(page.id)
     
         return Response(
             {"success": True,
@@ -505,6 +813,20 @@ class SectionViewSet(BaseViewSet):
             status=status.HTTP_201_CREATED
         )
     
+    @action(detail=False, methods=["post"], url_path="bulk-assign")
+    def bulk_assign(self, request):
+        """
+        Assign/unassign many sections across many pages in one transaction.
+        Body: {"assign": [{"page_id", "section_id", "order"?, "is_active"?}, ...],
+               "unassign": [{"page_id", "section_id"}, ...]}
+        """
+        serializer = SectionAssignmentBulkSerializer(data=request.data)
+        if not serializer.is_valid():
+            return error_response(message="Validation failed", data=serializer.errors)
+        with transaction.atomic():
+            result = serializer.save()
+        return success_response(data=result, message="Section assignments applied")
+
     @action(detail=False, methods=['post'], url_path='unassigned')
     def unassign_section(self, request):
         """
@@ -554,6 +876,8 @@ class SectionViewSet(BaseViewSet):
     
         # Normalize remaining orders on that page
         PageSection.objects.filter(page=page, order__gt=removed_order).update(order=F('order') - 1)
+        ChangeLog.log_page_mappings(page.id)
+        purge_pages(page.id)
     
         return Response(
             {"detail": f"Section {section_id} successfully unassigned from page {page_id} and orders normalized."},
@@ -572,6 +896,19 @@ class SectionOrderListAPIView(APIView):
         page_id = request.query_params.get("page_id")
         page_slug = request.query_params.get("page_slug")
 
+        if not is_editor(request.user):
+            # ✅ Public callers get the published order of one page, from its snapshot
+            if not (page_id or page_slug):
+                return error_response(message="Either 'page_id' or 'page_slug' is required.")
+            found = payloads.published_sections(page_id, page_slug).first()
+            rows = payloads.snapshot_mapping_rows(*found) if found else []
+            return Response({
+                "success": True,
+                "message": "Section order list fetched",
+                "count": len(rows),
+                "data": [payloads.build_section_order(row) for row in rows],
+            })
+
         # Fetch directly from PageSection so duplicates are preserved
         qs = PageSection.objects.select_related("page", "section")
 
@@ -596,6 +933,264 @@ class SectionOrderListAPIView(APIView):
         
 
 class MetaPixelCodeViewSet(BaseViewSet):
-    queryset = MetaPixelCode.objects.all()
+    queryset = MetaPixelCode.objects.select_related("page")
     serializer_class = MetaPixelCodeSerializer
-    basename = "meta-pixel-code"
\ No newline at end of file
+    basename = "meta-pixel-code"
+
+    def get_permissions(self):
+        if self.action == "head_tags":
+            return [AllowAny()]
+        return super().get_permissions()
+
+    @action(detail=False, methods=["get"], url_path="head", url_name="head")
+    def head_tags(self, request):
+        """
+        GET /meta-pixel-code/head/?page_slug=<slug>
+        The page's pixel codes as one pre-joined <head> snippet, cached by slug.
+        """
+        page_slug = request.query_params.get("page_slug")
+        if not page_slug:
+            return error_response(message="'page_slug' is required")
+
+        key = versioned_key(PAGES, "head", page_slug)
+        data = cache.get(key)
+        if data is None:
+            data = payloads.build_head(page_slug, payloads.head_rows(page_slug))
+            cache.set(key, data, cache_timeout())
+        return success_response(data=data, message="Head tags fetched")
+
+# ==========================
+# CHANGE FEED (delta sync)
+# ==========================
+from .changes import changes_since
+
+class ChangeFeedAPIView(APIView):
+    """
+    GET /changes/?since=<cursor>&limit=<n>
+    Pages, sections, page-section mappings and meta pixel codes changed after
+    the cursor; deletions come back as tombstones (action "deleted", data null).
+    A cursor older than the pruned log comes back with "resync": true and a
+    fresh cursor (see content/changes.py).
+    Editors only: the log covers drafts, inactive pages and unpublished sections.
+    """
+    permission_classes = [IsEditor]
+
+    def get(self, request):
+        try:
+            since = int(request.query_params.get("since", 0))
+            limit = min(int(request.query_params.get("limit", 500)), 1000)
+        except ValueError:
+            return error_response(message="'since' and 'limit' must be integers")
+        if since < 0 or limit < 1:
+            return error_response(message="'since' must be >= 0 and 'limit' >= 1")
+
+        return success_response(data=changes_since(since, limit), message="Changes fetched")
+
+
+# ==========================
+# SITE CONTENT (read-only, public)
+# ==========================
+from .cache import SITE
+from .site import SITE_CONTENT, build_bundle, build_items
+
+
+def site_response(request, kind, message, build):
+    """Cached variants of one SITE payload; the previous version is served while it rebuilds."""
+    key = versioned_key(SITE, kind, origin(request))
+    stale_key = versioned_key(SITE, kind, origin(request), version="stale")
+    return json_response(request, cached_variants(key, lambda: render_success(build(), message), stale_key))
+
+
+class SiteContentViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    GET /<kind>/       → active items (cached until any site content changes)
+    GET /<kind>/{id}/  → one active item
+    """
+    permission_classes = [AllowAny]
+    kind = None  # SITE_CONTENT key
+
+    def get_queryset(self):
+        return SITE_CONTENT[self.kind][0]()
+
+    def get_serializer_class(self):
+        return SITE_CONTENT[self.kind][1]
+
+    def list(self, request, *args, **kwargs):
+        return site_response(
+            request, self.kind, f"{self.basename.title()} list fetched",
+            lambda: build_items(self.kind, request),
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return success_response(
+            data=self.get_serializer(self.get_object()).data,
+            message=f"{self.basename.title()} fetched",
+        )
+
+
+class BannerViewSet(SiteContentViewSet):
+    kind = "banners"
+
+
+class SliderBannerViewSet(SiteContentViewSet):
+    kind = "sliders"
+
+
+class FeatureViewSet(SiteContentViewSet):
+    kind = "features"
+
+
+class HowItWorksViewSet(SiteContentViewSet):
+    kind = "how_it_works"
+
+
+class ImpressionViewSet(SiteContentViewSet):
+    kind = "impressions"
+
+
+class FAQViewSet(SiteContentViewSet):
+    kind = "faqs"
+
+
+class ContactInfoViewSet(SiteContentViewSet):
+    kind = "contact_info"
+
+
+class SiteBundleAPIView(APIView):
+    """
+    GET /site-bundle/
+    All active banners, sliders (with slides), features, how-it-works blocks,
+    impressions, FAQs and contact info in one cached payload.
+    """
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        return site_response(request, "bundle", "Site bundle fetched", lambda: build_bundle(request))
+
+
+# ==========================
+# BLOG (read-only, public)
+# ==========================
+from datetime import datetime
+from rest_framework.pagination import Cursor, CursorPagination
+from .blog import post_key, stale_post_key
+from .cache import BLOG
+from .models import BlogPost
+from .serializers import BlogPostSerializer, BlogPostSummarySerializer
+
+
+class BlogCursorPagination(CursorPagination):
+    """
+    Keyset pages on (created_at, id): no COUNT and no OFFSET scan deep in the archive.
+
+    DRF's CursorPagination keys the cursor on the first ordering field only and
+    falls back to an offset past rows sharing that value. Here the cursor carries
+    both fields and each page filters on the pair, so posts created in the same
+    instant never cost an offset and are never skipped or repeated.
+    """
+    page_size = 10
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    ordering = ("-created_at", "-id")
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.cursor = self.decode_cursor(request)
+        reverse = bool(self.cursor and self.cursor.reverse)
+
+        if self.cursor and self.cursor.position is not None:
+            created_at, pk = self._decode_position(self.cursor.position)
+            # ✅ Strictly past the (created_at, id) pair in the walking direction
+            if reverse:
+                after = Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=pk)
+            else:
+                after = Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk)
+            queryset = queryset.filter(after)
+
+        ordering = ("created_at", "id") if reverse else self.ordering
+        results = list(queryset.order_by(*ordering)[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        if reverse:
+            self.page.reverse()
+
+        moved = self.cursor is not None
+        self.has_next = has_more if not reverse else moved
+        self.has_previous = moved if not reverse else has_more
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(Cursor(offset=0, reverse=False, position=self._position(self.page[-1])))
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(Cursor(offset=0, reverse=True, position=self._position(self.page[0])))
+
+    @staticmethod
+    def _position(post):
+        return f"{post.created_at.isoformat()}|{post.id}"
+
+    def _decode_position(self, position):
+        created_at, _, pk = position.partition("|")
+        try:
+            parsed = datetime.fromisoformat(created_at)
+        except ValueError:
+            raise NotFound(self.invalid_cursor_message)
+        if not pk:
+            raise NotFound(self.invalid_cursor_message)
+        return parsed, pk
+
+
+class BlogPostViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    GET /blog/?cursor=&page_size=  → newest active posts, summary and meta fields only
+    GET /blog/{slug}/              → full post
+    Both are cached as precompressed responses.
+    """
+    permission_classes = [AllowAny]
+    lookup_field = "slug"
+    pagination_class = BlogCursorPagination
+
+    def get_queryset(self):
+        queryset = BlogPost.objects.filter(is_active=True)
+        if self.action == "list":
+            queryset = queryset.defer("content")
+        return queryset
+
+    def get_serializer_class(self):
+        if self.action == "list":
+            return BlogPostSummarySerializer
+        return BlogPostSerializer
+
+    def list(self, request, *args, **kwargs):
+        def render():
+            page = self.paginate_queryset(self.get_queryset())
+            data = self.get_serializer(page, many=True).data
+            return render_success(
+                data, "Blog post list fetched",
+                next=self.paginator.get_next_link(), previous=self.paginator.get_previous_link(),
+            )
+
+        parts = ("list", origin(request), request.query_params.get("cursor", ""),
+                 request.query_params.get("page_size", ""))
+        key = versioned_key(BLOG, *parts)
+        stale_key = versioned_key(BLOG, *parts, version="stale")
+        return json_response(request, cached_variants(key, render, stale_key))
+
+    def retrieve(self, request, *args, **kwargs):
+        slug = self.kwargs[self.lookup_field]
+        origin(request)  # only listed hosts render into the cache
+
+        def render():
+            return render_success(self.get_serializer(self.get_object()).data, "Blog post fetched")
+
+        # ✅ Per slug, dropped when that post is saved or deleted (content/signals.py)
+        return json_response(request, cached_variants(post_key(slug), render, stale_post_key(slug)))
@@ -0,0 +1,93 @@
+# core/db_router.py
+"""
+Primary/replica database routing.
+
+Safe-method (GET/HEAD/OPTIONS) requests read from a replica, everything else
+goes to the primary (``default``). A client that has just written is pinned to
+the primary for ``REPLICA_PIN_SECONDS`` so it always sees its own writes.
+
+Enable it in settings::
+
+    DATABASES = {
+        "default": {...},            # primary
+        "replica": {...},            # one or more read replicas
+    }
+    DATABASE_ROUTERS = ["core.db_router.PrimaryReplicaRouter"]
+    DATABASE_REPLICAS = ["replica"]  # optional, defaults to every non-default alias
+    MIDDLEWARE = [
+        ...
+        "core.middleware.ReplicaRoutingMiddleware",
+    ]
+
+Locally it can be exercised with two SQLite files. core/tests.py needs the
+replica to be a separate database (no TEST MIRROR), so each side can hold
+different rows::
+
+    "replica": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": BASE_DIR / "db_replica.sqlite3",
+    }
+"""
+import random
+
+from asgiref.local import Local
+from django.conf import settings
+
+PRIMARY_DB = "default"
+
+# Per-request routing state. asgiref's Local is safe for both threads (WSGI)
+# and coroutines (ASGI), and follows sync_to_async calls of the async ORM.
+_state = Local()
+
+
+def get_replicas():
+    replicas = getattr(settings, "DATABASE_REPLICAS", None)
+    if replicas is None:
+        replicas = [alias for alias in settings.DATABASES if alias != PRIMARY_DB]
+    return list(replicas)
+
+
+def use_replica(enabled=True):
+    """Allow (or forbid) reads of the current request to go to a replica."""
+    _state.use_replica = enabled
+
+
+def pin_to_primary():
+    """Force every following read of the current request to the primary."""
+    _state.use_replica = False
+    _state.wrote = True
+
+
+def has_written():
+    return getattr(_state, "wrote", False)
+
+
+def reset():
+    _state.use_replica = False
+    _state.wrote = False
+
+
+class PrimaryReplicaRouter:
+    """Send reads to a replica when the current request allows it."""
+
+    def db_for_read(self, model, **hints):
+        if not getattr(_state, "use_replica", False):
+            return PRIMARY_DB
+        replicas = get_replicas()
+        if not replicas:
+            return PRIMARY_DB
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        # Read-your-writes inside the same request (e.g. a GET that saves).
+        pin_to_primary()
+        return PRIMARY_DB
+
+    def allow_relation(self, obj1, obj2, **hints):
+        pool = {PRIMARY_DB, *get_replicas()}
+        if obj1._state.db in pool and obj2._state.db in pool:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return None
@@ -0,0 +1,58 @@
+# core/middleware.py
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from core import db_router
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Let safe-method requests read from a replica (see core.db_router).
+
+    After a successful write the client gets a short-lived cookie that keeps
+    its reads on the primary, so it never reads a lagging replica right after
+    its own change.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.cookie_name = getattr(settings, "REPLICA_PIN_COOKIE", "pin_primary")
+        self.pin_seconds = getattr(settings, "REPLICA_PIN_SECONDS", 5)
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        self.process_request(request)
+        try:
+            response = self.get_response(request)
+            return self.process_response(request, response)
+        finally:
+            db_router.reset()
+
+    async def __acall__(self, request):
+        self.process_request(request)
+        try:
+            response = await self.get_response(request)
+            return self.process_response(request, response)
+        finally:
+            db_router.reset()
+
+    def process_request(self, request):
+        db_router.reset()
+        pinned = self.cookie_name in request.COOKIES
+        db_router.use_replica(request.method in SAFE_METHODS and not pinned)
+
+    def process_response(self, request, response):
+        wrote = request.method not in SAFE_METHODS or db_router.has_written()
+        if wrote and response.status_code < 400:
+            response.set_cookie(
+                self.cookie_name, "1", max_age=self.pin_seconds, httponly=True, samesite="Lax"
+            )
+        return response
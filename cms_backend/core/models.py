@@ -51,9 +51,48 @@ class BaseModel(models.Model):
             self.id = new_id
         super().save(*args, **kwargs)
 
-    def generate_custom_id(self):
+    @classmethod
+    def generate_custom_id(cls):
         # First 4 chars from model name (uppercase, padded/truncated to 4)
-        prefix = self.__class__.__name__[:4].upper().ljust(4, 'X')
+        prefix = cls.__name__[:4].upper().ljust(4, 'X')
         # Last 4 chars: random digits
         suffix = f"{random.randint(0, 9999):04d}"
-        return prefix + suffix
\ No newline at end of file
+        return prefix + suffix
+
+    @classmethod
+    def allocate_ids(cls, count):
+        """
+        Reserve `count` unused ids for bulk_create, checking collisions with one
+        query per round instead of one per object.
+        """
+        allocated = set()
+        while len(allocated) < count:
+            candidates = set()
+            while len(candidates) < count - len(allocated):
+                candidate = cls.generate_custom_id()
+                if candidate not in allocated:
+                    candidates.add(candidate)
+            taken = set(cls.objects.filter(id__in=candidates).values_list("id", flat=True))
+            allocated |= candidates - taken
+        return list(allocated)
+
+    @classmethod
+    def allocate_slugs(cls, bases, field="slug"):
+        """
+        Unique slugs for a batch of base slugs ("about", "about-1", ...), the
+        same scheme the save() loops use, resolved with a single query.
+        """
+        lookup = models.Q()
+        for base in set(bases):
+            lookup |= models.Q(**{field: base}) | models.Q(**{f"{field}__startswith": f"{base}-"})
+        taken = set(cls.objects.filter(lookup).values_list(field, flat=True)) if bases else set()
+
+        slugs = []
+        for base in bases:
+            slug, count = base, 1
+            while slug in taken:
+                slug = f"{base}-{count}"
+                count += 1
+            taken.add(slug)
+            slugs.append(slug)
+        return slugs
\ No newline at end of file
@@ -22,4 +22,16 @@ class IsSEOReadOnlyOnPage(BasePermission):
             and request.user.role == "seo"
             and view.basename == "page"
             and request.method in SAFE_METHODS
-        )
\ No newline at end of file
+        )
+
+# Roles that may read draft (unpublished) content
+EDITOR_ROLES = ("superadmin", "seo")
+
+
+def is_editor(user):
+    return bool(user and user.is_authenticated and user.role in EDITOR_ROLES)
+
+
+class IsEditor(BasePermission):
+    def has_permission(self, request, view):
+        return is_editor(request.user)
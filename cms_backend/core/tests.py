@@ -1,3 +1,96 @@
-from django.test import TestCase
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.conf import settings
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+
+from content.models import FAQ
+from core import db_router
+from core.utils import compression
+from core.middleware import ReplicaRoutingMiddleware
+
+
+def list_questions(request):
+    return HttpResponse(",".join(FAQ.objects.order_by("question").values_list("question", flat=True)))
+
+
+def create_question(request):
+    FAQ.objects.create(question=request.POST["question"], answer="a")
+    return HttpResponse("created")
+
+
+def write_then_read(request):
+    FAQ.objects.create(question="mid-request", answer="a")
+    return list_questions(request)
+
+
+@skipUnless("replica" in settings.DATABASES, "needs a 'replica' database alias (see core/db_router.py)")
+@override_settings(
+    DATABASE_ROUTERS=["core.db_router.PrimaryReplicaRouter"],
+    DATABASE_REPLICAS=["replica"],
+    REPLICA_PIN_COOKIE="pin_primary",
+)
+class PrimaryReplicaRouterTests(TestCase):
+    """Two separate SQLite databases: each holds a different row, so reads show where they went."""
+
+    databases = {"default", "replica"}
+
+    def setUp(self):
+        FAQ(question="primary", answer="a").save(using="default")
+        FAQ(question="replica", answer="a").save(using="replica")
+        self.factory = RequestFactory()
+
+    def tearDown(self):
+        db_router.reset()
+
+    def call(self, view, request):
+        return ReplicaRoutingMiddleware(view)(request)
+
+    def test_safe_reads_go_to_replica(self):
+        response = self.call(list_questions, self.factory.get("/"))
+        self.assertEqual(response.content, b"replica")
+        self.assertNotIn("pin_primary", response.cookies)
+
+    def test_writes_go_to_primary_and_pin_the_client(self):
+        response = self.call(create_question, self.factory.post("/", {"question": "new"}))
+        self.assertTrue(FAQ.objects.using("default").filter(question="new").exists())
+        self.assertFalse(FAQ.objects.using("replica").filter(question="new").exists())
+        self.assertIn("pin_primary", response.cookies)
+
+    def test_reads_after_a_write_in_the_same_request_use_primary(self):
+        response = self.call(write_then_read, self.factory.get("/"))
+        self.assertEqual(response.content, b"mid-request,primary")
+        self.assertIn("pin_primary", response.cookies)
+
+    def test_pin_cookie_keeps_reads_on_primary(self):
+        request = self.factory.get("/")
+        request.COOKIES["pin_primary"] = "1"
+        self.assertEqual(self.call(list_questions, request).content, b"primary")
+
+    def test_routing_state_is_reset_after_the_request(self):
+        self.call(list_questions, self.factory.get("/"))
+        self.assertEqual(FAQ.objects.order_by("question").first().question, "primary")
+
+
+@skipUnless(compression.brotli, "brotli is not installed")
+class CompressionQualityTests(SimpleTestCase):
+    body = b"<p>hello</p>" * 200
+
+    def quality_used(self, **kwargs):
+        with mock.patch.object(compression.brotli, "compress", wraps=compression.brotli.compress) as compress:
+            compression.encoded_variants(self.body, **kwargs)
+        return compress.call_args.kwargs["quality"]
+
+    def test_request_path_uses_the_online_quality(self):
+        self.assertEqual(self.quality_used(), 5)
+        with override_settings(BROTLI_ONLINE_QUALITY=4):
+            self.assertEqual(self.quality_used(), 4)
+
+    def test_offline_callers_can_ask_for_the_maximum(self):
+        self.assertEqual(self.quality_used(quality=compression.MAX_BROTLI_QUALITY), 11)
+
+    def test_gzip_uses_the_online_level(self):
+        with mock.patch.object(compression.gzip, "compress", wraps=compression.gzip.compress) as compress:
+            compression.encoded_variants(self.body)
+            compression.compress_variants(self.body, level=compression.MAX_GZIP_LEVEL)
+        self.assertEqual([call.kwargs["compresslevel"] for call in compress.call_args_list], [6, 9])
@@ -0,0 +1,31 @@
+from django.db.models import Aggregate, CharField
+
+SEPARATOR = ", "
+
+
+class GroupConcat(Aggregate):
+    """Join a column's values per group into one string (MySQL/SQLite GROUP_CONCAT, PostgreSQL STRING_AGG)."""
+    function = "GROUP_CONCAT"
+    output_field = CharField()
+
+    def as_mysql(self, compiler, connection, **extra_context):
+        return super().as_sql(
+            compiler, connection,
+            template=f"%(function)s(%(expressions)s SEPARATOR '{SEPARATOR}')",
+            **extra_context,
+        )
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return super().as_sql(
+            compiler, connection,
+            template=f"%(function)s(%(expressions)s, '{SEPARATOR}')",
+            **extra_context,
+        )
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        return super().as_sql(
+            compiler, connection,
+            function="STRING_AGG",
+            template=f"%(function)s((%(expressions)s)::text, '{SEPARATOR}')",
+            **extra_context,
+        )
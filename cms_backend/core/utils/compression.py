@@ -0,0 +1,99 @@
+import gzip
+
+from django.conf import settings
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+
+# Offline builds (export_site) can afford the slowest, smallest settings;
+# request-path variants use GZIP_ONLINE_LEVEL (default 6) and
+# BROTLI_ONLINE_QUALITY (default 5), many times faster for a few percent more bytes
+MAX_GZIP_LEVEL = 9
+MAX_BROTLI_QUALITY = 11
+
+
+def online_gzip_level():
+    return getattr(settings, "GZIP_ONLINE_LEVEL", 6)
+
+
+def online_brotli_quality():
+    return getattr(settings, "BROTLI_ONLINE_QUALITY", 5)
+
+
+def gzip_bytes(body, level=None):
+    # mtime=0 keeps the output stable for identical input
+    return gzip.compress(body, compresslevel=online_gzip_level() if level is None else level, mtime=0)
+
+
+def brotli_bytes(body, quality=None):
+    if brotli is None:
+        return None
+    return brotli.compress(body, quality=online_brotli_quality() if quality is None else quality)
+
+
+def compress_variants(body, quality=None, level=None):
+    """
+    Compress ``body`` once with every available encoding.
+    Returns {"gzip": bytes, "br": bytes} (brotli only when installed), at
+    gzip `level` / brotli `quality`, or the online settings when not given.
+    """
+    variants = {"gzip": gzip_bytes(body, level)}
+    br = brotli_bytes(body, quality)
+    if br is not None:
+        variants["br"] = br
+    return variants
+
+
+# ==========================
+# PRECOMPRESSED RESPONSES
+# ==========================
+
+# Below this, compression saves less than the Content-Encoding round trip costs
+MIN_SIZE = 1024
+
+# Server preference when the client accepts several
+PREFERENCE = ("br", "gzip")
+
+
+def encoded_variants(body, quality=None):
+    """{"identity": body, "gzip": ..., "br": ...}, compressed once for caching next to each other."""
+    variants = {"identity": body}
+    if len(body) >= MIN_SIZE:
+        variants.update(compress_variants(body, quality))
+    return variants
+
+
+def choose_encoding(accept_encoding, available):
+    """Best of `available` for an Accept-Encoding header ("identity" if none fits)."""
+    accepted = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if token.strip():
+            accepted[token.strip().lower()] = quality
+    for encoding in PREFERENCE:
+        if encoding in available and accepted.get(encoding, accepted.get("*", 0)) > 0:
+            return encoding
+    return "identity"
+
+
+def variant_response(request, variants, content_type, status=200):
+    """Serve the stored variant the client accepts; no compression happens here."""
+    from django.http import HttpResponse
+    from django.utils.cache import patch_vary_headers
+
+    encoding = choose_encoding(request.META.get("HTTP_ACCEPT_ENCODING", ""), variants)
+    response = HttpResponse(variants[encoding], content_type=content_type, status=status)
+    if encoding != "identity":
+        response["Content-Encoding"] = encoding
+    patch_vary_headers(response, ("Accept-Encoding",))
+    return response